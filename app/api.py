@@ -0,0 +1,227 @@
+"""API HTTP local (JSON) com os KPIs e agregados do dashboard, sem subir o Streamlit.
+
+Endpoints (GET/HEAD):
+
+    /                  versão dos dados e tabelas disponíveis
+    /kpis              inscritos, certificados, taxa e secretarias atendidas
+    /secretarias       totais por secretaria/órgão
+    /cargos            ranking de cargos
+    /eventos           métricas por evento
+    /eventos_tipo      totais por tipo de evento
+
+As tabelas são as mesmas do ``python -m app.export`` e vêm do mesmo repositório compartilhado
+(registro + cache colunar; com o watcher, trocado em segundo plano quando a planilha muda).
+Cada resposta é serializada e comprimida uma vez por versão dos dados; depois disso uma
+requisição só consulta o registro e devolve bytes prontos. O ETag muda com a versão
+(If-None-Match -> 304), o gzip é usado quando o cliente aceita e as respostas têm
+Content-Length (HTTP/1.1, conexões keep-alive).
+
+Uso:
+    python -m app.api                                   # planilha padrão, http://127.0.0.1:8502
+    python -m app.api dados_main/relatorio_capacitia.xlsx --port 9000
+    curl -s --compressed http://127.0.0.1:8502/kpis
+"""
+import argparse
+import gzip
+import json
+import sys
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable
+from urllib.parse import urlsplit
+
+from app.export import TABLES
+
+DEFAULT_PORT = 8502  # o Streamlit usa a 8501
+KEEP_ALIVE_TIMEOUT = 30  # segundos de conexão ociosa antes de fechar
+
+
+@dataclass(frozen=True)
+class Response:
+    status: int
+    raw: bytes
+    gz: bytes
+    etag: str | None = None
+    version: str | None = None
+
+
+def _response(status: int, payload, version: str | None = None, etag: str | None = None) -> Response:
+    raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return Response(status, raw, gzip.compress(raw, compresslevel=6, mtime=0), etag, version)
+
+
+NOT_FOUND = _response(404, {"erro": "endpoint inexistente", "endpoints": ["/", *(f"/{t}" for t in TABLES)]})
+
+
+def _render(name: str, repo) -> Response:
+    """Corpo (JSON + gzip) de ``name`` para o repositório ``repo``."""
+    etag = None if repo.version is None else f'"{repo.version}-{name or "indice"}"'
+    if not name:
+        return _response(200, {"versao": repo.version, "tabelas": list(TABLES)}, repo.version, etag)
+    try:
+        df = TABLES[name](repo)
+    except (KeyError, ValueError) as exc:  # aba ausente nesta planilha (layouts antigos)
+        return _response(404, {"versao": repo.version, "erro": f"tabela '{name}' indisponível ({exc})"},
+                         repo.version, etag)
+    dados = json.loads(df.to_json(orient="records", force_ascii=False))
+    if name == "kpis":
+        dados = dados[0]
+    return _response(200, {"versao": repo.version, "tabela": name, "dados": dados}, repo.version, etag)
+
+
+class ApiState:
+    """Respostas prontas por endpoint, refeitas só quando o repositório (a versão) muda."""
+
+    def __init__(self, source: Callable[[], object]):
+        self.source = source
+        self._lock = threading.Lock()
+        self._responses: dict[str, tuple[object, Response]] = {}
+
+    def response(self, name: str) -> Response:
+        repo = self.source()
+        cached = self._responses.get(name)
+        if cached is not None and cached[0] is repo:
+            return cached[1]
+        with self._lock:  # uma serialização por endpoint e versão, mesmo com requisições simultâneas
+            cached = self._responses.get(name)
+            if cached is None or cached[0] is not repo:
+                cached = self._responses[name] = (repo, _render(name, repo))
+            return cached[1]
+
+    def warm(self) -> None:
+        for name in ("", *TABLES):
+            self.response(name)
+
+
+def _accepts_gzip(header: str | None) -> bool:
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() in ("gzip", "*"):
+            q = params.strip().lower()
+            try:
+                return not (q.startswith("q=") and float(q[2:]) == 0)
+            except ValueError:
+                return True
+    return False
+
+
+def _etag_matches(header: str | None, etag: str | None) -> bool:
+    if not header or etag is None:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in header.split(",")]
+    return "*" in tags or etag in tags
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive (todas as respostas têm Content-Length)
+    server_version = "CapacitIA-API"
+    timeout = KEEP_ALIVE_TIMEOUT
+    # cabeçalhos e corpo saem em escritas separadas; sem TCP_NODELAY o Nagle segura o corpo
+    # até o ACK atrasado do cliente (~40 ms por resposta numa conexão keep-alive)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._reply(head=False)
+
+    def do_HEAD(self):
+        self._reply(head=True)
+
+    def _reply(self, head: bool) -> None:
+        name = urlsplit(self.path).path.strip("/")
+        if name and name not in TABLES:
+            resp = NOT_FOUND
+        else:
+            try:
+                resp = self.server.state.response(name)
+            except Exception as exc:  # erro de leitura: não fica em cache, a próxima tenta de novo
+                resp = _response(500, {"erro": str(exc)})
+
+        if resp.status == 200 and _etag_matches(self.headers.get("If-None-Match"), resp.etag):
+            self.send_response(304)
+            self._common_headers(resp)
+            self.end_headers()
+            return
+
+        use_gzip = _accepts_gzip(self.headers.get("Accept-Encoding"))
+        body = resp.gz if use_gzip else resp.raw
+        self.send_response(resp.status)
+        self._common_headers(resp)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if use_gzip:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def _common_headers(self, resp: Response) -> None:
+        if resp.etag:
+            self.send_header("ETag", resp.etag)
+        if resp.version:
+            self.send_header("X-Data-Version", resp.version)
+        self.send_header("Cache-Control", "no-cache")  # sempre revalida (barato: 304)
+        self.send_header("Vary", "Accept-Encoding")
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state: ApiState, verbose: bool = False):
+        super().__init__(address, ApiHandler)
+        self.state = state
+        self.verbose = verbose
+
+
+def repository_source(excel: Path | None) -> Callable[[], object]:
+    """Função que devolve o repositório atual: histórico (CAPACITIA_HISTORY=1) ou a planilha."""
+    from app.data.history import HISTORY_ENABLED, latest_repository
+
+    if HISTORY_ENABLED and excel is None and latest_repository() is not None:
+        return latest_repository
+
+    from app.data.registry import get_repository
+    from app.data.sources import DEFAULT_CANDIDATES, default_workbook
+    from app.data.watcher import watch_workbook
+
+    path = excel or default_workbook()
+    if path is None:
+        raise FileNotFoundError("planilha não encontrada; candidatas: " + ", ".join(map(str, DEFAULT_CANDIDATES)))
+    watch_workbook(path)  # novas versões carregadas em segundo plano
+    return lambda: get_repository(path)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.api", description=__doc__.split("\n\n")[0])
+    ap.add_argument("arquivo", nargs="?", type=Path, help="planilha .xlsx (padrão: a mesma do dashboard)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--verbose", action="store_true", help="registra cada requisição no stderr")
+    args = ap.parse_args(argv)
+
+    if args.arquivo is not None and not args.arquivo.exists():
+        ap.error(f"arquivo não encontrado: {args.arquivo}")
+    try:
+        state = ApiState(repository_source(args.arquivo))
+    except FileNotFoundError as exc:
+        ap.error(str(exc))
+    state.warm()  # a primeira requisição já encontra as respostas prontas
+
+    server = ApiServer((args.host, args.port), state, verbose=args.verbose)
+    print(f"API em http://{args.host}:{server.server_port}/ (Ctrl+C para sair)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+// Dashboard estático (python -m app.static_export): as figuras vêm prontas em figs/*.json e
+// são desenhadas pelo plotly.min.js compartilhado. Nenhum Python roda por visitante.
+(function () {
+  "use strict";
+
+  const CONFIG = { responsive: true, displaylogo: false };
+  const figuras = {};
+
+  function carregar(src) {
+    if (!figuras[src]) {
+      figuras[src] = fetch(src).then(function (r) {
+        if (!r.ok) throw new Error(src + ": HTTP " + r.status);
+        return r.json();
+      });
+    }
+    return figuras[src];
+  }
+
+  // desenha em ``div`` a figura ``src``; sem src (variante sem dados) mostra o aviso "<id>-vazio"
+  function desenhar(div, src) {
+    const vazio = document.getElementById(div.id + "-vazio");
+    div.hidden = !src;
+    if (vazio) vazio.hidden = !!src;
+    if (!src) return;
+    carregar(src).then(function (fig) {
+      Plotly.react(div, fig.data, fig.layout, CONFIG);
+    }).catch(function (err) {
+      div.textContent = "Falha ao carregar a figura (" + err.message + ").";
+    });
+  }
+
+  // variantes de um mesmo gráfico (modo de rg_sec, cargo da série): botões ou <select>;
+  // a escolha fica guardada na sessão do navegador, como o estado dos widgets no Streamlit
+  function ligarBotoes(grupo) {
+    const alvo = document.getElementById(grupo.dataset.alvo);
+    const botoes = Array.from(grupo.querySelectorAll("button"));
+    function escolher(i) {
+      botoes.forEach(function (b, j) { b.classList.toggle("ativo", i === j); });
+      sessionStorage.setItem("capacitia:" + grupo.dataset.alvo, String(i));
+      desenhar(alvo, botoes[i].dataset.src);
+    }
+    botoes.forEach(function (b, i) { b.addEventListener("click", function () { escolher(i); }); });
+    const salvo = Number(sessionStorage.getItem("capacitia:" + grupo.dataset.alvo));
+    escolher(salvo >= 0 && salvo < botoes.length ? salvo : 0);
+  }
+
+  function ligarSelect(select) {
+    const alvo = document.getElementById(select.dataset.alvo);
+    const chave = "capacitia:" + select.dataset.alvo;
+    const salvo = Number(sessionStorage.getItem(chave));
+    if (salvo >= 0 && salvo < select.options.length) select.selectedIndex = salvo;
+    function escolher() {
+      sessionStorage.setItem(chave, String(select.selectedIndex));
+      desenhar(alvo, select.value);
+    }
+    select.addEventListener("change", escolher);
+    escolher();
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll(".variantes[data-alvo]").forEach(ligarBotoes);
+    document.querySelectorAll("select[data-alvo]").forEach(ligarSelect);
+    document.querySelectorAll(".fig[data-src]").forEach(function (div) {
+      desenhar(div, div.dataset.src);
+    });
+  });
+})();
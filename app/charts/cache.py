@@ -0,0 +1,62 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from app.tracing import count, span
+
+# Cache LRU de figuras Plotly, compartilhado entre sessões e reruns.
+# Chave: (id do gráfico, planilha, versão dos dados, parâmetros)
+# — ex.: ("vg_sec", "dados_main/…xlsx", "18a…-2883c", (("modo", "Inscritos"), ("topn", 10))).
+# As figuras são tratadas como imutáveis depois de construídas (o st.plotly_chart não as altera).
+
+
+class FigureCache:
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_build(self, key: tuple, build: Callable[[], object]):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                count("figuras.hit")
+                return self._items[key]
+            self.misses += 1
+        count("figuras.miss")
+        with span(f"chart:{key[0]}"):
+            fig = build()  # fora do lock: construções de gráficos diferentes não se bloqueiam
+        with self._lock:
+            self._items[key] = fig
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        return fig
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._items), "maxsize": self.maxsize,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+FIGURE_CACHE = FigureCache(int(os.environ.get("CAPACITIA_FIGURE_CACHE_SIZE", "256")))
+
+
+def cached_figure(chart_id: str, repo, build: Callable, **params):
+    """Retorna ``build(repo, **params)``, reaproveitando a figura já construída para a mesma
+    versão dos dados. Repositórios sem ``version`` não são cacheados."""
+    if repo.version is None:
+        with span(f"chart:{chart_id}"):
+            return build(repo, **params)
+    key = (chart_id, str(repo.excel_path), repo.version, tuple(sorted(params.items())))
+    return FIGURE_CACHE.get_or_build(key, lambda: build(repo, **params))
@@ -1,7 +1,25 @@
-import plotly.express as px
+import threading
 import pandas as pd
 import numpy as np
 
+_PX = None
+_PX_LOCK = threading.Lock()
+
+def plotly_express():
+    """plotly.express, importado só quando a primeira figura é construída.
+
+    Registra o tema do app (configure_plotly_theme) na mesma ocasião, uma vez por processo.
+    """
+    global _PX
+    if _PX is None:
+        with _PX_LOCK:
+            if _PX is None:
+                import plotly.express
+                from app.theme import configure_plotly_theme
+                configure_plotly_theme()
+                _PX = plotly.express
+    return _PX
+
 def style_fig(fig, height=420):
     fig.update_layout(
         height=height,
@@ -13,5 +31,6 @@ def style_fig(fig, height=420):
 
 def nz(df: pd.DataFrame, required_cols):
     """Remove linhas com NaN/±inf nas colunas exigidas."""
-    clean = df.replace([np.inf, -np.inf], pd.NA)
+    num = df.select_dtypes("number")
+    clean = df.replace([np.inf, -np.inf], pd.NA) if num.isin([np.inf, -np.inf]).any().any() else df
     return clean.dropna(subset=required_cols)
@@ -0,0 +1,157 @@
+import datetime as dt
+import hashlib
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (motor do Parquet)
+    _HAS_ARROW = True
+except ImportError:
+    _HAS_ARROW = False
+
+# Cache em disco dos DataFrames já limpos, em Parquet, chaveado pelo hash do conteúdo do Excel.
+CACHE_DIR = Path(os.environ.get("CAPACITIA_CACHE_DIR", ".cache/capacitia"))
+CACHE_ENABLED = _HAS_ARROW and os.environ.get("CAPACITIA_CACHE", "1") != "0"
+# incrementar quando a limpeza/agregação dos frames mudar (invalida caches antigos)
+CACHE_VERSION = 6
+# planilhas (hashes) mantidas no cache; as gravadas há mais tempo são removidas
+CACHE_KEEP = int(os.environ.get("CAPACITIA_CACHE_KEEP", "16"))
+
+
+def workbook_hash(path: Path) -> str:
+    """SHA-256 do conteúdo do arquivo (independe de caminho e mtime)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Colunas object com tipos mistos (ex.: 'Nº' com números e 'TOTAL GERAL') viram duas colunas de
+# texto: o valor e o tipo dele. Nada é desserializado como código ao ler o cache.
+_TAG_PREFIX = "__tipo__"
+
+def _encode_value(v) -> tuple[str, str]:
+    if v is None:
+        return "none", ""
+    if v is pd.NA:
+        return "na", ""
+    if isinstance(v, (bool, np.bool_)):
+        return "bool", str(bool(v))
+    if isinstance(v, (int, np.integer)):
+        return "int", str(int(v))
+    if isinstance(v, (float, np.floating)):
+        return "float", repr(float(v))
+    if isinstance(v, str):
+        return "str", v
+    if isinstance(v, pd.Timestamp):
+        return "timestamp", v.isoformat()
+    if isinstance(v, dt.datetime):
+        return "datetime", v.isoformat()
+    if isinstance(v, dt.date):
+        return "date", v.isoformat()
+    if isinstance(v, dt.time):
+        return "time", v.isoformat()
+    raise TypeError(f"tipo sem representação no cache: {type(v).__name__}")
+
+_DECODERS = {
+    "none": lambda s: None,
+    "na": lambda s: pd.NA,
+    "bool": lambda s: s == "True",
+    "int": int,
+    "float": float,
+    "str": str,
+    "timestamp": pd.Timestamp,
+    "datetime": dt.datetime.fromisoformat,
+    "date": dt.date.fromisoformat,
+    "time": dt.time.fromisoformat,
+}
+
+
+def encode_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Colunas object com tipos mistos são gravadas como texto + tipo de cada valor,
+    preservando os valores originais; as demais ficam colunares.
+
+    Levanta TypeError para valores sem representação (o frame então não é cacheado).
+    """
+    out = df.copy(deep=False)
+    mixed = [
+        c for c in df.columns
+        if df[c].dtype == object and pd.api.types.infer_dtype(df[c], skipna=True).startswith("mixed")
+    ]
+    for col in mixed:
+        tags, values = zip(*map(_encode_value, df[col])) if len(df) else ((), ())
+        out[col] = pd.Series(values, index=df.index, dtype=object)
+        out[f"{_TAG_PREFIX}{col}"] = pd.Series(tags, index=df.index, dtype=object)
+    out.attrs = {"mixed_columns": [str(c) for c in mixed]}
+    return out
+
+
+def decode_frame(df: pd.DataFrame) -> pd.DataFrame:
+    if "pickled_columns" in df.attrs:  # formato anterior (pickle): não é desserializado
+        raise ValueError("frame gravado no formato antigo (pickle); regrave-o a partir da planilha")
+    mixed = df.attrs.get("mixed_columns", [])
+    for col in mixed:
+        tags = df[f"{_TAG_PREFIX}{col}"]
+        df[col] = pd.Series([_DECODERS[t](v) for t, v in zip(tags, df[col])], index=df.index, dtype=object)
+    df = df.drop(columns=[f"{_TAG_PREFIX}{c}" for c in mixed])
+    df.attrs = {}
+    return df
+
+
+def _frame_path(digest: str, name: str) -> Path:
+    return CACHE_DIR / f"{digest}-v{CACHE_VERSION}" / f"{name}.parquet"
+
+
+def load_frame(digest: str, name: str) -> pd.DataFrame | None:
+    """Lê um frame do cache; None em cache miss ou se a leitura falhar."""
+    path = _frame_path(digest, name)
+    if not CACHE_ENABLED or not path.exists():
+        return None
+    try:
+        return decode_frame(pd.read_parquet(path))
+    except Exception:
+        return None
+
+
+def save_frame(digest: str, name: str, df: pd.DataFrame) -> bool:
+    """Grava um frame de forma atômica (arquivo temporário + rename). Falhas não são fatais."""
+    if not CACHE_ENABLED or df is None:
+        return False
+    path = _frame_path(digest, name)
+    tmp = path.with_name(f"{name}.tmp-{os.getpid()}-{threading.get_ident()}")
+    try:
+        if not path.parent.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            prune_cache(keep=path.parent)
+        encode_frame(df).to_parquet(tmp)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        return False
+
+
+def prune_cache(keep: Path | None = None) -> None:
+    """Remove diretórios de outras versões do cache e, das planilhas, mantém só as
+    ``CACHE_KEEP`` gravadas mais recentemente (além de ``keep``)."""
+    if not CACHE_DIR.is_dir():
+        return
+    suffix = f"-v{CACHE_VERSION}"
+    atuais = []
+    for entry in CACHE_DIR.iterdir():
+        if not entry.is_dir() or entry == keep:
+            continue
+        if entry.name.endswith(suffix):
+            atuais.append(entry)
+        else:
+            shutil.rmtree(entry, ignore_errors=True)  # CACHE_VERSION antiga
+    atuais.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    for entry in atuais[max(CACHE_KEEP - (keep is not None), 0):]:
+        shutil.rmtree(entry, ignore_errors=True)
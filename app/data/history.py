@@ -0,0 +1,230 @@
+"""Histórico colunar (Parquet, só acréscimo) das versões da planilha.
+
+Cada relatório mensal é uma reapresentação completa dos dados. A ingestão lê a planilha uma
+vez, compara linha a linha com o estado mais recente do histórico e grava numa nova partição
+apenas as linhas novas, alteradas ou removidas, carimbadas com a versão da ingestão:
+
+    <HISTORY_DIR>/<tabela>/<versão>.parquet
+    <HISTORY_DIR>/<tabela>/ordem/<versão>.parquet   (chaves na ordem da planilha)
+    <HISTORY_DIR>/versoes.jsonl            (uma linha por ingestão)
+
+O dashboard pode então montar o repositório a partir do estado mais recente do histórico
+(``latest_repository``), sem abrir o Excel.
+
+Uso:
+    python -m app.data.history ingest dados_main/RelatorioCapacitia_AtualizadoAgosto.xlsx
+    python -m app.data.history status
+"""
+import argparse
+import json
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from app.data.frame_cache import decode_frame, encode_frame, workbook_hash
+from app.data.repository import DataRepository
+from app.utils.dtypes import plain_frame
+from app.utils.text import org_keys
+
+HISTORY_DIR = Path(os.environ.get("CAPACITIA_HISTORY_DIR", "historico"))
+# o dashboard lê do histórico em vez do Excel (ver app/main.py)
+HISTORY_ENABLED = os.environ.get("CAPACITIA_HISTORY", "0") == "1"
+VERSIONS_FILE = "versoes.jsonl"
+
+
+@dataclass(frozen=True)
+class HistoryTable:
+    """Frame do repositório guardado no histórico e como identificar cada linha dele."""
+    frame: str
+    key: Callable[[pd.DataFrame], pd.Series]
+    # colunas que acompanham a posição na planilha (ex.: Nº, renumerado quando entra um evento
+    # no meio): ficam fora do hash da linha e são guardadas a cada versão junto com a ordem
+    positional: tuple = ()
+
+
+def _key_visao(df: pd.DataFrame) -> pd.Series:
+    # nome normalizado do evento; o Nº é renumerado quando entra um evento no meio da lista,
+    # então só identifica as linhas sem EVENTO (ex.: TOTAL GERAL)
+    evento = org_keys(df["EVENTO"])
+    numero = "Nº " + org_keys(df["Nº"].astype(object).where(df["Nº"].notna(), "").astype(str))
+    return evento.where(evento != "", numero)
+
+
+def _key_first_column(df: pd.DataFrame) -> pd.Series:
+    return org_keys(df.iloc[:, 0])
+
+
+TABLES = {
+    "visao":       HistoryTable("df_visao", _key_visao, positional=("Nº",)),
+    "secretarias": HistoryTable("df_secretarias", lambda df: org_keys(df["SECRETARIA/ÓRGÃO"])),
+    "cargos":      HistoryTable("df_cargos_ev", _key_first_column),
+}
+
+
+def _unique_keys(keys: pd.Series) -> pd.Series:
+    # chaves repetidas (ex.: linhas em branco) recebem um sufixo de ocorrência
+    dup = keys.groupby(keys, sort=False).cumcount()
+    return keys.where(dup == 0, keys + "#" + dup.astype(str))
+
+
+def _positional(df: pd.DataFrame, table: HistoryTable) -> list:
+    return [c for c in table.positional if c in df.columns]
+
+
+def _with_meta(df: pd.DataFrame, table: HistoryTable) -> pd.DataFrame:
+    data = df.reset_index(drop=True)
+    hashed = data.drop(columns=_positional(data, table))
+    return data.assign(
+        _chave=_unique_keys(table.key(data)).to_numpy(),
+        # hash sobre str/float64: os tipos compactos do repositório não contam como alteração
+        _hash=pd.util.hash_pandas_object(plain_frame(hashed), index=False).to_numpy(),
+        _removido=False,
+    )
+
+
+def versions(store: Path = HISTORY_DIR) -> list[dict]:
+    path = Path(store) / VERSIONS_FILE
+    if not path.exists():
+        return []
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh if line.strip()]
+
+
+def _read_table(store: Path, name: str) -> pd.DataFrame | None:
+    # só partições de versões registradas (uma ingestão interrompida não deixa meio estado)
+    committed = {v["versao"] for v in versions(store)}
+    parts = sorted(p for p in (Path(store) / name).glob("*.parquet") if p.stem in committed)
+    if not parts:
+        return None
+    return pd.concat([decode_frame(pd.read_parquet(p)) for p in parts], ignore_index=True)
+
+
+def _latest_rows(history: pd.DataFrame | None) -> pd.DataFrame | None:
+    """Última versão de cada chave, incluindo marcas de remoção."""
+    if history is None:
+        return None
+    return history.sort_values("_versao", kind="stable").drop_duplicates("_chave", keep="last")
+
+
+def latest_state(name: str, store: Path = HISTORY_DIR) -> pd.DataFrame | None:
+    """Estado atual da tabela ``name``: linhas vivas, na ordem da planilha, sem colunas de controle."""
+    vs = versions(store)
+    rows = _latest_rows(_read_table(store, name))
+    if rows is None or not vs:
+        return None
+    latest = vs[-1]
+    # ordem das linhas e colunas da última versão (a ordem não faz parte do hash da linha),
+    # com as colunas posicionais gravadas junto dela
+    order = decode_frame(pd.read_parquet(Path(store) / name / "ordem" / f"{latest['versao']}.parquet"))
+    rows = rows.set_index("_chave").loc[order["_chave"], latest["colunas"][name]].reset_index(drop=True)
+    for col in _positional(order, TABLES[name]):
+        rows[col] = order[col].to_numpy()
+    return rows.infer_objects()
+
+
+def _write_partition(folder: Path, versao: str, rows: pd.DataFrame) -> None:
+    path = folder / f"{versao}.parquet"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    encode_frame(rows).to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def ingest(excel_path: Path, store: Path = HISTORY_DIR) -> dict:
+    """Lê ``excel_path`` e acrescenta ao histórico só o que mudou desde a última ingestão.
+
+    Retorna o registro da versão (também gravado em versoes.jsonl). Uma planilha com o mesmo
+    conteúdo de uma versão já ingerida não gera nova versão.
+    """
+    store = Path(store)
+    digest = workbook_hash(excel_path)
+    for v in versions(store):
+        if v["digest"] == digest:
+            return {**v, "ja_ingerida": True}
+
+    stamp = datetime.now(timezone.utc)
+    versao = f"{stamp:%Y%m%dT%H%M%S%f}-{digest[:12]}"
+    repo = DataRepository(Path(excel_path)).load([t.frame for t in TABLES.values()])
+
+    counts, columns = {}, {}
+    for name, table in TABLES.items():
+        columns[name] = list(repo.frame(table.frame).columns)
+        current = _with_meta(repo.frame(table.frame), table)
+        previous = _latest_rows(_read_table(store, name))
+        if previous is not None:
+            previous = previous[~previous["_removido"].astype(bool)]
+            seen = pd.MultiIndex.from_arrays([previous["_chave"], previous["_hash"]])
+            changed = current[~pd.MultiIndex.from_arrays([current["_chave"], current["_hash"]]).isin(seen)]
+            gone = previous[~previous["_chave"].isin(current["_chave"])].assign(_removido=True)
+        else:
+            changed, gone = current, current.iloc[0:0]
+        rows = pd.concat([changed, gone], ignore_index=True).assign(_versao=versao)
+        if not rows.empty:
+            _write_partition(store / name, versao, rows)
+        _write_partition(store / name / "ordem", versao, current[["_chave", *_positional(current, table)]])
+        counts[name] = {"linhas": len(current), "gravadas": len(changed), "removidas": len(gone)}
+
+    record = {
+        "versao": versao, "arquivo": str(excel_path), "digest": digest,
+        "ingerido_em": stamp.isoformat(timespec="seconds"), "tabelas": counts,
+        "colunas": columns,
+    }
+    store.mkdir(parents=True, exist_ok=True)
+    with open(store / VERSIONS_FILE, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+_LOCK = threading.Lock()
+_LATEST: dict[Path, DataRepository] = {}
+
+
+def latest_repository(store: Path = HISTORY_DIR) -> DataRepository | None:
+    """Repositório montado a partir do estado mais recente do histórico (um por versão).
+
+    None se o histórico estiver vazio.
+    """
+    store = Path(store).resolve()
+    vs = versions(store)
+    if not vs:
+        return None
+    versao = vs[-1]["versao"]
+    with _LOCK:
+        repo = _LATEST.get(store)
+        if repo is None or repo.version != versao:
+            frames = {t.frame: latest_state(name, store) for name, t in TABLES.items()}
+            repo = _LATEST[store] = DataRepository.from_frames(frames, source=store, version=versao)
+        return repo
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Histórico colunar das versões da planilha CapacitIA.")
+    ap.add_argument("--store", type=Path, default=HISTORY_DIR)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    p_ing = sub.add_parser("ingest", help="acrescenta uma ou mais planilhas ao histórico")
+    p_ing.add_argument("arquivos", nargs="+", type=Path)
+    sub.add_parser("status", help="lista as versões ingeridas")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "ingest":
+        for path in args.arquivos:
+            rec = ingest(path, args.store)
+            if rec.get("ja_ingerida"):
+                print(f"{path}: conteúdo já ingerido na versão {rec['versao']}")
+                continue
+            resumo = ", ".join(
+                f"{t}: +{c['gravadas']}/-{c['removidas']} de {c['linhas']}" for t, c in rec["tabelas"].items()
+            )
+            print(f"{path}: versão {rec['versao']} ({resumo})")
+    else:
+        for v in versions(args.store):
+            print(f"{v['versao']}  {v['ingerido_em']}  {v['arquivo']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,172 @@
+import os
 from pathlib import Path
+import numpy as np
 import pandas as pd
+from app.tracing import span, traced
 
-def load_sheets(path: Path):
-    """Carrega as abas necessárias do Excel. Não faz limpeza aqui."""
-    xls = pd.ExcelFile(path)
-    df_dados        = pd.read_excel(xls, "DADOS", header=6)
-    df_visao        = pd.read_excel(xls, "VISÃO ABERTA", header=6)
-    df_secretarias  = pd.read_excel(xls, "SECRETARIA-ÓRGÃO", header=None)  # header dinâmico
-    df_cargos_raw   = pd.read_excel(xls, "CARGOS", header=2)
+# (aba, linha de cabeçalho, obrigatória); header None = cabeçalho dinâmico (tratado na limpeza)
+SHEETS = [
+    ("DADOS", 6, True),
+    ("VISÃO ABERTA", 6, True),
+    ("SECRETARIA-ÓRGÃO", None, True),
+    ("CARGOS", 2, True),
+    ("MINISTRANTECARGA HORÁRIA", 1, False),
+]
+
+# leitor: "pandas" (pd.read_excel na aba inteira) ou "streaming" (read_sheet_streaming)
+READER = os.environ.get("CAPACITIA_READER", "streaming")
+
+# Parâmetros do leitor streaming por aba: cabeçalho por palavras-chave e projeção só das
+# colunas usadas pelo domínio. Abas fora daqui usam o leitor do pandas.
+STREAMING_LAYOUTS = {
+    "VISÃO ABERTA": dict(header_keywords=("EVENTO", "INSCRIT")),
+    "SECRETARIA-ÓRGÃO": dict(
+        header_keywords=("SECRETARIA/ÓRGÃO", "INSCRIT"),
+        columns=(("SECRETARIA",), ("INSCRIT",), ("CERTIFIC",), ("EVAS",)),
+        stop_at_total=True,
+    ),
+    "CARGOS": dict(header=2),
+}
+
+
+def _streams(sheet: str) -> bool:
+    return READER == "streaming" and sheet in STREAMING_LAYOUTS
+
+
+def read_sheet(path: Path, sheet: str, header: int | None, required: bool = True, xls: pd.ExcelFile | None = None):
+    """Lê uma única aba. Abas opcionais ausentes/ilegíveis retornam None.
+
+    ``xls`` (o mesmo arquivo já aberto) só é usado pelo leitor do pandas; abas em
+    STREAMING_LAYOUTS são sempre lidas pelo leitor streaming, em qualquer caminho de carga.
+    """
     try:
-        df_min      = pd.read_excel(xls, "MINISTRANTECARGA HORÁRIA", header=1)
+        with span("read_sheet", aba=sheet):
+            if _streams(sheet):
+                return read_sheet_streaming(path, sheet, **STREAMING_LAYOUTS[sheet])
+            return pd.read_excel(xls if xls is not None else path, sheet, header=header)
     except Exception:
-        df_min      = None
-    return df_dados, df_visao, df_secretarias, df_cargos_raw, df_min
+        if required:
+            raise
+        return None
+
+
+def _excel_value(v):
+    # mesma conversão do pandas: float inteiro vira int, texto vazio vira ausente
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str) and not v.strip():
+        return None
+    return v
+
+
+def _header_names(values) -> list:
+    names, seen = [], {}
+    for i, v in enumerate(values):
+        name = f"Unnamed: {i}" if v is None else (str(v) if not isinstance(v, str) else v)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def read_sheet_streaming(
+    path: Path,
+    sheet: str,
+    *,
+    header: int | None = None,
+    header_keywords: tuple[str, ...] = (),
+    columns: tuple[tuple[str, ...], ...] | None = None,
+    stop_at_total: bool = False,
+    max_blank_run: int = 20,
+    scan_rows: int = 15,
+) -> pd.DataFrame:
+    """Lê uma aba linha a linha (openpyxl ``read_only``), sem carregar a planilha inteira.
+
+    - cabeçalho: linha fixa (``header``) ou a primeira das ``scan_rows`` linhas que contém
+      todas as ``header_keywords``;
+    - para após ``max_blank_run`` linhas vazias seguidas (planilhas com milhares de linhas
+      formatadas e vazias) ou, com ``stop_at_total``, na linha 'TOTAL GERAL';
+    - ``columns``: mantém só as colunas cujo nome contém alguma das combinações de palavras.
+    """
+    from openpyxl import load_workbook  # só quem lê o Excel paga a importação (~0,15 s)
+
+    wb = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[sheet]
+        # a dimensão gravada no arquivo pode estar desatualizada (ex.: "A1" em planilhas salvas
+        # por outras ferramentas) e o read_only confia nela; como o pandas, ignora-a e lê até o fim
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        hdr_values = None
+        for i, row in enumerate(rows):
+            if header is not None:
+                if i == header:
+                    hdr_values = row
+                    break
+            elif i >= scan_rows:
+                break
+            else:
+                txt = " ".join(str(v).upper() for v in row if v is not None)
+                if all(k.upper() in txt for k in header_keywords):
+                    hdr_values = row
+                    break
+        if hdr_values is None:
+            raise ValueError(f"Cabeçalho não encontrado na aba {sheet!r}")
+
+        data, blank_run = [], 0
+        for row in rows:
+            row = tuple(_excel_value(v) for v in row)
+            if all(v is None for v in row):
+                blank_run += 1
+                if blank_run >= max_blank_run:
+                    break
+                data.append(row)
+                continue
+            blank_run = 0
+            if stop_at_total and isinstance(row[0], str) and row[0].strip().upper() == "TOTAL GERAL":
+                break
+            data.append(row)
+    finally:
+        wb.close()
+
+    while data and all(v is None for v in data[-1]):
+        data.pop()
+
+    # largura efetiva: última coluna com algum valor (como o pandas, descarta colunas vazias à direita)
+    width = 0
+    for row in [hdr_values, *data]:
+        for j in range(len(row) - 1, width - 1, -1):
+            if row[j] is not None:
+                width = j + 1
+                break
+
+    names = _header_names([_excel_value(hdr_values[j]) if j < len(hdr_values) else None for j in range(width)])
+    keep = list(range(width))
+    if columns is not None:
+        up = [n.upper().replace("\xa0", " ") for n in names]
+        keep = [j for j in keep if any(all(k.upper() in up[j] for k in kws) for kws in columns)]
+
+    df = pd.DataFrame([[row[j] if j < len(row) and row[j] is not None else np.nan for j in keep] for row in data],
+                      columns=[names[j] for j in keep])
+    return df.infer_objects()
+
+
+@traced()
+def read_sheets(path: Path, specs) -> tuple:
+    """Lê várias abas ``(aba, header, obrigatória)`` na ordem dada."""
+    # o ExcelFile compartilhado só é aberto se alguma aba usar o leitor do pandas
+    xls = None if all(_streams(sheet) for sheet, _, _ in specs) else pd.ExcelFile(path)
+    try:
+        return tuple(read_sheet(path, sheet, header, req, xls=xls) for sheet, header, req in specs)
+    finally:
+        if xls is not None:
+            xls.close()
+
+
+@traced()
+def load_sheets(path: Path):
+    """Carrega as abas necessárias do Excel. Não faz limpeza aqui."""
+    return read_sheets(path, SHEETS)
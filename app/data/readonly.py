@@ -0,0 +1,73 @@
+import pandas as pd
+
+
+def enable_copy_on_write() -> None:
+    """Liga o Copy-on-Write: cópias rasas compartilham os buffers e só copiam quando alguém escreve.
+
+    No pandas 3 é o comportamento padrão; no 2.x a opção vale para o processo inteiro, por
+    isso é ligada pelo ponto de entrada do dashboard (app/main.py), e não na importação.
+    """
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+class ReadOnlyFrameError(TypeError):
+    """Tentativa de alterar um frame compartilhado do repositório."""
+
+
+def _blocked(*_args, **_kwargs):
+    raise ReadOnlyFrameError(
+        "Frame do repositório é somente leitura; derive um novo (assign/copy) antes de alterar."
+    )
+
+
+class _ReadOnlyIndexer:
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    __setitem__ = _blocked
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """Visão sem cópia de um frame compartilhado. Leitura livre; escrita levanta ReadOnlyFrameError.
+
+    Operações que derivam dados (filtros, groupby, assign, copy...) retornam DataFrame comum.
+    """
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    __setitem__ = _blocked
+    __delitem__ = _blocked
+    insert = _blocked
+    pop = _blocked
+    isetitem = _blocked
+    _set_axis = _blocked          # df.columns = ... / df.index = ...
+    _update_inplace = _blocked    # métodos com inplace=True
+    _iset_item_mgr = _blocked     # troca de colunas por dentro (ex.: replace({col: ...}, inplace=True))
+    _set_item_mgr = _blocked
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+
+def read_only(df: pd.DataFrame | None) -> ReadOnlyFrame | None:
+    """Embrulha ``df`` sem copiar os dados."""
+    return None if df is None else ReadOnlyFrame(df)
@@ -0,0 +1,67 @@
+import threading
+from pathlib import Path
+
+from app.data.repository import DataRepository
+
+# Registro por processo: sobrevive aos reruns do Streamlit e é compartilhado entre sessões.
+_LOCK = threading.Lock()
+_REGISTRY: dict[Path, tuple[tuple[int, int], DataRepository]] = {}
+_WATCHED: set[Path] = set()   # arquivos recarregados em segundo plano (ver app.data.watcher)
+
+
+def file_signature(path: Path) -> tuple[int, int]:
+    """Assinatura barata do arquivo (mtime em ns, tamanho em bytes)."""
+    stat = Path(path).stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def data_version(signature: tuple[int, int]) -> str:
+    mtime_ns, size = signature
+    return f"{mtime_ns:x}-{size:x}"
+
+
+def get_repository(path: Path) -> DataRepository:
+    """Retorna o repositório carregado para a versão atual do arquivo (carrega uma vez por versão)."""
+    key = Path(path).resolve()
+    with _LOCK:
+        entry = _REGISTRY.get(key)
+        if entry is not None and key in _WATCHED:
+            # o watcher publica a nova versão já carregada; nenhuma sessão espera a recarga
+            return entry[1]
+    sig = file_signature(key)
+    with _LOCK:
+        entry = _REGISTRY.get(key)
+        if entry is not None and entry[0] == sig:
+            return entry[1]
+        # construir é barato: os frames são materializados sob demanda no primeiro acesso
+        # (ver FRAME_MANIFEST), sob o lock do próprio repositório
+        repo = DataRepository(key, version=data_version(sig))
+        _REGISTRY[key] = (sig, repo)
+        return repo
+
+
+def current_signature(path: Path) -> tuple[int, int] | None:
+    """Assinatura da versão publicada para ``path`` (None se ainda não há repositório)."""
+    with _LOCK:
+        entry = _REGISTRY.get(Path(path).resolve())
+    return entry[0] if entry is not None else None
+
+
+def publish_repository(path: Path, signature: tuple[int, int], repo: DataRepository) -> None:
+    """Troca atomicamente o repositório publicado para ``path`` por ``repo`` (já carregado)."""
+    with _LOCK:
+        _REGISTRY[Path(path).resolve()] = (signature, repo)
+
+
+def set_watched(path: Path, watched: bool = True) -> None:
+    with _LOCK:
+        if watched:
+            _WATCHED.add(Path(path).resolve())
+        else:
+            _WATCHED.discard(Path(path).resolve())
+
+
+def clear_registry() -> None:
+    """Descarta todos os repositórios carregados (força recarga no próximo acesso)."""
+    with _LOCK:
+        _REGISTRY.clear()
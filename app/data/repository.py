@@ -1,76 +1,294 @@
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Callable
 import pandas as pd
-import numpy as np
 
-from app.data.readers import load_sheets
-from app.domain.filters import clean_secretarias
-from app.domain.kpis import get_totais_visao, count_secretarias_unicas
+from app.data.frame_cache import CACHE_ENABLED, workbook_hash, load_frame, save_frame
+from app.data.readers import read_sheet, read_sheets
+from app.data.readonly import read_only
+from app.domain.filters import clean_secretarias, prepare_cargos_ev, cargos_long, rank_cargos
+from app.domain.aggregates import secretarias_totais, eventos_metricas, eventos_por_tipo, cargos_por_tipo
+from app.domain.deltas import secretarias_por_chave, eventos_por_chave, cargos_por_chave
+from app.domain.kpis import get_totais_visao, locate_total_visao, count_secretarias_unicas
+from app.tracing import count, span, traced
+from app.utils.dtypes import compact_frame, frame_memory
+from app.utils.text import org_keys
+
+
+@dataclass(frozen=True)
+class FrameSpec:
+    """Como materializar um frame: lendo uma aba (sheet/header) ou derivando de outro frame (source)."""
+    sheet: str | None = None
+    header: int | None = None
+    clean: Callable[[pd.DataFrame], pd.DataFrame] | None = None
+    source: str | None = None
+    required: bool = True
+    cache: bool = True          # persiste no cache colunar (app.data.frame_cache)
+    labels: tuple = ()          # colunas de rótulo guardadas como category
+    counts: tuple = ()          # colunas de contagem guardadas como Int32 (se forem inteiras)
+
+
+# Manifesto dos frames do repositório. Nada é lido até o primeiro acesso ao atributo.
+FRAME_MANIFEST: dict[str, FrameSpec] = {
+    "df_dados":           FrameSpec(sheet="DADOS", header=6),
+    "df_visao":           FrameSpec(sheet="VISÃO ABERTA", header=6,
+                                    labels=("EVENTO",), counts=("Nº INSCRITOS", "Nº CERTIFICADOS")),
+    "df_secretarias_raw": FrameSpec(sheet="SECRETARIA-ÓRGÃO", header=None, cache=False),  # header dinâmico
+    "df_secretarias":     FrameSpec(source="df_secretarias_raw", clean=clean_secretarias,
+                                    labels=("SECRETARIA/ÓRGÃO",),
+                                    counts=("Nº INSCRITOS", "Nº CERTIFICADOS", "Nº EVASÃO")),
+    "df_cargos_raw":      FrameSpec(sheet="CARGOS", header=2),
+    "df_cargos_ev":       FrameSpec(source="df_cargos_raw", clean=prepare_cargos_ev),
+    # formato longo (Evento, Tipo, Cargo, Inscritos): uma coluna de contagem em vez de uma por cargo
+    "df_cargos_long":     FrameSpec(source="df_cargos_ev", clean=cargos_long, labels=("Tipo",), counts=("Inscritos",)),
+    "df_cargos_rank":     FrameSpec(source="df_cargos_long", clean=rank_cargos),
+    "df_min":             FrameSpec(sheet="MINISTRANTECARGA HORÁRIA", header=1, required=False),
+    # agregados usados pelas páginas (app.domain.aggregates)
+    "agg_secretarias":    FrameSpec(source="df_secretarias", clean=secretarias_totais),
+    "agg_eventos":        FrameSpec(source="df_visao", clean=eventos_metricas),
+    "agg_eventos_tipo":   FrameSpec(source="agg_eventos", clean=eventos_por_tipo),
+    "agg_cargos_tipo":    FrameSpec(source="df_cargos_long", clean=cargos_por_tipo),
+    # totais por chave canônica, para comparar versões da planilha (app.data.snapshots)
+    "key_secretarias":    FrameSpec(source="agg_secretarias", clean=secretarias_por_chave),
+    "key_eventos":        FrameSpec(source="agg_eventos", clean=eventos_por_chave),
+    "key_cargos":         FrameSpec(source="df_cargos_rank", clean=cargos_por_chave),
+}
+
+# frames usados pelas páginas (o que load() pré-carrega)
+PAGE_FRAMES = (
+    "df_visao", "df_secretarias", "df_cargos_long", "df_cargos_rank",
+    "agg_secretarias", "agg_eventos", "agg_eventos_tipo", "agg_cargos_tipo",
+)
+
+# frames de quem cada frame é a origem (FrameSpec.source)
+_DEPENDENTS: dict[str, tuple[str, ...]] = {
+    name: tuple(n for n, spec in FRAME_MANIFEST.items() if spec.source == name) for name in FRAME_MANIFEST
+}
+# frames intermediários (abas cruas e o CARGOS largo): só servem para derivar outros e saem da
+# memória quando todos os seus derivados já existem; se pedidos de novo, vêm do cache ou da aba
+INTERMEDIATE_FRAMES = frozenset(n for n, deps in _DEPENDENTS.items() if deps) - set(PAGE_FRAMES)
+
+_MISSING = object()  # frame ainda não materializado (None é um valor válido: aba opcional ausente)
+
+
+class _LazyFrame:
+    """Atributo materializado no primeiro acesso a partir do FRAME_MANIFEST."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.frame(self.name)
+
+    def __set__(self, obj, value):
+        obj._frames[self.name] = value
 
 
 @dataclass
 class DataRepository:
     excel_path: Path
+    version: str | None = None   # identifica a versão dos dados (ver app.data.registry)
+    use_cache: bool = True
+    compact: bool = True         # rótulos como category e contagens como Int32 (app.utils.dtypes)
+    release_intermediate: bool = True  # descarta INTERMEDIATE_FRAMES depois de derivados
+
+    _frames: dict = field(default_factory=dict, init=False, repr=False)
+    _digest: str | None = field(default=None, init=False, repr=False)
+    _derived: dict = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False, compare=False)
+
+    # objetos carregados sob demanda
+    df_dados = _LazyFrame()
+    df_visao = _LazyFrame()
+    df_secretarias_raw = _LazyFrame()
+    df_secretarias = _LazyFrame()
+    df_cargos_raw = _LazyFrame()
+    df_cargos_ev = _LazyFrame()
+    df_cargos_long = _LazyFrame()
+    df_cargos_rank = _LazyFrame()
+    df_min = _LazyFrame()
+    agg_secretarias = _LazyFrame()
+    agg_eventos = _LazyFrame()
+    agg_eventos_tipo = _LazyFrame()
+    agg_cargos_tipo = _LazyFrame()
+    key_secretarias = _LazyFrame()
+    key_eventos = _LazyFrame()
+    key_cargos = _LazyFrame()
+
+    @classmethod
+    def from_frames(cls, frames: dict[str, pd.DataFrame], *, source: Path, version: str | None = None):
+        """Repositório a partir de frames já prontos (ex.: app.data.history), sem ler o Excel.
+
+        Os frames do manifesto não informados são derivados destes; sem cache colunar.
+        """
+        # frames informados não podem ser relidos de uma planilha: ficam todos em memória
+        repo = cls(Path(source), version=version, use_cache=False, release_intermediate=False)
+        repo._frames.update(frames)
+        return repo
+
+    @property
+    def cargo_cols(self) -> list:
+        return list(self.df_cargos_long["Cargo"].cat.categories)
 
-    # objetos carregados
-    df_dados: pd.DataFrame | None = None
-    df_visao: pd.DataFrame | None = None
-    df_secretarias_raw: pd.DataFrame | None = None
-    df_secretarias: pd.DataFrame | None = None
-    df_cargos_raw: pd.DataFrame | None = None
-    df_cargos_ev: pd.DataFrame | None = None
-    df_cargos_rank: pd.DataFrame | None = None
-    cargo_cols: list | None = None
-
-    def load(self):
-        (self.df_dados,
-         self.df_visao,
-         self.df_secretarias_raw,
-         self.df_cargos_raw,
-         _df_min) = load_sheets(self.excel_path)
-
-        # limpa SECRETARIA-ÓRGÃO
-        self.df_secretarias = clean_secretarias(self.df_secretarias_raw)
-
-        # prepara CARGOS
-        evento_col = self.df_cargos_raw.columns[0]
-        mask_evento = self.df_cargos_raw[evento_col].astype(str).str.contains(
-            r"Masterclass|Workshop|Curso", case=False, na=False
-        )
-        self.df_cargos_ev = self.df_cargos_raw.loc[mask_evento].copy()
-        self.df_cargos_ev["Tipo"] = (
-            self.df_cargos_ev[evento_col]
-            .str.extract(r"(Masterclass|Workshop|Curso)", expand=False)
-            .str.title()
-            .replace({"Curso": "Curso de IA"})
-        )
-        self.cargo_cols = [c for c in self.df_cargos_ev.columns if c not in [evento_col, "Tipo"]]
-        self.df_cargos_ev[self.cargo_cols] = (
-            self.df_cargos_ev[self.cargo_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
-        )
-        totais_por_cargo = self.df_cargos_ev[self.cargo_cols].sum().sort_values(ascending=False)
-        self.df_cargos_rank = (
-            pd.DataFrame({"Cargo": totais_por_cargo.index, "Inscritos": totais_por_cargo.values})
-            .sort_values("Inscritos", ascending=False).set_index("Cargo")
-        )
+    @traced("repo.load")
+    def load(self, names=PAGE_FRAMES):
+        """Materializa de uma vez os frames pedidos (por padrão, os usados pelas páginas).
+
+        As abas que não estiverem no cache colunar são lidas juntas, numa única passada.
+        """
+        with self._lock:
+            pending = [n for n in names if n not in self._frames and self._cached(n) is None]
+            sheets = {}
+            for name in pending:
+                # sobe pelas dependências até um frame já disponível ou até a aba de origem
+                while name not in self._frames and self._cached(name) is None:
+                    spec = FRAME_MANIFEST[name]
+                    if spec.source is None:
+                        sheets[name] = (spec.sheet, spec.header, spec.required)
+                        break
+                    name = spec.source
+            if sheets:
+                frames = read_sheets(self.excel_path, list(sheets.values()))
+                for name, df in zip(sheets, frames):
+                    self._store(name, df)
+            for name in names:
+                self.frame(name)
+        return self
+
+    def frame(self, name: str) -> pd.DataFrame | None:
+        """Retorna o frame ``name``, materializando-o (e suas dependências) se preciso."""
+        # uma única consulta, sob o lock: _release_sources pode retirar intermediários de _frames
+        with self._lock:
+            df = self._frames.get(name, _MISSING)
+            if df is _MISSING:
+                df = self._cached(name)
+                if df is None:
+                    df = self._store(name, self._build(name))
+            return df
+
+    def _store(self, name: str, df: pd.DataFrame | None) -> pd.DataFrame | None:
+        spec = FRAME_MANIFEST[name]
+        if df is not None and self.compact and (spec.labels or spec.counts):
+            df = compact_frame(df, spec.labels, spec.counts)
+        key = self._cache_key(name)
+        if key:
+            save_frame(key, name, df)
+        self._frames[name] = df
+        self._release_sources(name)
+        return df
+
+    def _release_sources(self, name: str) -> None:
+        source = FRAME_MANIFEST[name].source
+        if (self.release_intermediate and source in INTERMEDIATE_FRAMES
+                and all(d in self._frames for d in _DEPENDENTS[source])):
+            self._frames.pop(source, None)
+
+    def _build(self, name: str) -> pd.DataFrame | None:
+        spec = FRAME_MANIFEST[name]
+        with span(f"frame:{name}"):
+            if spec.source is not None:
+                df = self.frame(spec.source)
+            else:
+                df = read_sheet(self.excel_path, spec.sheet, spec.header, spec.required)
+            if df is not None and spec.clean is not None:
+                df = spec.clean(df)
+            return df
+
+    def _cache_key(self, name: str) -> str | None:
+        # frames sem compactação não são gravados (o cache guarda só o formato compacto)
+        if not (self.use_cache and self.compact and CACHE_ENABLED and FRAME_MANIFEST[name].cache):
+            return None
+        if self._digest is None:
+            self._digest = workbook_hash(self.excel_path)
+        return self._digest
+
+    def _cached(self, name: str) -> pd.DataFrame | None:
+        if name in self._frames:
+            return self._frames[name]
+        key = self._cache_key(name)
+        if not key:
+            return None
+        with span("frame_cache", frame=name):
+            df = load_frame(key, name)
+        count("frames.parquet.hit" if df is not None else "frames.parquet.miss")
+        if df is not None:
+            self._frames[name] = df
+            self._release_sources(name)
+        return df
+
+    def _memo(self, key: str, fn):
+        """Valor derivado calculado uma vez por repositório (isto é, por versão dos dados)."""
+        if key in self._derived:
+            return self._derived[key]
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = fn()
+            return self._derived[key]
 
     # ---- exposed helpers -----------------------------------------------------
 
+    def totais_visao(self) -> tuple[int, int]:
+        """(inscritos, certificados) da linha TOTAL GERAL, localizada uma única vez."""
+        total = self._memo("total_visao", lambda: locate_total_visao(self.df_visao))
+        return self._memo("totais_visao", lambda: get_totais_visao(self.df_visao, total))
+
+    def org_keys(self) -> pd.Series:
+        """Chave canônica do órgão para cada linha de df_secretarias (calculada uma vez)."""
+        return self._memo("org_keys", lambda: org_keys(self.df_secretarias["SECRETARIA/ÓRGÃO"]))
+
+    def memory_report(self) -> pd.DataFrame:
+        """Memória de tudo o que o repositório mantém: frames materializados e valores derivados
+        (``memo:<chave>``) que sejam Series/DataFrames; linhas, colunas e bytes, do maior para o menor."""
+        with self._lock:
+            frames = dict(self._frames)
+            frames |= {f"memo:{k}": v for k, v in self._derived.items() if isinstance(v, (pd.Series, pd.DataFrame))}
+        rows = [
+            {"frame": name, "linhas": len(df), "colunas": 1 if df.ndim == 1 else df.shape[1], "bytes": frame_memory(df)}
+            for name, df in frames.items() if df is not None
+        ]
+        return (pd.DataFrame(rows, columns=["frame", "linhas", "colunas", "bytes"])
+                .sort_values("bytes", ascending=False, ignore_index=True))
+
     def get_kpis(self, alias: dict | None = None) -> tuple[int, int, float, int]:
-        tot_insc, tot_cert = get_totais_visao(self.df_visao)
+        tot_insc, tot_cert = self.totais_visao()
         taxa_cert = (tot_cert / tot_insc * 100) if tot_insc else 0.0
-        sec_atendidas = count_secretarias_unicas(self.df_secretarias, alias=alias)
+        count = lambda: count_secretarias_unicas(self.df_secretarias, alias=alias, org_key=self.org_keys())
+        sec_atendidas = self._memo("sec_atendidas", count) if alias is None else count()
         return tot_insc, tot_cert, taxa_cert, sec_atendidas
 
+    # Os acessores devolvem visões somente leitura (sem cópia): o repositório é compartilhado
+    # entre sessões, então quem precisar alterar deve derivar um novo frame.
+
     def secretarias_filtered(self) -> pd.DataFrame:
         """Por enquanto, usa todas as secretarias (filtro oculto)."""
-        return self.df_secretarias.copy()
+        return read_only(self.df_secretarias)
 
     def cargos_rank(self) -> pd.DataFrame:
-        return self.df_cargos_rank.copy()
+        return read_only(self.df_cargos_rank)
 
-    def cargos_ev(self) -> pd.DataFrame:
-        return self.df_cargos_ev.copy()
+    def cargos_long(self) -> pd.DataFrame:
+        """Evento, Tipo, Cargo (categóricos) e Inscritos: uma linha por evento e cargo."""
+        return read_only(self.df_cargos_long)
 
     def visao(self) -> pd.DataFrame:
-        return self.df_visao.copy()
+        return read_only(self.df_visao)
+
+    # ---- agregados (um cálculo por versão dos dados) -------------------------
+
+    def secretarias_totais(self) -> pd.DataFrame:
+        """SECRETARIA/ÓRGÃO, inscritos, certificados e taxa de certificação (ordem alfabética)."""
+        return read_only(self.agg_secretarias)
+
+    def eventos_metricas(self) -> pd.DataFrame:
+        """Eventos da VISÃO ABERTA com Tipo, taxa de certificação e evasão."""
+        return read_only(self.agg_eventos)
+
+    def eventos_por_tipo(self) -> pd.DataFrame:
+        return read_only(self.agg_eventos_tipo)
+
+    def cargos_por_tipo(self) -> pd.DataFrame:
+        """Cargo x Tipo de evento (inscritos)."""
+        return read_only(self.agg_cargos_tipo)
@@ -0,0 +1,121 @@
+"""Versões (snapshots) da planilha alinhadas pelas chaves canônicas, e o que mudou entre duas delas.
+
+Uso:
+    python -m app.data.snapshots dados_main/relatorio_capacitia.xlsx dados_main/RelatorioCapacitia_AtualizadoAgosto.xlsx
+    python -m app.data.snapshots antes.xlsx depois.xlsx --dimensoes eventos --todas
+    python -m app.data.snapshots antes.xlsx depois.xlsx --out relatorios/   # delta_<dimensão>.csv
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from app.data.registry import get_repository
+from app.data.repository import DataRepository
+from app.domain.deltas import compute_delta
+
+SNAPSHOT_DIR = Path("dados_main")
+
+# dimensão comparável -> frame por chave canônica no FRAME_MANIFEST
+DIMENSIONS = {
+    "secretarias": "key_secretarias",
+    "eventos": "key_eventos",
+    "cargos": "key_cargos",
+}
+
+
+@dataclass
+class Snapshot:
+    """Uma versão da planilha e os frames por chave que ela conseguiu fornecer.
+
+    Planilhas de layout antigo (ex.: sem a aba SECRETARIA-ÓRGÃO) ficam com a dimensão
+    correspondente ausente (None) em vez de invalidar o snapshot inteiro.
+    """
+    name: str
+    repo: DataRepository
+    frames: dict[str, pd.DataFrame | None]
+
+    def available(self) -> list[str]:
+        return [d for d, df in self.frames.items() if df is not None]
+
+
+def discover_snapshots(folder: Path = SNAPSHOT_DIR) -> list[Path]:
+    """Planilhas .xlsx da pasta, da mais antiga para a mais recente (mtime, depois nome)."""
+    paths = [p for p in Path(folder).glob("*.xlsx") if not p.name.startswith("~$")]
+    return sorted(paths, key=lambda p: (p.stat().st_mtime_ns, p.name))
+
+
+def _load_snapshot(path: Path) -> Snapshot:
+    repo = get_repository(path)  # mesmo registro/cache colunar das páginas
+    frames = {}
+    for dim, frame in DIMENSIONS.items():
+        try:
+            frames[dim] = repo.frame(frame)
+        except (KeyError, ValueError):
+            frames[dim] = None  # aba ausente ou com outro layout nesta versão
+    return Snapshot(Path(path).name, repo, frames)
+
+
+def load_snapshots(paths=None) -> list["Snapshot"]:
+    """Carrega várias versões da planilha, uma após a outra, na ordem dada.
+
+    Arquivos já lidos vêm do registro em memória ou do cache colunar, sem novo parse. Não há
+    leitura em threads: o parse do openpyxl é CPU-bound e segura o GIL.
+    """
+    paths = discover_snapshots() if paths is None else paths
+    return [_load_snapshot(p) for p in paths]
+
+
+def snapshot_delta(antes: Snapshot, depois: Snapshot, dimension: str) -> pd.DataFrame | None:
+    """Variação de inscritos, certificados e taxa entre dois snapshots; None se a dimensão
+    não existir em algum deles."""
+    a, d = antes.frames.get(dimension), depois.frames.get(dimension)
+    if a is None or d is None:
+        return None
+    return compute_delta(a, d)
+
+
+# colunas mostradas no terminal (o CSV de --out leva todas)
+_RESUMO = ["Rótulo", "Situação", "Nº INSCRITOS (depois)", "Δ Nº INSCRITOS",
+           "Nº CERTIFICADOS (depois)", "Δ Nº CERTIFICADOS", "Taxa (%) (depois)", "Δ Taxa (p.p.)"]
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.data.snapshots",
+                                 description="O que mudou entre duas versões da planilha CapacitIA.")
+    ap.add_argument("antes", type=Path, help="versão anterior (.xlsx)")
+    ap.add_argument("depois", type=Path, help="versão mais recente (.xlsx)")
+    ap.add_argument("--dimensoes", nargs="+", choices=list(DIMENSIONS), default=list(DIMENSIONS))
+    ap.add_argument("--todas", action="store_true", help="mostra também as linhas sem alteração")
+    ap.add_argument("--out", type=Path, help="grava <out>/delta_<dimensão>.csv com todas as colunas")
+    args = ap.parse_args(argv)
+
+    missing = [str(p) for p in (args.antes, args.depois) if not p.exists()]
+    if missing:
+        ap.error("arquivo(s) não encontrado(s): " + ", ".join(missing))
+
+    antes, depois = load_snapshots([args.antes, args.depois])
+    for dim in args.dimensoes:
+        delta = snapshot_delta(antes, depois, dim)
+        if delta is None:
+            faltando = [s.name for s in (antes, depois) if dim not in s.available()]
+            print(f"{dim}: indisponível em {', '.join(faltando)}\n")
+            continue
+        situacoes = delta["Situação"].value_counts()
+        print(f"{dim}: " + ", ".join(f"{n} {s}" for s, n in situacoes.items()))
+        linhas = delta if args.todas else delta[delta["Situação"] != "igual"]
+        if not linhas.empty:
+            print(linhas[_RESUMO].to_string(index=False, float_format=lambda v: f"{v:.2f}"))
+        print()
+        if args.out is not None:
+            args.out.mkdir(parents=True, exist_ok=True)
+            dest = args.out / f"delta_{dim}.csv"
+            delta.reset_index().to_csv(dest, index=False, encoding="utf-8")
+            print(f"{dest} ({len(delta)} linhas)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,3 +6,12 @@ DEFAULT_CANDIDATES = [
     Path("RelatorioCapacitia_AtualizadoAgosto.xlsx"),
     Path("relatorio_capacitia.xlsx"),
 ]
+
+_DEFAULT: Path | None = None
+
+def default_workbook() -> Path | None:
+    """Primeira candidata existente, resolvida uma vez por processo (None se nenhuma existe)."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = next((p for p in DEFAULT_CANDIDATES if p.exists()), None)
+    return _DEFAULT
@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+from pathlib import Path
+
+from app.data.registry import (
+    current_signature, data_version, file_signature, get_repository, publish_repository, set_watched,
+)
+from app.data.repository import DataRepository
+
+log = logging.getLogger(__name__)
+
+# intervalo de verificação do arquivo, em segundos; 0 desliga o watcher
+WATCH_INTERVAL = float(os.environ.get("CAPACITIA_WATCH_INTERVAL", "5"))
+
+_LOCK = threading.Lock()
+_WATCHERS: dict[Path, "WorkbookWatcher"] = {}
+
+
+class WorkbookWatcher(threading.Thread):
+    """Verifica periodicamente (mtime, tamanho) da planilha e, quando ela muda, carrega a nova
+    versão nesta thread e só então a publica no registro.
+
+    A planilha é substituída no lugar; por isso a recarga só começa depois que a assinatura
+    se repete em duas verificações seguidas (arquivo terminou de ser gravado). Se a leitura
+    falhar, a versão anterior continua publicada e a recarga é tentada de novo na próxima mudança.
+    """
+
+    def __init__(self, path: Path, interval: float = WATCH_INTERVAL):
+        super().__init__(name=f"capacitia-watch-{Path(path).name}", daemon=True)
+        self.path = Path(path).resolve()
+        self.interval = interval
+        self.reloads = 0
+        self.last_error: Exception | None = None
+        self._pending: tuple[int, int] | None = None
+        self._failed: tuple[int, int] | None = None
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stopped.set()
+
+    def check(self) -> bool:
+        """Uma verificação; True se uma nova versão foi publicada."""
+        try:
+            sig = file_signature(self.path)
+        except OSError:
+            return False  # arquivo ausente durante a troca; tenta de novo depois
+        if sig == current_signature(self.path) or sig == self._failed:
+            self._pending = None
+            return False
+        if sig != self._pending:
+            self._pending = sig  # espera a gravação estabilizar
+            return False
+        self._pending = None
+        return self.reload(sig)
+
+    def reload(self, sig: tuple[int, int]) -> bool:
+        try:
+            repo = DataRepository(self.path, version=data_version(sig))
+            repo.load()        # frames das páginas + agregados
+            repo.get_kpis()    # totais e secretarias atendidas memoizados
+        except Exception as exc:
+            self._failed, self.last_error = sig, exc
+            log.warning("Falha ao recarregar %s: %s", self.path, exc)
+            return False
+        if file_signature(self.path) != sig:
+            return False  # mudou durante a leitura; a próxima verificação recarrega
+        publish_repository(self.path, sig, repo)
+        self.reloads += 1
+        self._failed = self.last_error = None
+        return True
+
+
+def watch_workbook(path: Path, interval: float = WATCH_INTERVAL) -> WorkbookWatcher | None:
+    """Inicia (uma vez por arquivo e processo) o watcher de ``path``.
+
+    Enquanto ele roda, ``get_repository(path)`` devolve sempre a versão publicada, sem
+    verificar o arquivo nem esperar por recargas.
+    """
+    if interval <= 0:
+        return None
+    key = Path(path).resolve()
+    with _LOCK:
+        watcher = _WATCHERS.get(key)
+        if watcher is not None and watcher.is_alive():
+            return watcher
+        get_repository(key)  # garante uma versão publicada antes de ligar o modo "watched"
+        watcher = _WATCHERS[key] = WorkbookWatcher(key, interval)
+        set_watched(key)
+        watcher.start()
+        return watcher
+
+
+def stop_watchers(timeout: float | None = None) -> None:
+    """Para os watchers e espera as threads terminarem (uma recarga em andamento é concluída)."""
+    with _LOCK:
+        watchers = list(_WATCHERS.items())
+        _WATCHERS.clear()
+        for key, watcher in watchers:
+            watcher.stop()
+            set_watched(key, False)
+    for _, watcher in watchers:
+        watcher.join(timeout)
@@ -0,0 +1,36 @@
+import pandas as pd
+import streamlit as st
+
+from app.charts.cache import FIGURE_CACHE
+
+TOP_SPANS = 15
+
+# ---- painel oculto (?debug=1): spans mais lentos da sessão -------------------
+
+def _spans(traces: list[dict]) -> pd.DataFrame:
+    df = pd.DataFrame([{**s, "rerun": i} for i, t in enumerate(traces) for s in t["spans"]])
+    base = ["rerun", "nome", "profundidade", "ms", "rss_processo_kb"]
+    return df.reindex(columns=base + [c for c in df.columns if c not in base])  # + atributos (aba, frame)
+
+def render(traces: list[dict]):
+    """``traces``: registros de app.tracing.end_rerun desta sessão (o último é o rerun atual)."""
+    atual = traces[-1]
+    with st.expander("🛠️ Debug — tempos por etapa", expanded=True):
+        rss = atual["rss_processo_kb"]
+        mem = "" if rss is None else f" · RSS do processo {rss:+,} kB (inclui outras sessões)"
+        st.caption(f"Rerun atual ({atual['rerun']}): {atual['total_ms']:.1f} ms{mem} · "
+                   f"cache do rerun: {atual['cache'] or '—'} · figuras: {FIGURE_CACHE.stats()}")
+
+        spans = _spans(traces)
+        st.markdown("**Spans mais lentos — rerun atual**")
+        st.dataframe(spans[spans["rerun"] == len(traces) - 1].drop(columns="rerun")
+                     .sort_values("ms", ascending=False).head(TOP_SPANS).round(2),
+                     use_container_width=True, hide_index=True)
+
+        st.markdown(f"**Por etapa — últimos {len(traces)} reruns da sessão**")
+        resumo = (spans.groupby("nome")["ms"].agg(n="count", total_ms="sum", medio_ms="mean", max_ms="max")
+                  .sort_values("max_ms", ascending=False).head(TOP_SPANS))
+        st.dataframe(resumo.round(2), use_container_width=True)
+
+        st.markdown("**JSON do rerun atual**")
+        st.json(atual, expanded=False)
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from app.domain.events import TIPO_OUTRO, classify_events
+from app.domain.filters import drop_empty_labels
+from app.tracing import traced
+from app.utils.dtypes import plain_frame, plain_series
+
+# Cubos agregados compartilhados pelas páginas; calculados uma vez por versão dos dados
+# (entradas derivadas do FRAME_MANIFEST em app.data.repository).
+
+def _nz(df: pd.DataFrame, required_cols) -> pd.DataFrame:
+    # mesmo critério de app.charts.common.nz, sem depender da camada de gráficos
+    return df.replace([np.inf, -np.inf], pd.NA).dropna(subset=required_cols)
+
+def _taxa(num: pd.Series, den: pd.Series) -> pd.Series:
+    return (num / den).replace([pd.NA, float("inf")], 0).fillna(0) * 100
+
+@traced()
+def secretarias_totais(df_secretarias: pd.DataFrame) -> pd.DataFrame:
+    """Inscritos, certificados e taxa de certificação por secretaria (ordem alfabética)."""
+    df = drop_empty_labels(df_secretarias, "SECRETARIA/ÓRGÃO")
+    grp = plain_frame(
+        df.groupby("SECRETARIA/ÓRGÃO", observed=True)[["Nº INSCRITOS", "Nº CERTIFICADOS"]]
+          .sum()
+          .reset_index()
+    )
+    grp = _nz(grp, ["Nº INSCRITOS", "Nº CERTIFICADOS"])
+    grp["Taxa de Certificação (%)"] = _taxa(grp["Nº CERTIFICADOS"], grp["Nº INSCRITOS"])
+    return grp
+
+@traced()
+def eventos_metricas(df_visao: pd.DataFrame) -> pd.DataFrame:
+    """Uma linha por evento da VISÃO ABERTA com Tipo, taxa de certificação, evasão, número e rótulo curto."""
+    ev = df_visao.assign(**{
+        "EVENTO": plain_series(df_visao["EVENTO"]),
+        "Nº INSCRITOS": plain_series(pd.to_numeric(df_visao["Nº INSCRITOS"], errors="coerce")),
+        "Nº CERTIFICADOS": plain_series(pd.to_numeric(df_visao["Nº CERTIFICADOS"], errors="coerce")),
+    })
+    ev = _nz(ev, ["Nº INSCRITOS", "Nº CERTIFICADOS"])
+    classes = classify_events(ev["EVENTO"])
+    ev["Tipo"] = classes["Tipo"].fillna(TIPO_OUTRO)
+    ev["Taxa de Certificação (%)"] = _taxa(ev["Nº CERTIFICADOS"], ev["Nº INSCRITOS"])
+    ev["Evasão (Nº)"] = (ev["Nº INSCRITOS"] - ev["Nº CERTIFICADOS"]).clip(lower=0)
+    ev["Número"] = classes["Número"]
+    ev["Rótulo"] = classes["Rótulo"]  # rótulo curto (treemap)
+    return ev
+
+@traced()
+def eventos_por_tipo(ev_metricas: pd.DataFrame) -> pd.DataFrame:
+    """Totais de inscritos e certificados por Tipo de evento."""
+    return ev_metricas.groupby("Tipo")[["Nº INSCRITOS", "Nº CERTIFICADOS"]].sum()
+
+@traced()
+def cargos_por_tipo(df_cargos_long: pd.DataFrame) -> pd.DataFrame:
+    """Inscritos por cargo (linhas, na ordem da planilha) e Tipo de evento (colunas)."""
+    tipos = df_cargos_long["Tipo"].dropna().unique()
+    grp = (df_cargos_long.groupby(["Cargo", "Tipo"], observed=False)["Inscritos"].sum()
+           .unstack("Tipo"))
+    grp = plain_frame(grp[sorted(tipos)]).rename_axis(index=None, columns="Tipo")
+    return grp.replace([np.inf, -np.inf], 0).fillna(0)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from app.utils.text import org_keys
+from app.tracing import traced
+
+# Comparação entre versões (snapshots) da planilha. Cada dimensão é reduzida a um frame
+# indexado pela chave canônica (sem acentos, espaços colapsados, maiúsculas) com inscritos e
+# certificados; os deltas são calculados por alinhamento de índice, sem laços por linha.
+
+METRICAS = ["Nº INSCRITOS", "Nº CERTIFICADOS"]
+
+def _por_chave(labels: pd.Series, values: pd.DataFrame) -> pd.DataFrame:
+    keyed = values.assign(Chave=org_keys(labels).to_numpy(), Rótulo=labels.to_numpy())
+    keyed = keyed[keyed["Chave"] != ""]
+    g = keyed.groupby("Chave", sort=True)
+    out = g[METRICAS].sum(min_count=1)  # coluna só com ausentes continua ausente
+    out.insert(0, "Rótulo", g["Rótulo"].first())
+    return out
+
+@traced()
+def secretarias_por_chave(grp_secretarias: pd.DataFrame) -> pd.DataFrame:
+    """Totais por secretaria (saída de secretarias_totais) indexados pela org_key."""
+    return _por_chave(grp_secretarias["SECRETARIA/ÓRGÃO"], grp_secretarias[METRICAS])
+
+@traced()
+def eventos_por_chave(ev_metricas: pd.DataFrame) -> pd.DataFrame:
+    """Totais por evento (saída de eventos_metricas) indexados pelo nome normalizado."""
+    return _por_chave(ev_metricas["EVENTO"], ev_metricas[METRICAS])
+
+@traced()
+def cargos_por_chave(df_cargos_rank: pd.DataFrame) -> pd.DataFrame:
+    """Inscritos por cargo (saída de rank_cargos); a aba CARGOS não traz certificados."""
+    values = pd.DataFrame({
+        "Nº INSCRITOS": pd.to_numeric(df_cargos_rank["Inscritos"], errors="coerce").fillna(0).to_numpy(),
+        "Nº CERTIFICADOS": np.nan,
+    })
+    return _por_chave(pd.Series(df_cargos_rank.index), values)
+
+def _taxa(cert: pd.Series, insc: pd.Series) -> pd.Series:
+    cert, insc = cert.to_numpy(dtype=float), insc.to_numpy(dtype=float)
+    out = np.divide(cert, insc, out=np.zeros_like(cert), where=insc > 0) * 100
+    return np.where(np.isnan(cert), np.nan, out)
+
+@traced()
+def compute_delta(antes: pd.DataFrame, depois: pd.DataFrame) -> pd.DataFrame:
+    """Alinha dois frames ``*_por_chave`` e calcula as variações entre eles.
+
+    Chaves presentes em só um dos lados entram com zero do outro lado e ``Situação`` igual a
+    "novo" ou "removido". A variação da taxa de certificação é dada em pontos percentuais.
+    """
+    a, d = antes.align(depois, join="outer", axis=0)
+    rotulo = d["Rótulo"].fillna(a["Rótulo"])
+    situacao = np.select(
+        [a["Rótulo"].isna(), d["Rótulo"].isna(),
+         (a[METRICAS].fillna(0).to_numpy() == d[METRICAS].fillna(0).to_numpy()).all(axis=1)],
+        ["novo", "removido", "igual"],
+        default="alterado",
+    )
+    out = pd.DataFrame({"Rótulo": rotulo, "Situação": situacao}, index=a.index)
+    for m in METRICAS:
+        # sem registro no snapshot = 0; coluna inteira ausente (ex.: certificados de cargos) = NaN
+        va = a[m] if a[m].isna().all() else a[m].fillna(0)
+        vd = d[m] if d[m].isna().all() else d[m].fillna(0)
+        out[f"{m} (antes)"] = va
+        out[f"{m} (depois)"] = vd
+        out[f"Δ {m}"] = vd - va
+    out["Taxa (%) (antes)"] = _taxa(out["Nº CERTIFICADOS (antes)"], out["Nº INSCRITOS (antes)"])
+    out["Taxa (%) (depois)"] = _taxa(out["Nº CERTIFICADOS (depois)"], out["Nº INSCRITOS (depois)"])
+    out["Δ Taxa (p.p.)"] = out["Taxa (%) (depois)"] - out["Taxa (%) (antes)"]
+    out.index.name = "Chave"
+    return out.sort_values(["Δ Nº INSCRITOS", "Rótulo"], ascending=[False, True], kind="stable")
@@ -0,0 +1,43 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from app.tracing import traced
+
+# Classificação dos eventos pelo nome (VISÃO ABERTA e CARGOS): Tipo, número do evento e rótulo
+# curto para os gráficos. As operações de texto rodam só sobre os nomes distintos, uma vez por
+# versão dos dados (colunas de agg_eventos / df_cargos_ev em app.data.repository).
+
+TIPOS = ("Curso de IA", "Masterclass", "Workshop")
+TIPO_OUTRO = "Outro"
+
+_TIPO_PATTERN = re.compile(r"(Masterclass|Workshop|Curso)", re.I)
+# "3ª Masterclass", "10º Curso de IA"... no trecho antes do ":"
+_ROTULO_PATTERN = re.compile(r"(\d+)\s*[ºª]?\s*(Masterclass|Workshop|Curso(?:\s+de\s+IA)?)", re.I)
+_CURSO_PATTERN = re.compile(r"(?i)^curso(?:\s+de\s+ia)?$")
+
+def _classify_unique(nomes: pd.Series) -> pd.DataFrame:
+    tipo = (nomes.str.extract(_TIPO_PATTERN, expand=False)
+            .str.title().replace({"Curso": "Curso de IA"}))
+
+    base = nomes.str.split(":", n=1).str[0].str.strip()
+    base = base.where(base != "", tipo.fillna(TIPO_OUTRO))
+    m = base.str.extract(_ROTULO_PATTERN)
+    kind = m[1].str.replace(_CURSO_PATTERN, "Curso de IA", regex=True).str.title()
+    rotulo = (m[0] + "° " + kind).where(m[0].notna(), base.str.split().str[:4].str.join(" "))
+    return pd.DataFrame({
+        "Tipo": tipo,
+        "Número": pd.to_numeric(m[0], errors="coerce").astype("Int32"),
+        "Rótulo": rotulo,
+    })
+
+@traced()
+def classify_events(eventos: pd.Series) -> pd.DataFrame:
+    """Tipo (Curso de IA/Masterclass/Workshop; ausente se não reconhecido), Número e Rótulo
+    curto de cada nome de evento, alinhados ao índice de ``eventos``."""
+    codes, uniques = pd.factorize(eventos, use_na_sentinel=True)
+    nomes = pd.Series(np.append(np.asarray(uniques, dtype=object), np.nan), dtype=object)
+    classes = _classify_unique(nomes.where(nomes.notna(), "nan").astype(str))
+    # código -1 (nome ausente) cai na última linha
+    return classes.iloc[np.where(codes < 0, len(uniques), codes)].set_axis(eventos.index)
@@ -1,13 +1,26 @@
+import re
 import pandas as pd
 import numpy as np
+from app.domain.events import classify_events
+from app.tracing import traced
+from app.utils.dtypes import plain_frame
+
+# rótulos de seção/total na coluna de rótulos (texto já em maiúsculas)
+_META_PATTERN = re.compile(r"ATIVIDADE/EVENTO|TOTAL GERAL|^TOTAL$")
 
 def _find_header_row(df: pd.DataFrame) -> int:
     """Detecta em até 15 primeiras linhas onde está o cabeçalho real."""
-    for i in range(min(15, len(df))):
-        row_txt = " ".join([str(v).upper() for v in df.iloc[i].tolist()])
-        if "SECRETARIA/ÓRGÃO" in row_txt and "INSCRIT" in row_txt:
-            return i
-    return 0
+    top = df.head(15).astype(str).apply(lambda s: s.str.upper())
+    has_org = top.apply(lambda s: s.str.contains("SECRETARIA/ÓRGÃO", regex=False)).any(axis=1)
+    has_ins = top.apply(lambda s: s.str.contains("INSCRIT", regex=False)).any(axis=1)
+    hits = np.flatnonzero((has_org & has_ins).to_numpy())
+    return int(hits[0]) if len(hits) else 0
+
+def _match_labels(s: pd.Series, pattern: re.Pattern) -> np.ndarray:
+    """Aplica ``pattern`` (em maiúsculas) só aos valores distintos de ``s`` e reespalha o resultado."""
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    hit = pd.Series(uniques, dtype=object).astype(str).str.upper().str.contains(pattern, na=False).to_numpy()
+    return np.append(hit, False)[codes]  # código -1 (ausente) cai no False final
 
 def _col_like(df: pd.DataFrame, *keywords):
     up = {c: str(c).upper().replace("\xa0", " ") for c in df.columns}
@@ -18,36 +31,39 @@ def _col_like(df: pd.DataFrame, *keywords):
 
 def drop_empty_labels(df: pd.DataFrame, col: str) -> pd.DataFrame:
     s = df[col].astype(str)
-    mask = s.str.strip().ne("") & ~s.str.lower().isin(["nan", "none", "nat"])
-    return df.loc[mask].copy()
+    mask = df[col].notna() & s.str.strip().ne("") & ~s.str.lower().isin(["nan", "none", "nat"])
+    return df.loc[mask]
 
+@traced()
 def clean_secretarias(df_secretarias_raw: pd.DataFrame) -> pd.DataFrame:
     """Limpa a aba SECRETARIA-ÓRGÃO (cabeçalho dinâmico, remove totais e normaliza números)."""
-    df = df_secretarias_raw.copy()
-    hdr = _find_header_row(df)
-    df = df.iloc[hdr:].reset_index(drop=True)
-    df.columns = df.iloc[0]
-    df = df.iloc[1:].copy()
-
-    # remover linhas de seções/totais
-    mask_meta = df.astype(str).apply(
-        lambda s: s.str.upper().str.contains("ATIVIDADE/EVENTO|TOTAL GERAL|^TOTAL$", na=False)
-    ).any(axis=1)
-    df = df[~mask_meta].dropna(how="all").copy()
+    df = df_secretarias_raw
+    if _col_like(df, "INSCRIT") is None:  # lido com header=None: cabeçalho ainda nas linhas
+        hdr = _find_header_row(df)
+        header = df.iloc[hdr]
+        df = df.iloc[hdr + 1:]
+        df = df.set_axis(header.tolist(), axis=1)
+        df = df.set_axis(pd.RangeIndex(1, len(df) + 1), axis=0)
 
     # identificar colunas
     col_ins = _col_like(df, "INSCRIT") or "Nº INSCRITOS"
     col_cer = _col_like(df, "CERTIFIC") or "Nº CERTIFICADOS"
     col_eva = _col_like(df, "EVAS")     or "Nº EVASÃO"
+    nome_org_col = [c for c in df.columns if "SECRETARIA" in str(c).upper() or "ÓRGÃO" in str(c).upper()][0]
 
-    # normaliza numéricos
-    for col in [col_ins, col_cer, col_eva]:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    # remover linhas de seções/totais: rótulos ficam na 1ª coluna (Nº) ou na de órgão
+    mask_meta = np.zeros(len(df), dtype=bool)
+    for col in {df.columns[0], nome_org_col}:
+        mask_meta |= _match_labels(df[col], _META_PATTERN)
 
-    # coluna de órgão
-    nome_org_col = [c for c in df.columns if "SECRETARIA" in str(c).upper() or "ÓRGÃO" in str(c).upper()][0]
-    df[nome_org_col] = df[nome_org_col].astype(str).str.strip()
+    # filtra e projeta de uma vez só as colunas usadas
+    cols = [c for c in [nome_org_col, col_ins, col_cer, col_eva] if c in df.columns]
+    df = df.loc[~mask_meta, cols].dropna(how="all")
+
+    # normaliza numéricos e a coluna de órgão
+    fixed = {col: pd.to_numeric(df[col], errors="coerce").fillna(0) for col in cols[1:]}
+    fixed[nome_org_col] = df[nome_org_col].astype(str).str.strip()
+    df = df.assign(**fixed)
 
     # renomeia padrões
     ren = {
@@ -57,13 +73,49 @@ def clean_secretarias(df_secretarias_raw: pd.DataFrame) -> pd.DataFrame:
     }
     if col_eva in df.columns:
         ren[col_eva] = "Nº EVASÃO"
-
     df = df.rename(columns=ren)
-    keep = ["SECRETARIA/ÓRGÃO", "Nº INSCRITOS", "Nº CERTIFICADOS"]
-    if "Nº EVASÃO" in df.columns:
-        keep.append("Nº EVASÃO")
-    df = df[keep]
 
     # remove rótulos vazios
     df = drop_empty_labels(df, "SECRETARIA/ÓRGÃO")
     return df
+
+@traced()
+def prepare_cargos_ev(df_cargos_raw: pd.DataFrame) -> pd.DataFrame:
+    """Filtra as linhas de eventos da aba CARGOS, classifica o Tipo e normaliza as contagens."""
+    evento_col = df_cargos_raw.columns[0]
+    tipo = classify_events(df_cargos_raw[evento_col])["Tipo"]
+    mask_evento = tipo.notna().to_numpy()  # só linhas de eventos (Masterclass/Workshop/Curso)
+    df = df_cargos_raw.loc[mask_evento].copy()
+    df["Tipo"] = tipo[mask_evento]
+    cargo_cols = [c for c in df.columns if c not in [evento_col, "Tipo"]]
+    df[cargo_cols] = df[cargo_cols].apply(pd.to_numeric, errors="coerce").fillna(0)
+    return df
+
+@traced()
+def cargos_long(df_cargos_ev: pd.DataFrame) -> pd.DataFrame:
+    """CARGOS em formato longo: uma linha por (evento, cargo) com Evento, Tipo, Cargo e Inscritos.
+
+    Evento e Cargo são categóricos na ordem da planilha (linhas e colunas, respectivamente).
+    """
+    evento_col = df_cargos_ev.columns[0]
+    cargo_cols = [c for c in df_cargos_ev.columns if c not in [evento_col, "Tipo"]]
+    eventos = df_cargos_ev[evento_col].to_numpy(dtype=object)
+    n_cargos = len(cargo_cols)
+    return pd.DataFrame({
+        "Evento": pd.Categorical(np.tile(eventos, n_cargos), categories=pd.unique(eventos)),
+        "Tipo": pd.Categorical(np.tile(df_cargos_ev["Tipo"].to_numpy(dtype=object), n_cargos)),
+        "Cargo": pd.Categorical(np.repeat(np.array(cargo_cols, dtype=object), len(eventos)), categories=cargo_cols),
+        # coluna a coluna (ordem "F"): todos os eventos do 1º cargo, depois os do 2º...
+        "Inscritos": df_cargos_ev[cargo_cols].to_numpy(dtype=float).ravel(order="F"),
+    })
+
+@traced()
+def rank_cargos(df_cargos_long: pd.DataFrame) -> pd.DataFrame:
+    """Total de inscritos por cargo, em ordem decrescente (índice = Cargo)."""
+    # observed=False: cargos sem nenhum evento entram com zero, como colunas vazias na planilha
+    totais = df_cargos_long.groupby("Cargo", observed=False)["Inscritos"].sum()
+    totais_por_cargo = plain_frame(totais.to_frame())["Inscritos"].sort_values(ascending=False)
+    return (
+        pd.DataFrame({"Cargo": totais_por_cargo.index, "Inscritos": totais_por_cargo.values})
+        .sort_values("Inscritos", ascending=False).set_index("Cargo")
+    )
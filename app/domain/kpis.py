@@ -1,9 +1,10 @@
-import re
 import numpy as np
 import pandas as pd
-import unicodedata
+from dataclasses import dataclass
 
-from app.utils.numbers import parse_ptbr_number
+from app.utils.numbers import parse_ptbr_number, parse_ptbr_numbers
+from app.utils.text import org_keys, build_alias_index
+from app.tracing import traced
 
 
 def _col_like(df, *keywords):
@@ -13,30 +14,49 @@ def _col_like(df, *keywords):
             return c
     return None
 
-def _normalize_org(s: str) -> str:
-    s = "" if pd.isna(s) else str(s)
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))  # remove acentos
-    s = re.sub(r"\s+", " ", s).strip().upper()
-    return s
-
-def get_totais_visao(df_visao: pd.DataFrame) -> tuple[int, int]:
-    """Extrai totais a partir da linha 'TOTAL GERAL' na VISÃO ABERTA, com fallbacks robustos."""
-    mask_total = df_visao.astype(str).apply(
-        lambda s: s.str.contains("TOTAL GERAL", case=False, na=False)
-    ).any(axis=1)
+@dataclass(frozen=True)
+class TotalVisao:
+    """Posição da linha 'TOTAL GERAL' e colunas de inscritos/certificados na VISÃO ABERTA."""
+    row_pos: int | None
+    col_ins: str | None
+    col_cer: str | None
+
+@traced()
+def locate_total_visao(df_visao: pd.DataFrame) -> TotalVisao:
+    """Localiza a linha 'TOTAL GERAL' olhando só as colunas de rótulo (não numéricas)."""
     col_ins = _col_like(df_visao, "INSCRIT") or "Nº INSCRITOS"
     col_cer = _col_like(df_visao, "CERTIFIC") or "Nº CERTIFICADOS"
 
-    if mask_total.any():
-        row = df_visao.loc[mask_total].iloc[0]
+    row_pos = None
+    for col in df_visao.columns:
+        s = df_visao[col]
+        if pd.api.types.is_numeric_dtype(s) or pd.api.types.is_datetime64_any_dtype(s):
+            continue  # colunas numéricas não contêm o rótulo
+        hits = s.astype(str).str.contains("TOTAL GERAL", case=False, na=False, regex=False).to_numpy()
+        if hits.any():
+            pos = int(hits.argmax())
+            row_pos = pos if row_pos is None else min(row_pos, pos)
+    return TotalVisao(row_pos, col_ins, col_cer)
+
+@traced()
+def get_totais_visao(df_visao: pd.DataFrame, total: TotalVisao | None = None) -> tuple[int, int]:
+    """Extrai totais a partir da linha 'TOTAL GERAL' na VISÃO ABERTA, com fallbacks robustos.
+
+    ``total`` (de locate_total_visao) evita procurar a linha de novo quando já foi localizada.
+    """
+    if total is None:
+        total = locate_total_visao(df_visao)
+    col_ins, col_cer = total.col_ins, total.col_cer
+
+    if total.row_pos is not None:
+        row = df_visao.iloc[total.row_pos]
 
         val_ins = parse_ptbr_number(row.get(col_ins)) if col_ins in df_visao.columns else np.nan
         val_cer = parse_ptbr_number(row.get(col_cer)) if col_cer in df_visao.columns else np.nan
 
         if pd.isna(val_ins) or pd.isna(val_cer):
-            nums = [parse_ptbr_number(v) for v in row.tolist()]
-            nums = [n for n in nums if pd.notna(n)]
+            nums = parse_ptbr_numbers(row.to_numpy(dtype=object))
+            nums = nums[~np.isnan(nums)]
             if len(nums) >= 2:
                 if pd.isna(val_ins): val_ins = nums[-2]
                 if pd.isna(val_cer): val_cer = nums[-1]
@@ -57,22 +77,25 @@ def get_totais_visao(df_visao: pd.DataFrame) -> tuple[int, int]:
     tot_cert = pd.to_numeric(df_visao[cer_col], errors="coerce").fillna(0).sum() if cer_col else 0
     return int(round(tot_insc)), int(round(tot_cert))
 
+@traced()
 def count_secretarias_unicas(
     df_secretarias_limpa: pd.DataFrame,
     *,
     only_with_inscritos: bool = True,
     drop_genericos: bool = True,
-    alias: dict | None = None
+    alias: dict | None = None,
+    org_key: pd.Series | None = None,
 ) -> int:
-    """Conta quantos órgãos distintos existem, com saneamento e aliases opcionais."""
-    df = df_secretarias_limpa.copy()
+    """Conta quantos órgãos distintos existem, com saneamento e aliases opcionais.
+
+    ``org_key``: chaves canônicas já calculadas (org_keys) alinhadas ao índice do frame.
+    """
+    df = df_secretarias_limpa
+    org = org_key if org_key is not None else org_keys(df["SECRETARIA/ÓRGÃO"].astype(str))
 
     if only_with_inscritos and "Nº INSCRITOS" in df.columns:
         insc = pd.to_numeric(df["Nº INSCRITOS"], errors="coerce").fillna(0)
-        df = df[insc > 0]
-
-    col = "SECRETARIA/ÓRGÃO"
-    org = df[col].astype(str).map(_normalize_org)
+        org = org[(insc > 0).to_numpy()]
 
     invalid = {"", "NAN", "NONE", "NAT"}
     if drop_genericos:
@@ -80,7 +103,8 @@ def count_secretarias_unicas(
 
     org = org[~org.isin(invalid)]
     if alias:
-        org = org.replace({k.upper(): v.upper() for k, v in alias.items()})
+        index = build_alias_index(alias)
+        org = org.map(lambda k: index.get(k, k))
     return int(org.nunique())
 
 def fmt_int_br(n: int) -> str:
@@ -0,0 +1,133 @@
+"""Exporta KPIs e agregados das planilhas sem subir o Streamlit (relatórios noturnos etc.).
+
+Reaproveita DataRepository e as funções de domínio; não importa Streamlit nem Plotly.
+
+Uso:
+    python -m app.export dados_main/RelatorioCapacitia_AtualizadoAgosto.xlsx       # JSON no stdout
+    python -m app.export dados_main/*.xlsx --format csv --out relatorios/
+    python -m app.export planilha.xlsx --format parquet --out relatorios/ --tables kpis secretarias
+
+Com ``--out``, cada tabela vira ``<out>/<tabela>.<formato>`` com uma coluna ``arquivo``
+identificando a planilha de origem (uma linha por planilha no caso dos KPIs).
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+FORMATS = ("json", "csv", "parquet")
+
+
+def _kpis(repo):
+    import pandas as pd
+
+    tot_insc, tot_cert, taxa_cert, sec_atendidas = repo.get_kpis()
+    return pd.DataFrame([{
+        "versao": repo.version,
+        "total_inscritos": int(tot_insc),
+        "total_certificados": int(tot_cert),
+        "taxa_certificacao": round(float(taxa_cert), 4),
+        "secretarias_atendidas": int(sec_atendidas),
+    }])
+
+
+def _secretarias(repo):
+    return (repo.secretarias_totais()
+            .sort_values(["Nº INSCRITOS", "SECRETARIA/ÓRGÃO"], ascending=[False, True])
+            .reset_index(drop=True))
+
+
+def _cargos(repo):
+    return repo.cargos_rank().reset_index()
+
+
+def _eventos(repo):
+    cols = ["Nº", "EVENTO", "Tipo", "Nº INSCRITOS", "Nº CERTIFICADOS", "Evasão (Nº)", "Taxa de Certificação (%)"]
+    ev = repo.eventos_metricas()
+    return ev[[c for c in cols if c in ev.columns]].reset_index(drop=True)
+
+
+def _eventos_tipo(repo):
+    return repo.eventos_por_tipo().reset_index()
+
+
+# tabela -> função (repositório -> DataFrame)
+TABLES = {
+    "kpis": _kpis,
+    "secretarias": _secretarias,
+    "cargos": _cargos,
+    "eventos": _eventos,
+    "eventos_tipo": _eventos_tipo,
+}
+
+
+def export_workbook(path: Path, tables=tuple(TABLES)) -> dict:
+    """{tabela: DataFrame} de uma planilha, via registro/cache colunar do dashboard.
+
+    Tabelas que dependem de abas ausentes nesta planilha (layouts antigos) ficam de fora,
+    com aviso no stderr.
+    """
+    from app.data.registry import get_repository
+
+    repo = get_repository(path)
+    out = {}
+    for name in tables:
+        try:
+            out[name] = TABLES[name](repo)
+        except (KeyError, ValueError) as exc:
+            print(f"aviso: {path}: tabela '{name}' indisponível ({exc})", file=sys.stderr)
+    return out
+
+
+def _write(df, dest: Path, fmt: str) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        df.to_csv(dest, index=False, encoding="utf-8")
+    elif fmt == "parquet":
+        df.to_parquet(dest, index=False)
+    else:
+        dest.write_text(df.to_json(orient="records", force_ascii=False, indent=2), encoding="utf-8")
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.export", description=__doc__.split("\n\n")[0])
+    ap.add_argument("arquivos", nargs="+", type=Path, help="planilhas .xlsx")
+    ap.add_argument("--format", choices=FORMATS, default="json")
+    ap.add_argument("--out", type=Path, help="pasta de saída (sem ela: JSON no stdout)")
+    ap.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    args = ap.parse_args(argv)
+
+    if args.out is None and args.format != "json":
+        ap.error("--format csv/parquet exige --out")
+
+    missing = [str(p) for p in args.arquivos if not p.exists()]
+    if missing:
+        ap.error("arquivo(s) não encontrado(s): " + ", ".join(missing))
+
+    import pandas as pd  # importado só depois de validar os argumentos (--help fica instantâneo)
+
+    results = {str(p): export_workbook(p, args.tables) for p in args.arquivos}
+
+    if args.out is None:
+        payload = {
+            arquivo: {name: json.loads(df.to_json(orient="records", force_ascii=False))
+                      for name, df in tables.items()}
+            for arquivo, tables in results.items()
+        }
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+        return 0
+
+    for name in args.tables:
+        frames = [t[name].assign(arquivo=arquivo) for arquivo, t in results.items() if name in t]
+        if not frames:
+            continue
+        df = pd.concat(frames, ignore_index=True)
+        dest = args.out / f"{name}.{args.format}"
+        _write(df[["arquivo", *[c for c in df.columns if c != "arquivo"]]], dest, args.format)
+        print(f"{dest} ({len(df)} linhas)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
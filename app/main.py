@@ -3,11 +3,15 @@ from pathlib import Path
 
 import streamlit as st
 
-from app.theme import configure_plotly_theme, inject_css
-from app.data.repository import DataRepository
-from app.data.sources import DEFAULT_CANDIDATES
+from app.theme import inject_css
+from app.tracing import begin_rerun, end_rerun, span
+from app.data.history import HISTORY_ENABLED, latest_repository
+from app.data.readonly import enable_copy_on_write
+from app.data.registry import get_repository
+from app.data.watcher import watch_workbook
+from app.data.sources import DEFAULT_CANDIDATES, default_workbook
 from app.domain.kpis import fmt_int_br
-from app.charts.common import nz
+from app import debug_panel
 from app.pages import visao_geral, cargos, secretarias, eventos
 
 
@@ -20,27 +24,40 @@ st.set_page_config(
     layout="wide",
     initial_sidebar_state="collapsed",
 )
-configure_plotly_theme()
-inject_css()
+inject_css()  # CSS lido uma vez por processo; o tema do Plotly é registrado na 1ª figura
+enable_copy_on_write()  # frames do repositório compartilhados sem cópias defensivas (pandas 2.x)
+
+# painel oculto de tempos por etapa (?debug=1); sem ele, os spans ficam desligados
+DEBUG = st.query_params.get("debug") == "1"
+DEBUG_HISTORY = 20  # reruns guardados por sessão
+trace = begin_rerun("main", enabled=DEBUG)
 
 # =========================
 # DATA LOAD
 # =========================
-DEFAULT_XLSX = next((p for p in DEFAULT_CANDIDATES if p.exists()), DEFAULT_CANDIDATES[0])
-if not DEFAULT_XLSX.exists():
-    st.error(
-        "Arquivo Excel não encontrado. Verifique estes caminhos:\n"
-        + "\n".join(str(p) for p in DEFAULT_CANDIDATES)
-    )
-    st.stop()
+# com CAPACITIA_HISTORY=1, lê o estado mais recente do histórico colunar (sem abrir o Excel)
+repo = latest_repository() if HISTORY_ENABLED else None
 
-repo = DataRepository(DEFAULT_XLSX)
-repo.load()
+if repo is None:
+    DEFAULT_XLSX = default_workbook()
+    if DEFAULT_XLSX is None:
+        st.error(
+            "Arquivo Excel não encontrado. Verifique estes caminhos:\n"
+            + "\n".join(str(p) for p in DEFAULT_CANDIDATES)
+        )
+        st.stop()
+
+    # compartilhado entre reruns e sessões; quando o arquivo muda, a nova versão é carregada
+    # em segundo plano e trocada atomicamente (app.data.watcher)
+    watch_workbook(DEFAULT_XLSX)
+    with span("repositorio"):
+        repo = get_repository(DEFAULT_XLSX)
 
 # =========================
 # KPIs (a partir da VISÃO ABERTA / TOTAL GERAL)
 # =========================
-tot_insc, tot_cert, taxa_cert, sec_atendidas = repo.get_kpis()
+with span("kpis"):
+    tot_insc, tot_cert, taxa_cert, sec_atendidas = repo.get_kpis()
 
 # =========================
 # HEADER
@@ -79,20 +96,47 @@ c4.markdown(
 st.markdown('<div class="sep"></div>', unsafe_allow_html=True)
 
 # =========================
-# TABS
+# TABS (só a aba ativa é renderizada a cada rerun)
 # =========================
-tab1, tab2, tab3, tab4 = st.tabs(
-    ["📊 Visão Geral", "👥 Cargos", "🏢 Secretarias", "📚 Eventos"]
-)
+TABS = {
+    "📊 Visão Geral": visao_geral.render,
+    "👥 Cargos": cargos.render,
+    "🏢 Secretarias": secretarias.render,
+    "📚 Eventos": eventos.render,
+}
+ABA_PADRAO = next(iter(TABS))
 
-with tab1:
-    visao_geral.render(repo)
+# Widgets das abas não renderizadas perdem o estado no fim do rerun; regravar as chaves
+# mantém a escolha do usuário ao voltar para a aba (como acontecia com st.tabs).
+for k in ("rg_sec", "t2_cargo_series", "sec_tbl", "ev_tbl"):
+    if k in st.session_state:
+        st.session_state[k] = st.session_state[k]
 
-with tab2:
-    cargos.render(repo)
+def _manter_aba():
+    # clicar de novo na aba ativa desmarca o segmented_control; mantém a aba anterior
+    if st.session_state.nav_tab is None:
+        st.session_state.nav_tab = st.session_state.get("_aba_ativa", ABA_PADRAO)
+
+if hasattr(st, "segmented_control"):  # Streamlit >= 1.40
+    aba = st.segmented_control(
+        "Navegação", list(TABS), default=ABA_PADRAO, key="nav_tab",
+        on_change=_manter_aba, label_visibility="collapsed",
+    )
+else:
+    aba = st.radio(
+        "Navegação", list(TABS), horizontal=True, key="nav_tab",
+        label_visibility="collapsed",
+    )
+aba = aba or ABA_PADRAO
+st.session_state["_aba_ativa"] = aba
+if trace is not None:
+    trace.label = aba
 
-with tab3:
-    secretarias.render(repo)
+TABS[aba](repo)
 
-with tab4:
-    eventos.render(repo)
+record = end_rerun(trace)
+if DEBUG and record is not None:
+    traces = st.session_state.setdefault("_debug_traces", [])
+    traces.append(record)
+    del traces[:-DEBUG_HISTORY]
+    debug_panel.render(traces)
@@ -1,28 +1,58 @@
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from app.domain.filters import drop_empty_labels
-from app.charts.common import style_fig, nz
+from app.charts.cache import cached_figure
+from app.charts.common import style_fig, nz, plotly_express
+from app.tracing import traced
 
 TOPN_DEFAULT = 10
 
-def render(repo, topn: int = TOPN_DEFAULT):
-    df_f = repo.secretarias_filtered()
-    df_f = drop_empty_labels(df_f, "SECRETARIA/ÓRGÃO")
+# ---- figuras (puras; cacheadas por versão dos dados + parâmetros) -----------
+
+def fig_comparativo(repo, topn: int):
+    px = plotly_express()
+    top_comp = repo.secretarias_totais().sort_values('Nº INSCRITOS', ascending=False).head(topn)
+    if top_comp.empty:
+        return None
+    fig_comp = px.bar(top_comp, x=['Nº INSCRITOS','Nº CERTIFICADOS'], y='SECRETARIA/ÓRGÃO',
+                      orientation='h', barmode='group', text_auto=True, title=None)
+    fig_comp.update_traces(textposition="outside", cliponaxis=False, textfont_size=12)
+    return style_fig(fig_comp)
+
+def fig_taxa(repo, topn: int):
+    px = plotly_express()
+    grp = repo.secretarias_totais()
+    top_taxa = grp[grp['Nº INSCRITOS'] > 0].sort_values('Taxa de Certificação (%)', ascending=False).head(topn)
+    top_taxa = nz(top_taxa, ['Taxa de Certificação (%)'])
+    if top_taxa.empty:
+        return None
+    fig_taxa = px.bar(top_taxa, x='Taxa de Certificação (%)', y='SECRETARIA/ÓRGÃO',
+                      orientation='h', title=f'Top {topn} por Taxa de Certificação',
+                      text='Taxa de Certificação (%)')
+    fig_taxa.update_traces(texttemplate='%{text:.0f}%', textposition='outside', cliponaxis=False, textfont_size=12)
+    fig_taxa.update_xaxes(ticksuffix="%")
+    return style_fig(fig_taxa)
+
+def fig_treemap(repo, topn: int):
+    px = plotly_express()
+    grp_tree = repo.secretarias_totais().sort_values('Nº INSCRITOS', ascending=False).head(max(topn*2, 20))
+    grp_tree = nz(grp_tree, ['Nº INSCRITOS'])
+    if grp_tree.empty:
+        return None
+    treemap = px.treemap(grp_tree, path=['SECRETARIA/ÓRGÃO'], values='Nº INSCRITOS',
+                         color='Taxa de Certificação (%)', custom_data=['Taxa de Certificação (%)'],
+                         title='Treemap — maiores contribuições')
+    treemap.update_traces(texttemplate="<b>%{label}</b><br>%{customdata[0]:.0f}%", textposition="middle center")
+    treemap.update_layout(uniformtext_minsize=12, uniformtext_mode='show')
+    return style_fig(treemap, height=520)
+
+# ---- página -----------------------------------------------------------------
 
-    grp = (
-        df_f.groupby('SECRETARIA/ÓRGÃO')[['Nº INSCRITOS','Nº CERTIFICADOS']]
-            .sum()
-            .reset_index()
-    )
-    grp = nz(grp, ['Nº INSCRITOS','Nº CERTIFICADOS'])
-    grp['Taxa de Certificação (%)'] = (
-        grp['Nº CERTIFICADOS'] / grp['Nº INSCRITOS']
-    ).replace([pd.NA, float('inf')], 0).fillna(0) * 100
+@traced("render:secretarias")
+def render(repo, topn: int = TOPN_DEFAULT):
+    grp = repo.secretarias_totais()
 
     # Tabela opcional
-    show_tbl = st.toggle("Mostrar tabela de secretarias", value=False,
+    show_tbl = st.toggle("Mostrar tabela de secretarias", value=False, key="sec_tbl",
                          help="Ative para visualizar o consolidado; por padrão fica oculto.")
     if show_tbl:
         st.markdown('<div class="panel"><h3>Consolidado por Secretaria/Órgão</h3>', unsafe_allow_html=True)
@@ -33,38 +63,23 @@ def render(repo, topn: int = TOPN_DEFAULT):
     cA, cB = st.columns(2)
 
     with cA:
-        top_comp = grp.sort_values('Nº INSCRITOS', ascending=False).head(topn)
-        if top_comp.empty:
+        fig = cached_figure("sec_comp", repo, fig_comparativo, topn=topn)
+        if fig is None:
             st.info("Sem dados para o comparativo.")
         else:
-            fig_comp = px.bar(top_comp, x=['Nº INSCRITOS','Nº CERTIFICADOS'], y='SECRETARIA/ÓRGÃO',
-                              orientation='h', barmode='group', text_auto=True, title=None)
-            fig_comp.update_traces(textposition="outside", cliponaxis=False, textfont_size=12)
-            st.plotly_chart(style_fig(fig_comp), use_container_width=True, key=f"sec_comp_{topn}")
+            st.plotly_chart(fig, use_container_width=True, key=f"sec_comp_{topn}")
 
     with cB:
-        top_taxa = grp[grp['Nº INSCRITOS'] > 0].sort_values('Taxa de Certificação (%)', ascending=False).head(topn)
-        top_taxa = nz(top_taxa, ['Taxa de Certificação (%)'])
-        if top_taxa.empty:
+        fig = cached_figure("sec_taxa", repo, fig_taxa, topn=topn)
+        if fig is None:
             st.info("Sem dados para taxa.")
         else:
-            fig_taxa = px.bar(top_taxa, x='Taxa de Certificação (%)', y='SECRETARIA/ÓRGÃO',
-                              orientation='h', title=f'Top {topn} por Taxa de Certificação',
-                              text='Taxa de Certificação (%)')
-            fig_taxa.update_traces(texttemplate='%{text:.0f}%', textposition='outside', cliponaxis=False, textfont_size=12)
-            fig_taxa.update_xaxes(ticksuffix="%")
-            st.plotly_chart(style_fig(fig_taxa), use_container_width=True, key=f"sec_taxa_top_{topn}")
+            st.plotly_chart(fig, use_container_width=True, key=f"sec_taxa_top_{topn}")
 
     st.markdown('<div class="panel"><h3>Participação no total de Inscritos</h3>', unsafe_allow_html=True)
-    grp_tree = grp.sort_values('Nº INSCRITOS', ascending=False).head(max(topn*2, 20))
-    grp_tree = nz(grp_tree, ['Nº INSCRITOS'])
-    if grp_tree.empty:
+    fig = cached_figure("sec_tree", repo, fig_treemap, topn=topn)
+    if fig is None:
         st.info("Sem dados para o treemap.")
     else:
-        treemap = px.treemap(grp_tree, path=['SECRETARIA/ÓRGÃO'], values='Nº INSCRITOS',
-                             color='Taxa de Certificação (%)', custom_data=['Taxa de Certificação (%)'],
-                             title='Treemap — maiores contribuições')
-        treemap.update_traces(texttemplate="<b>%{label}</b><br>%{customdata[0]:.0f}%", textposition="middle center")
-        treemap.update_layout(uniformtext_minsize=12, uniformtext_mode='show')
-        st.plotly_chart(style_fig(treemap, height=520), use_container_width=True, key="sec_tree")
+        st.plotly_chart(fig, use_container_width=True, key="sec_tree")
     st.markdown('</div>', unsafe_allow_html=True)
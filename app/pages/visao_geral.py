@@ -1,72 +1,101 @@
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from app.charts.common import style_fig, nz
-from app.domain.filters import drop_empty_labels
+from app.charts.cache import cached_figure
+from app.charts.common import style_fig, nz, plotly_express
+from app.tracing import traced
 
 
 TOPN_DEFAULT = 10
+MODOS_SEC = ["Inscritos", "Certificados", "Taxa de Permanência", "Comparativo"]
 
-def render(repo, topn: int = TOPN_DEFAULT):
-    df_f = repo.secretarias_filtered()
-    df_f = drop_empty_labels(df_f, "SECRETARIA/ÓRGÃO")
+# ---- figuras (puras; cacheadas por versão dos dados + parâmetros) -----------
+
+def fig_secretarias(repo, modo: str, topn: int):
+    """Ranking de secretarias no modo escolhido; None quando não há dados."""
+    px = plotly_express()
+    grp_sec = (
+        repo.secretarias_totais()
+            .set_index("SECRETARIA/ÓRGÃO")
+            .rename(columns={"Taxa de Certificação (%)": "Taxa de Permanência (%)"})
+            .sort_values("Nº INSCRITOS", ascending=False)
+    )
+
+    if modo == "Inscritos":
+        d = nz(grp_sec, ["Nº INSCRITOS"]).head(topn).sort_values("Nº INSCRITOS")
+        if d.empty:
+            return None
+        fig = px.bar(d, x="Nº INSCRITOS", y=d.index, orientation="h", title="Top por Inscritos")
+
+    elif modo == "Certificados":
+        d = nz(grp_sec, ["Nº CERTIFICADOS"]).sort_values("Nº CERTIFICADOS", ascending=False) \
+                                           .head(topn).sort_values("Nº CERTIFICADOS")
+        if d.empty:
+            return None
+        fig = px.bar(d, x="Nº CERTIFICADOS", y=d.index, orientation="h", title="Top por Certificados")
+
+    elif modo == "Taxa de Permanência":
+        base = grp_sec[grp_sec["Nº INSCRITOS"] > 0]
+        d = nz(base, ["Taxa de Permanência (%)"]).sort_values("Taxa de Permanência (%)", ascending=False) \
+                                                .head(topn).sort_values("Taxa de Permanência (%)")
+        if d.empty:
+            return None
+        fig = px.bar(d, x="Taxa de Permanência (%)", y=d.index, orientation="h", title="Top por Permanência")
+
+    else:  # Comparativo
+        d = nz(grp_sec, ["Nº INSCRITOS", "Nº CERTIFICADOS"]).head(topn)
+        if d.empty:
+            return None
+        fig = px.bar(d, x=["Nº INSCRITOS", "Nº CERTIFICADOS"], y=d.index, orientation="h", barmode="group")
+
+    return style_fig(fig)
+
+def _fig_secretarias_vazia(modo: str):
+    px = plotly_express()
+    if modo == "Comparativo":
+        fig = px.bar(pd.DataFrame(columns=["Nº INSCRITOS","Nº CERTIFICADOS"]), x=["Nº INSCRITOS","Nº CERTIFICADOS"], y=[])
+    else:
+        col = {"Inscritos": "Nº INSCRITOS", "Certificados": "Nº CERTIFICADOS"}.get(modo, "Taxa de Permanência (%)")
+        fig = px.bar(pd.DataFrame({col: []}), x=col, y=[])
+    return style_fig(fig)
+
+def fig_cargos_top(repo, topn: int):
+    px = plotly_express()
+    df_rank = repo.cargos_rank()
+    d = nz(df_rank, ["Inscritos"]).head(topn).sort_values("Inscritos")
+    if d.empty:
+        return None
+    fig2 = px.bar(d, x="Inscritos", y=d.index, orientation="h", title=f"Top {topn} Cargos por Inscritos")
+    return style_fig(fig2)
+
+def fig_funil(repo):
+    px = plotly_express()
+    tot_insc, tot_cert, *_ = repo.get_kpis()
+    funil_df = pd.DataFrame({"Etapa": ["Inscritos", "Certificados"], "Total": [tot_insc, tot_cert]})
+    funil_df = nz(funil_df, ["Total"])
+    if funil_df.empty:
+        return None
+    fig_funil = px.funnel(funil_df, x="Total", y="Etapa", title=None)
+    return style_fig(fig_funil, height=360)
 
+# ---- página -----------------------------------------------------------------
+
+@traced("render:visao_geral")
+def render(repo, topn: int = TOPN_DEFAULT):
     colA, colB = st.columns(2)
 
     with colA:
         st.markdown('<div class="panel"><h3>Desempenho por Secretaria</h3>', unsafe_allow_html=True)
-        grp_sec = (
-            df_f.groupby("SECRETARIA/ÓRGÃO")[["Nº INSCRITOS", "Nº CERTIFICADOS"]]
-                .sum()
-                .sort_values("Nº INSCRITOS", ascending=False)
-        )
-        grp_sec["Taxa de Permanência (%)"] = (
-            grp_sec["Nº CERTIFICADOS"] / grp_sec["Nº INSCRITOS"]
-        ).replace([pd.NA, float("inf")], 0).fillna(0) * 100
-
         modo = st.radio(
             "Visualizar",
-            ["Inscritos", "Certificados", "Taxa de Permanência", "Comparativo"],
+            MODOS_SEC,
             horizontal=True, key="rg_sec",
         )
-
-        if modo == "Inscritos":
-            d = nz(grp_sec, ["Nº INSCRITOS"]).head(topn).sort_values("Nº INSCRITOS")
-            if d.empty:
-                st.info("Sem dados para plotar.")
-                fig = px.bar(pd.DataFrame({"Nº INSCRITOS": []}), x="Nº INSCRITOS", y=[])
-            else:
-                fig = px.bar(d, x="Nº INSCRITOS", y=d.index, orientation="h", title="Top por Inscritos")
-
-        elif modo == "Certificados":
-            d = nz(grp_sec, ["Nº CERTIFICADOS"]).sort_values("Nº CERTIFICADOS", ascending=False) \
-                                               .head(topn).sort_values("Nº CERTIFICADOS")
-            if d.empty:
-                st.info("Sem dados para plotar.")
-                fig = px.bar(pd.DataFrame({"Nº CERTIFICADOS": []}), x="Nº CERTIFICADOS", y=[])
-            else:
-                fig = px.bar(d, x="Nº CERTIFICADOS", y=d.index, orientation="h", title="Top por Certificados")
-
-        elif modo == "Taxa de Permanência":
-            base = grp_sec[grp_sec["Nº INSCRITOS"] > 0]
-            d = nz(base, ["Taxa de Permanência (%)"]).sort_values("Taxa de Permanência (%)", ascending=False) \
-                                                    .head(topn).sort_values("Taxa de Permanência (%)")
-            if d.empty:
-                st.info("Sem dados para plotar.")
-                fig = px.bar(pd.DataFrame({"Taxa de Permanência (%)": []}), x="Taxa de Permanência (%)", y=[])
-            else:
-                fig = px.bar(d, x="Taxa de Permanência (%)", y=d.index, orientation="h", title="Top por Permanência")
-
-        else:  # Comparativo
-            d = nz(grp_sec, ["Nº INSCRITOS", "Nº CERTIFICADOS"]).head(topn)
-            if d.empty:
-                st.info("Sem dados para plotar.")
-                fig = px.bar(pd.DataFrame(columns=["Nº INSCRITOS","Nº CERTIFICADOS"]), x=["Nº INSCRITOS","Nº CERTIFICADOS"], y=[])
-            else:
-                fig = px.bar(d, x=["Nº INSCRITOS", "Nº CERTIFICADOS"], y=d.index, orientation="h", barmode="group")
-
-        st.plotly_chart(style_fig(fig), use_container_width=True, key=f"vg_sec_lbl_{modo}_{topn}")
+        fig = cached_figure("vg_sec", repo, fig_secretarias, modo=modo, topn=topn)
+        if fig is None:
+            st.info("Sem dados para plotar.")
+            fig = _fig_secretarias_vazia(modo)
+        st.plotly_chart(fig, use_container_width=True, key=f"vg_sec_lbl_{modo}_{topn}")
         st.markdown('</div>', unsafe_allow_html=True)
 
     with colB:
@@ -75,25 +104,22 @@ def render(repo, topn: int = TOPN_DEFAULT):
         if df_rank is None or df_rank.empty:
             st.info("Aba 'CARGOS' vazia ou inválida.")
         else:
-            d = nz(df_rank, ["Inscritos"]).head(topn).sort_values("Inscritos")
-            if d.empty:
+            fig2 = cached_figure("vg_cargo_top", repo, fig_cargos_top, topn=topn)
+            if fig2 is None:
                 st.info("Sem dados para o ranking.")
             else:
-                fig2 = px.bar(d, x="Inscritos", y=d.index, orientation="h", title=f"Top {topn} Cargos por Inscritos")
-                st.plotly_chart(style_fig(fig2), use_container_width=True, key=f"vg_cargo_top_lbl_{topn}")
+                st.plotly_chart(fig2, use_container_width=True, key=f"vg_cargo_top_lbl_{topn}")
         st.markdown('</div>', unsafe_allow_html=True)
 
     # FUNIL
     tot_insc, tot_cert, *_ = repo.get_kpis()
     st.markdown('<div class="panel"><h3>Funil de Conversão</h3>', unsafe_allow_html=True)
     if tot_insc > 0:
-        funil_df = pd.DataFrame({"Etapa": ["Inscritos", "Certificados"], "Total": [tot_insc, tot_cert]})
-        funil_df = nz(funil_df, ["Total"])
-        if funil_df.empty:
+        fig_f = cached_figure("vg_funnel", repo, fig_funil)
+        if fig_f is None:
             st.info("Sem dados para montar o funil.")
         else:
-            fig_funil = px.funnel(funil_df, x="Total", y="Etapa", title=None)
-            st.plotly_chart(style_fig(fig_funil, height=360), use_container_width=True, key="vg_funnel")
+            st.plotly_chart(fig_f, use_container_width=True, key="vg_funnel")
     else:
         st.info("Sem dados para montar o funil.")
     st.markdown('</div>', unsafe_allow_html=True)
@@ -0,0 +1,382 @@
+"""Dashboard estático pré-renderizado, uma vez por versão dos dados, para quem só visualiza.
+
+Gera as quatro visões (Visão Geral, Cargos, Secretarias, Eventos) como páginas HTML com as
+figuras já calculadas em JSON (as mesmas funções ``fig_*`` das páginas, via cache de figuras),
+incluindo todos os modos de ``rg_sec`` e a série de cada cargo. O plotly.min.js e o CSS ficam
+em ``assets/`` e são compartilhados entre as versões. O resultado é servido por qualquer
+servidor de arquivos estáticos, sem sessão Streamlit nem Python por visitante:
+
+    <out>/index.html                    redireciona para a versão mais recente
+    <out>/assets/                       plotly-<versão>.min.js, theme.css, static.css, static.js
+    <out>/<versão dos dados>/           index.html, cargos.html, secretarias.html, eventos.html,
+                                        figs/*.json e manifest.json (gravado por último)
+
+Uma versão já exportada não é refeita (a não ser com ``--force``).
+
+Uso:
+    python -m app.static_export --out site/                           # planilha padrão
+    python -m app.static_export dados_main/relatorio_capacitia.xlsx --out site/ --watch
+    python -m http.server -d site/ 8080
+"""
+import argparse
+import html
+import json
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from app.tracing import span, traced
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+MANIFEST = "manifest.json"
+KEEP_DEFAULT = 3  # versões mantidas em <out>; as mais antigas são removidas
+
+# página -> (arquivo, título na navegação); mesma ordem das abas de main.py
+PAGES = {
+    "visao_geral": ("index.html", "📊 Visão Geral"),
+    "cargos": ("cargos.html", "👥 Cargos"),
+    "secretarias": ("secretarias.html", "🏢 Secretarias"),
+    "eventos": ("eventos.html", "📚 Eventos"),
+}
+
+
+def _plotly_js_name() -> str:
+    import plotly
+
+    return f"plotly-{plotly.__version__}.min.js"
+
+
+def write_assets(out: Path) -> None:
+    """Arquivos compartilhados por todas as versões; o plotly.min.js só é gravado se faltar."""
+    assets = out / "assets"
+    assets.mkdir(parents=True, exist_ok=True)
+    plotly_js = assets / _plotly_js_name()
+    if not plotly_js.exists():
+        from plotly.offline import get_plotlyjs
+
+        _write_atomic(plotly_js, get_plotlyjs())
+    for name in ("theme.css", "static.css", "static.js"):
+        shutil.copyfile(ASSETS_DIR / name, assets / name)
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class _Bundle:
+    """Figuras de uma versão: cada uma vira ``figs/<nome>.json`` (None quando não há dados)."""
+
+    def __init__(self, repo, root: Path):
+        self.repo = repo
+        self.figs = root / "figs"
+        self.figs.mkdir(parents=True)
+        self.count = 0
+
+    def figure(self, name: str, chart_id: str, build, **params) -> str | None:
+        from app.charts.cache import cached_figure
+
+        fig = cached_figure(chart_id, self.repo, build, **params)
+        if fig is None:
+            return None
+        (self.figs / f"{name}.json").write_text(fig.to_json(), encoding="utf-8")
+        self.count += 1
+        return f"figs/{name}.json"
+
+
+# ---- blocos HTML ---------------------------------------------------------------
+
+def _esc(text) -> str:
+    return html.escape(str(text))
+
+def _fig(src: str | None, vazio: str) -> str:
+    if src is None:
+        return f'<div class="info">{_esc(vazio)}</div>'
+    return f'<div class="fig" data-src="{src}"></div>'
+
+def _alvo(alvo: str, vazio: str) -> str:
+    """Área desenhada pelos controles de variantes (static.js)."""
+    return f'<div class="info" id="{alvo}-vazio" hidden>{_esc(vazio)}</div><div class="fig" id="{alvo}"></div>'
+
+def _botoes(alvo: str, variantes: list[tuple[str, str | None]]) -> str:
+    botoes = "".join(f'<button type="button" data-src="{src or ""}">{_esc(rotulo)}</button>'
+                     for rotulo, src in variantes)
+    return f'<div class="variantes" data-alvo="{alvo}">{botoes}</div>'
+
+def _select(alvo: str, rotulo: str, variantes: list[tuple[str, str | None]]) -> str:
+    opcoes = "".join(f'<option value="{src or ""}">{_esc(nome)}</option>' for nome, src in variantes)
+    return f'<label>{_esc(rotulo)}<br><select data-alvo="{alvo}">{opcoes}</select></label>'
+
+def _panel(titulo: str, corpo: str, tag: str = "h3") -> str:
+    return f'<div class="panel"><{tag}>{_esc(titulo)}</{tag}>{corpo}</div>'
+
+def _colunas(*blocos: str, cols: str = "1fr 1fr") -> str:
+    return f'<div class="colunas" style="--cols:{cols}">' + "".join(f"<div>{b}</div>" for b in blocos) + "</div>"
+
+def _tabela(titulo: str, df) -> str:
+    tabela = df.to_html(index=False, classes="dados", border=0, na_rep="", float_format=lambda v: f"{v:.2f}")
+    return (f'<details class="tabela"><summary>{_esc(titulo)}</summary>'
+            f'<div class="panel"><div class="tabela-rolagem">{tabela}</div></div></details>')
+
+
+# ---- páginas (mesmos gráficos e avisos dos render() de app.pages) --------------
+
+def _visao_geral(b: _Bundle, topn: int) -> str:
+    from app.pages import visao_geral as vg
+
+    modos = [(modo, b.figure(f"vg_sec-{i}", "vg_sec", vg.fig_secretarias, modo=modo, topn=topn))
+             for i, modo in enumerate(vg.MODOS_SEC)]
+    sec = _botoes("vg_sec", modos) + _alvo("vg_sec", "Sem dados para plotar.")
+
+    df_rank = b.repo.cargos_rank()
+    if df_rank is None or df_rank.empty:
+        cargo = _fig(None, "Aba 'CARGOS' vazia ou inválida.")
+    else:
+        cargo = _fig(b.figure("vg_cargo_top", "vg_cargo_top", vg.fig_cargos_top, topn=topn),
+                     "Sem dados para o ranking.")
+
+    tot_insc, *_ = b.repo.get_kpis()
+    funil = b.figure("vg_funnel", "vg_funnel", vg.fig_funil) if tot_insc > 0 else None
+    return (_colunas(_panel("Desempenho por Secretaria", sec),
+                     _panel("Desempenho por Cargo (Inscritos)", cargo))
+            + _panel("Funil de Conversão", _fig(funil, "Sem dados para montar o funil.")))
+
+
+def _cargos(b: _Bundle, topn: int) -> str:
+    from app.domain.events import TIPOS
+    from app.pages import cargos
+
+    df_rank = b.repo.cargos_rank()
+    sem_rank = df_rank is None or df_rank.empty
+    rank = None if sem_rank else b.figure("t2_rank", "t2_rank", cargos.fig_rank, topn=topn)
+    pie = None if sem_rank else b.figure("t2_pie", "t2_pie", cargos.fig_pie, topn=topn)
+    partes = [_panel("Visão de Cargos", _colunas(_fig(rank, "Sem dados para o ranking."),
+                                                  _fig(pie, "Sem dados para o donut."), cols="1.65fr 1fr"),
+                     tag="h4")]
+
+    if b.repo.cargos_long().empty:
+        stacked = _fig(None, "Sem dados para o stacked.")
+    elif not any(c in b.repo.cargos_por_tipo().columns for c in TIPOS):
+        stacked = _fig(None, "Tipos não encontrados em CARGOS.")
+    else:
+        stacked = _fig(b.figure("t2_stacked", "t2_stacked", cargos.fig_stacked, topn=topn),
+                       "Sem dados para o stacked.")
+    partes.append(_panel("Inscritos por Cargo e Tipo de Evento", stacked))
+
+    cargo_cols = b.repo.cargo_cols
+    if cargo_cols:
+        series = [(cargo, b.figure(f"t2_series-{i}", "t2_series", cargos.fig_series, cargo=cargo))
+                  for i, cargo in enumerate(cargo_cols)]
+        serie = _select("t2_series", "Escolha um cargo", series) + _alvo("t2_series", "Sem dados para a série.")
+    else:
+        serie = _fig(None, "Nenhuma coluna de cargo encontrada.")
+    partes.append(_panel("Evolução por Evento", serie))
+    return "".join(partes)
+
+
+def _secretarias(b: _Bundle, topn: int) -> str:
+    from app.pages import secretarias as sec
+
+    grp = b.repo.secretarias_totais()
+    comp = b.figure("sec_comp", "sec_comp", sec.fig_comparativo, topn=topn)
+    taxa = b.figure("sec_taxa", "sec_taxa", sec.fig_taxa, topn=topn)
+    tree = b.figure("sec_tree", "sec_tree", sec.fig_treemap, topn=topn)
+    return (_tabela("Mostrar tabela de secretarias", grp.round(2))
+            + _panel("Inscritos X Certificados", _colunas(_fig(comp, "Sem dados para o comparativo."),
+                                                          _fig(taxa, "Sem dados para taxa.")))
+            + _panel("Participação no total de Inscritos", _fig(tree, "Sem dados para o treemap.")))
+
+
+_TREEMAP_LEGENDA = """<div class="panel">
+<h3>O que é essa porcentagem?</h3>
+<p>É a <b>participação no total de inscritos</b> considerando todos os filtros atuais.</p>
+<ul>
+    <li><b>Tipo</b> (Curso de IA, Masterclass, Workshop): % do total para cada tipo.</li>
+    <li><b>Evento</b> (ex.: <i>11° Curso</i>): % daquele evento no total.</li>
+</ul>
+<p>Passe o mouse para ver <b>inscritos absolutos</b> e a mesma participação (%).</p>
+</div>"""
+
+def _eventos(b: _Bundle, topn: int) -> str:
+    from app.pages import eventos
+
+    visao = b.repo.visao()
+    if visao is None or visao.empty:
+        return _fig(None, "Aba 'VISÃO ABERTA' vazia ou inválida.")
+
+    ev = b.repo.eventos_metricas()
+    cols_evento = [c for c in ["Nº", "EVENTO", "Tipo", "Nº INSCRITOS", "Nº CERTIFICADOS", "Evasão (Nº)",
+                               "Taxa de Certificação (%)"] if c in ev.columns]
+    partes = [_tabela("Mostrar tabela de eventos", ev[cols_evento]),
+              _colunas(_fig(b.figure("ev_pie", "ev_pie", eventos.fig_pie), "Sem dados para o donut."),
+                       _fig(b.figure("ev_box", "ev_box", eventos.fig_box), "Sem dados para o boxplot."),
+                       cols="1.2fr 1")]
+    if not b.repo.eventos_por_tipo().empty:
+        bar = b.figure("ev_bar_tipo", "ev_bar_tipo", eventos.fig_bar_tipo)
+        partes.append(_panel("Totais por tipo (Inscritos x Certificados)",
+                             _fig(bar, "Sem dados para barras por tipo.")))
+    if not ev.empty:
+        tree = b.figure("ev_treemap", "ev_treemap", eventos.fig_treemap, topn=topn)
+        corpo = (_fig(None, "Sem dados para o treemap.") if tree is None
+                 else _colunas(_fig(tree, ""), _TREEMAP_LEGENDA, cols="4fr 1.7fr"))
+        partes.append(_panel("Treemap — participação por evento", corpo))
+    return "".join(partes)
+
+
+ATIVO = ' class="ativo"'
+_BUILDERS = {"visao_geral": _visao_geral, "cargos": _cargos, "secretarias": _secretarias, "eventos": _eventos}
+
+
+def _kpis(repo) -> str:
+    """Cabeçalho de KPIs, ou o aviso quando a planilha não tem as abas de que eles dependem."""
+    from app.domain.kpis import fmt_int_br
+
+    try:
+        tot_insc, tot_cert, taxa_cert, sec_atendidas = repo.get_kpis()
+    except (KeyError, ValueError) as exc:  # aba ausente nesta planilha (layouts antigos)
+        print(f"aviso: {repo.excel_path}: KPIs indisponíveis ({exc})", file=sys.stderr)
+        return _fig(None, f"KPIs indisponíveis nesta planilha ({exc}).")
+    kpis = [("Total de Inscritos", fmt_int_br(tot_insc)), ("Total de Certificados", fmt_int_br(tot_cert)),
+            ("Taxa de Certificação", f"{taxa_cert:.2f}%"), ("Secretarias atendidas", sec_atendidas)]
+    return ('<div class="kpis">'
+            + "".join(f'<div class="kpi"><h4>{h}</h4><div class="val">{v}</div></div>' for h, v in kpis)
+            + "</div>")
+
+
+def _page(page: str, corpo: str, kpis: str, repo, gerado: str, plotly_js: str) -> str:
+    nav = "".join(f'<a href="{arquivo}"{ATIVO if p == page else ""}>{_esc(titulo)}</a>'
+                  for p, (arquivo, titulo) in PAGES.items())
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Dashboard CapacitIA — {_esc(PAGES[page][1])}</title>
+<link rel="stylesheet" href="../assets/theme.css">
+<link rel="stylesheet" href="../assets/static.css">
+<script src="../assets/{plotly_js}" defer></script>
+<script src="../assets/static.js" defer></script>
+</head>
+<body>
+<main class="pagina">
+<div class="hero">
+  <div style="font-size:2.0rem;font-weight:800;letter-spacing:.3px;">🚀 Dashboard CapacitIA</div>
+  <div style="color:#a6accd;">Atualizado em {gerado}</div>
+</div>
+{kpis}
+<div class="sep"></div>
+<nav class="abas">{nav}</nav>
+{corpo}
+<footer>Versão dos dados {_esc(repo.version)} · {_esc(Path(repo.excel_path).name)}</footer>
+</main>
+</body>
+</html>
+"""
+
+
+@traced("static_export")
+def export_site(repo, out: Path, topn: int = 10, force: bool = False, keep: int = KEEP_DEFAULT) -> Path | None:
+    """Exporta a versão ``repo.version`` em ``<out>/<versão>``; None se ela já estava exportada.
+
+    A versão é montada num diretório temporário e renomeada no fim, e só então o
+    ``<out>/index.html`` passa a apontar para ela: quem estiver navegando nunca vê uma
+    versão pela metade.
+    """
+    version = repo.version or datetime.now().strftime("%Y%m%d%H%M%S")
+    out = Path(out)
+    target = out / version
+    if (target / MANIFEST).exists() and not force:
+        return None
+
+    write_assets(out)
+    tmp = out / f".{version}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    try:
+        bundle = _Bundle(repo, tmp)
+        gerado = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+        plotly_js = _plotly_js_name()
+        kpis = _kpis(repo)
+        for page, (arquivo, _) in PAGES.items():
+            with span(f"static:{page}"):
+                try:
+                    corpo = _BUILDERS[page](bundle, topn)
+                except (KeyError, ValueError) as exc:  # aba ausente nesta planilha (layouts antigos)
+                    print(f"aviso: {repo.excel_path}: página '{page}' indisponível ({exc})", file=sys.stderr)
+                    corpo = _fig(None, f"Página indisponível nesta planilha ({exc}).")
+                (tmp / arquivo).write_text(_page(page, corpo, kpis, repo, gerado, plotly_js), encoding="utf-8")
+        (tmp / MANIFEST).write_text(json.dumps({
+            "versao": version, "planilha": str(repo.excel_path), "gerado_em": gerado,
+            "paginas": [arquivo for arquivo, _ in PAGES.values()], "figuras": bundle.count,
+        }, ensure_ascii=False, indent=2), encoding="utf-8")
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    _write_atomic(out / "index.html",
+                  f'<!DOCTYPE html><meta charset="utf-8"><meta http-equiv="refresh" content="0; url={version}/">'
+                  f'<a href="{version}/">Dashboard CapacitIA</a>\n')
+    _prune(out, keep, current=version)
+    return target
+
+
+def _prune(out: Path, keep: int, current: str) -> None:
+    """Remove as versões exportadas mais antigas, mantendo as ``keep`` mais recentes."""
+    versoes = sorted((p for p in out.iterdir() if (p / MANIFEST).is_file() and p.name != current),
+                     key=lambda p: (p / MANIFEST).stat().st_mtime, reverse=True)
+    for old in versoes[max(keep - 1, 0):]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.static_export", description=__doc__.split("\n\n")[0])
+    ap.add_argument("arquivo", nargs="?", type=Path, help="planilha .xlsx (padrão: a mesma do dashboard)")
+    ap.add_argument("--out", type=Path, required=True, help="diretório servido como site estático")
+    ap.add_argument("--topn", type=int, default=10, help="tamanho dos rankings (padrão do dashboard: 10)")
+    ap.add_argument("--keep", type=int, default=KEEP_DEFAULT, help="versões mantidas em --out")
+    ap.add_argument("--force", action="store_true", help="refaz a versão atual mesmo se já exportada")
+    ap.add_argument("--watch", action="store_true", help="continua rodando e exporta cada nova versão dos dados")
+    ap.add_argument("--interval", type=float, default=5.0, help="segundos entre verificações com --watch")
+    args = ap.parse_args(argv)
+
+    if args.arquivo is not None and not args.arquivo.exists():
+        ap.error(f"arquivo não encontrado: {args.arquivo}")
+    from app.api import repository_source
+
+    try:
+        source = repository_source(args.arquivo)
+    except FileNotFoundError as exc:
+        ap.error(str(exc))
+
+    force, failed = args.force, None
+    while True:
+        repo = source()
+        t = time.perf_counter()
+        try:
+            target = None if failed is not None and repo.version == failed else export_site(
+                repo, args.out, topn=args.topn, force=force, keep=args.keep)
+        except (KeyError, ValueError) as exc:  # planilha ilegível (KPIs e páginas ausentes já viram avisos)
+            print(f"erro: {repo.excel_path}: {exc}", file=sys.stderr)
+            if not args.watch:
+                return 1
+            failed, target = repo.version, None  # só tenta de novo quando a versão mudar
+        if target is not None:
+            print(f"{target}: exportado em {time.perf_counter() - t:.1f} s", file=sys.stderr)
+        elif not args.watch:
+            print(f"{args.out / repo.version}: versão já exportada (use --force para refazer)", file=sys.stderr)
+        if not args.watch:
+            return 0
+        force = False
+        try:
+            time.sleep(args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,27 @@
-import plotly.io as pio
-import streamlit as st
+import threading
+from functools import lru_cache
 from pathlib import Path
 
+import streamlit as st
+
 ASSETS_DIR = Path(__file__).parent / "assets"
 CSS_FILE = ASSETS_DIR / "theme.css"
 
+_THEME_LOCK = threading.Lock()
+_THEME_READY = False
+
 def configure_plotly_theme():
+    """Registra o template "capacit_dark" como padrão do Plotly (uma vez por processo)."""
+    global _THEME_READY
+    with _THEME_LOCK:
+        if _THEME_READY:
+            return
+        _register_template()
+        _THEME_READY = True
+
+def _register_template():
+    import plotly.io as pio
+
     pio.templates["capacit_dark"] = pio.templates["plotly_dark"]
     tpl = pio.templates["capacit_dark"]
     tpl.layout.font.family = "Inter, Segoe UI, Roboto, Arial"
@@ -19,9 +35,16 @@ def configure_plotly_theme():
     )
     pio.templates.default = "capacit_dark"
 
+@lru_cache(maxsize=1)
+def _css_markup() -> str | None:
+    # lido uma vez por processo; cada rerun só reenvia o <style> já montado
+    if not CSS_FILE.exists():
+        return None
+    return f"<style>{CSS_FILE.read_text(encoding='utf-8')}</style>"
+
 def inject_css():
-    if CSS_FILE.exists():
-        css = CSS_FILE.read_text(encoding="utf-8")
-        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+    css = _css_markup()
+    if css is not None:
+        st.markdown(css, unsafe_allow_html=True)
     else:
         st.warning("Arquivo CSS não encontrado em assets/theme.css")
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""Spans de tempo por rerun (leitura, limpeza, agregados, páginas e gráficos).
+
+Cada rerun do main.py abre um ``Trace`` (``begin_rerun``) e o fecha no fim (``end_rerun``).
+Enquanto ele estiver ativo, ``span(nome)`` / ``@traced()`` registram duração, variação do RSS
+e profundidade de cada etapa, e ``count(nome)`` soma acertos/faltas de cache. O trace ativo
+fica num ContextVar (um por thread do script), então sessões simultâneas não se misturam.
+
+A variação de memória (``rss_processo_kb``) é do RSS do processo inteiro: com outras sessões
+rodando ao mesmo tempo ela inclui o que elas alocaram, e serve só como indício.
+
+Desligado — o padrão —, ``span`` devolve um contexto vazio e ``@traced`` chama a função
+direto: o custo é uma leitura de ContextVar por chamada.
+
+Ligado por sessão com ``?debug=1`` (painel no main.py) ou para todo o processo com
+``CAPACITIA_TRACE=1``; neste caso cada rerun vira uma linha JSON no logger
+``capacitia.trace`` e, com ``CAPACITIA_TRACE_FILE``, também no arquivo indicado.
+"""
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from datetime import datetime
+
+TRACE_ENABLED = os.environ.get("CAPACITIA_TRACE", "0") == "1"
+TRACE_FILE = os.environ.get("CAPACITIA_TRACE_FILE")
+
+log = logging.getLogger("capacitia.trace")
+
+_CURRENT: ContextVar["Trace | None"] = ContextVar("capacitia_trace", default=None)
+_NOOP = nullcontext()
+_FILE_LOCK = threading.Lock()
+
+
+def _rss_kb() -> int | None:
+    """RSS do processo (todas as threads/sessões), em kB."""
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Trace:
+    """Spans e contadores de um rerun."""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.started = datetime.now()
+        self.spans: list[dict] = []
+        self.counters: dict[str, int] = {}
+        self.total_ms: float | None = None
+        self._depth = 0
+        self._t0 = time.perf_counter()
+        self._rss0 = _rss_kb()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        rec = {"nome": name, "profundidade": self._depth, **attrs}
+        self.spans.append(rec)  # na ordem de abertura (pais antes dos filhos)
+        self._depth += 1
+        rss = _rss_kb()
+        t = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["ms"] = (time.perf_counter() - t) * 1000
+            after = _rss_kb()
+            if rss is not None and after is not None:
+                rec["rss_processo_kb"] = after - rss
+            self._depth -= 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def to_dict(self) -> dict:
+        rss = _rss_kb()
+        return {
+            "rerun": self.label,
+            "inicio": self.started.isoformat(timespec="milliseconds"),
+            "total_ms": self.total_ms,
+            "rss_processo_kb": None if rss is None or self._rss0 is None else rss - self._rss0,
+            "cache": dict(self.counters),
+            "spans": [s for s in self.spans if "ms" in s],
+        }
+
+
+def span(name: str, **attrs):
+    """Contexto que mede ``name`` no trace ativo (vazio se não houver trace)."""
+    trace = _CURRENT.get()
+    if trace is None:
+        return _NOOP
+    return trace.span(name, **attrs)
+
+
+def traced(name: str | None = None):
+    """Decorador: cada chamada vira um span (por padrão, com o nome da função)."""
+    def deco(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            trace = _CURRENT.get()
+            if trace is None:
+                return fn(*args, **kwargs)
+            with trace.span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+
+def count(name: str, n: int = 1) -> None:
+    """Soma ``n`` ao contador ``name`` do trace ativo (ex.: "figuras.hit")."""
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.count(name, n)
+
+
+def begin_rerun(label: str, enabled: bool = False) -> Trace | None:
+    """Abre o trace deste rerun se ``enabled`` ou CAPACITIA_TRACE=1; senão desliga os spans."""
+    trace = Trace(label) if enabled or TRACE_ENABLED else None
+    _CURRENT.set(trace)
+    return trace
+
+
+def end_rerun(trace: Trace | None) -> dict | None:
+    """Fecha o trace, emite a linha JSON (com CAPACITIA_TRACE=1) e devolve o registro."""
+    _CURRENT.set(None)
+    if trace is None:
+        return None
+    trace.total_ms = (time.perf_counter() - trace._t0) * 1000
+    record = trace.to_dict()
+    if TRACE_ENABLED:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        log.info(line)
+        if TRACE_FILE:
+            with _FILE_LOCK, open(TRACE_FILE, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+    return record
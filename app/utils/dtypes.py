@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+# Tipos compactos para os frames que ficam residentes no repositório: rótulos repetidos viram
+# category (um código por linha + uma cópia de cada texto) e contagens viram Int32 anulável
+# (4 bytes por linha em vez de 8). Os agregados entregues às páginas voltam a str/float64
+# (``plain_frame``), para os gráficos e tabelas não dependerem dos tipos compactos.
+
+_INT32 = np.iinfo(np.int32)
+
+def compact_counts(s: pd.Series) -> pd.Series:
+    """Int32 anulável se todos os valores forem inteiros dentro do int32; senão, inalterada."""
+    if not pd.api.types.is_numeric_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype):
+        return s
+    values = s.to_numpy(dtype=float, na_value=np.nan)
+    finite = values[~np.isnan(values)]
+    if not (np.all(finite == np.round(finite)) and np.all((finite >= _INT32.min) & (finite <= _INT32.max))):
+        return s
+    return s.astype("Int32")
+
+_MAX_UNIQUE_RATIO = 0.8  # acima disso quase não há repetição e a category só acrescenta os códigos
+
+def compact_labels(s: pd.Series) -> pd.Series:
+    """category (categorias em ordem alfabética) se os rótulos se repetirem; já categóricas ficam como estão."""
+    if isinstance(s.dtype, pd.CategoricalDtype) or s.nunique() > _MAX_UNIQUE_RATIO * len(s):
+        return s
+    return s.astype("category")
+
+def compact_frame(df: pd.DataFrame, labels=(), counts=()) -> pd.DataFrame:
+    """Converte as colunas ``labels`` para category e ``counts`` para Int32 (as que existirem)."""
+    fixed = {c: compact_labels(df[c]) for c in labels if c in df.columns}
+    fixed |= {c: compact_counts(df[c]) for c in counts if c in df.columns}
+    return df.assign(**fixed) if fixed else df
+
+def plain_series(s: pd.Series) -> pd.Series:
+    """Desfaz ``compact_frame`` numa Series: category -> tipo das categorias, Int* -> float64."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        return s.astype(s.cat.categories.dtype)
+    if isinstance(s.dtype, pd.api.extensions.ExtensionDtype) and (
+            pd.api.types.is_integer_dtype(s) or pd.api.types.is_float_dtype(s)):
+        return s.astype("float64")
+    return s
+
+def plain_frame(df: pd.DataFrame) -> pd.DataFrame:
+    fixed = {c: plain_series(df[c]) for c in df.columns
+             if isinstance(df[c].dtype, pd.api.extensions.ExtensionDtype)}
+    out = df.assign(**fixed) if fixed else df
+    if isinstance(out.index, pd.CategoricalIndex):
+        out = out.set_axis(out.index.astype(out.index.categories.dtype), axis=0)
+    if isinstance(out.columns, pd.CategoricalIndex):
+        out = out.set_axis(out.columns.astype(out.columns.categories.dtype), axis=1)
+    return out
+
+def frame_memory(df: pd.DataFrame | pd.Series | None) -> int:
+    """Bytes ocupados pelo frame ou Series (inclui o conteúdo dos textos e o índice)."""
+    return 0 if df is None else int(np.sum(df.memory_usage(deep=True, index=True)))
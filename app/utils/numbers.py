@@ -2,17 +2,53 @@ import re
 import numpy as np
 import pandas as pd
 
-def parse_ptbr_number(x):
-    """Converte número no formato pt-BR (milhar . e decimal ,) para float. Robusto a símbolos."""
-    if x is None or (isinstance(x, float) and pd.isna(x)):
+_NON_NUMERIC = re.compile(r"[^\d,.\-]")
+_PTBR_PATTERN = re.compile(r"^-?\d{1,3}(\.\d{3})*(,\d+)?$")
+
+def _to_float(s: str) -> float:
+    try:
+        return float(s)
+    except ValueError:
         return np.nan
-    s = str(x).strip()
-    s = s.replace("\xa0", " ").replace(" ", "")
-    s = re.sub(r"[^\d,.\-]", "", s)
+
+def _parse_distinct(values) -> np.ndarray:
+    """Texto -> float para valores já distintos (o trabalho de parse_ptbr_number, vetorizado)."""
+    txt = pd.Series(values, dtype=object).map(str).str.strip()
+    txt = txt.str.replace("\xa0", " ", regex=False).str.replace(" ", "", regex=False)
+    txt = txt.str.replace(_NON_NUMERIC, "", regex=True)
     # padrão ptbr: 1.234,56
-    if re.match(r"^-?\d{1,3}(\.\d{3})*(,\d+)?$", s):
-        s = s.replace(".", "").replace(",", ".")
+    ptbr = txt.str.match(_PTBR_PATTERN)
+    txt = txt.where(~ptbr, txt.str.replace(".", "", regex=False).str.replace(",", ".", regex=False))
+    return txt.map(_to_float).to_numpy(dtype=float)  # float() do Python: arredondamento exato
+
+def _equals_zero_or_one(v) -> bool:
     try:
-        return float(s)
-    except Exception:
+        return not isinstance(v, str) and bool(v == 0 or v == 1)
+    except (TypeError, ValueError):
+        return False
+
+def parse_ptbr_numbers(values):
+    """Versão vetorizada de parse_ptbr_number para Series/ndarray/lista.
+
+    Só os valores distintos passam pelas operações de texto; o resultado é reespalhado pelos
+    códigos do factorize. Series -> Series float64 (mesmo índice); demais -> ndarray float64.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object), dtype=object)
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    parsed = _parse_distinct(uniques)
+    out = np.where(codes >= 0, parsed[codes] if len(parsed) else np.nan, np.nan)
+
+    # o factorize iguala True a 1 e False a 0 e -0.0, que o parser (via str) distingue:
+    # as linhas desses valores são refeitas agrupando pela representação em texto
+    ambiguous = [i for i, u in enumerate(uniques) if _equals_zero_or_one(u)]
+    if ambiguous:
+        rows = np.flatnonzero(np.isin(codes, ambiguous))
+        sub_codes, sub_uniques = pd.factorize(s.iloc[rows].map(str))
+        out[rows] = _parse_distinct(sub_uniques)[sub_codes]
+    return pd.Series(out, index=s.index, dtype=float) if isinstance(values, pd.Series) else out
+
+def parse_ptbr_number(x):
+    """Converte número no formato pt-BR (milhar . e decimal ,) para float. Robusto a símbolos."""
+    if x is None or (isinstance(x, float) and pd.isna(x)):
         return np.nan
+    return float(parse_ptbr_numbers([x])[0])
@@ -1,10 +1,37 @@
 import unicodedata
 import re
+from functools import lru_cache
+import numpy as np
 import pandas as pd
 
+_SPACES = re.compile(r"\s+")
+
+@lru_cache(maxsize=8192)
+def _normalize_str(s: str) -> str:
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))  # remove acentos
+    return _SPACES.sub(" ", s).strip()
+
 def normalize_text(s: str) -> str:
     s = "" if pd.isna(s) else str(s)
-    s = unicodedata.normalize("NFKD", s)
-    s = "".join(ch for ch in s if not unicodedata.combining(ch))
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    return _normalize_str(s)
+
+def org_key(s: str) -> str:
+    """Chave canônica de órgão: sem acentos, espaços colapsados, em maiúsculas."""
+    return normalize_text(s).upper()
+
+def org_keys(s: pd.Series, alias_index: dict[str, str] | None = None) -> pd.Series:
+    """org_key para uma Series inteira, normalizando só os valores distintos.
+
+    ``alias_index`` (de build_alias_index) troca chaves por sua forma canônica.
+    """
+    codes, uniques = pd.factorize(s, use_na_sentinel=True)
+    keys = [org_key(u) for u in uniques]
+    if alias_index:
+        keys = [alias_index.get(k, k) for k in keys]
+    keys = np.array(keys + [""], dtype=object)  # código -1 (ausente) vira ""
+    return pd.Series(keys[codes], index=s.index, dtype=object)
+
+def build_alias_index(alias: dict | None) -> dict[str, str]:
+    """Pré-normaliza um dicionário de aliases {nome: nome canônico} no mesmo formato de org_key."""
+    return {org_key(k): org_key(v) for k, v in (alias or {}).items()}
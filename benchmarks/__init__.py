@@ -0,0 +1 @@
+# benchmarks manuais: python -m benchmarks.<módulo>
@@ -0,0 +1,91 @@
+"""Vazão e latência da API JSON (app.api) com os dados inalterados.
+
+Sobe o servidor numa thread (porta livre), aquece as respostas e dispara ``--requests``
+requisições por cliente, cada cliente numa conexão keep-alive própria, em três cenários:
+
+    200 gzip          Accept-Encoding: gzip
+    200 sem gzip      corpo JSON puro
+    304               If-None-Match com o ETag recebido (o caso típico de quem faz polling)
+
+Uso: python -m benchmarks.bench_api [--requests 500] [--clients 1 4] [--path /secretarias]
+"""
+import argparse
+import http.client
+import logging
+import statistics
+import threading
+import time
+import warnings
+
+from app.api import ApiServer, ApiState, repository_source
+
+
+def _client(port: int, path: str, headers: dict, n: int, out: list) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    times = []
+    for _ in range(n):
+        t = time.perf_counter()
+        conn.request("GET", path, headers=headers)
+        resp = conn.getresponse()
+        resp.read()
+        times.append(time.perf_counter() - t)
+    conn.close()
+    out.extend(times)
+
+
+def _scenario(port: int, path: str, headers: dict, n: int, clients: int) -> tuple[float, float, float]:
+    times: list[float] = []
+    threads = [threading.Thread(target=_client, args=(port, path, headers, n, times)) for _ in range(clients)]
+    t0 = time.perf_counter()
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    wall = time.perf_counter() - t0
+    times.sort()
+    return len(times) / wall, statistics.median(times) * 1000, times[int(0.95 * (len(times) - 1))] * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=500, help="requisições por cliente e cenário")
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 4])
+    ap.add_argument("--path", default="/secretarias")
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    state = ApiState(repository_source(None))
+    t = time.perf_counter()
+    state.warm()
+    print(f"aquecimento (leitura + serialização de todas as tabelas): {(time.perf_counter() - t) * 1000:.0f} ms")
+
+    server = ApiServer(("127.0.0.1", 0), state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    conn.request("GET", args.path, headers={"Accept-Encoding": "gzip"})
+    resp = conn.getresponse()
+    gz_len = len(resp.read())
+    etag = resp.getheader("ETag")
+    conn.request("GET", args.path)
+    raw_len = len(conn.getresponse().read())
+    conn.close()
+    print(f"{args.path}: {raw_len} bytes, {gz_len} com gzip, ETag {etag}")
+
+    scenarios = [
+        ("200 gzip", {"Accept-Encoding": "gzip"}),
+        ("200 sem gzip", {}),
+        ("304", {"Accept-Encoding": "gzip", "If-None-Match": etag}),
+    ]
+    print(f"\n{'cenário':14s} {'clientes':>8} {'req/s':>9} {'p50':>9} {'p95':>9}")
+    for clients in args.clients:
+        for name, headers in scenarios:
+            rps, p50, p95 = _scenario(port, args.path, headers, args.requests, clients)
+            print(f"{name:14s} {clients:8d} {rps:9.0f} {p50:7.2f} ms {p95:7.2f} ms")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
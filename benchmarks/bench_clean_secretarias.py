@@ -0,0 +1,33 @@
+"""Escalonamento de clean_secretarias numa aba SECRETARIA-ÓRGÃO sintética.
+
+Uso: python -m benchmarks.bench_clean_secretarias [--sizes 10000 50000 100000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from app.domain.filters import clean_secretarias
+from benchmarks.synthetic import secretarias_sheet
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    args = ap.parse_args(argv)
+
+    print(f"{'linhas':>8} {'tempo':>9} {'µs/linha':>9} {'pico':>9}")
+    for n in args.sizes:
+        raw = secretarias_sheet(n)
+        t0 = time.perf_counter()
+        clean_secretarias(raw)
+        dt = time.perf_counter() - t0
+
+        tracemalloc.start()
+        clean_secretarias(raw)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{n:>8} {dt:8.3f}s {dt / n * 1e6:9.2f} {peak / 1e6:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Mede a inicialização do CLI de exportação (python -m app.export) em processos novos.
+
+Verifica também que nem Streamlit nem Plotly são importados no caminho do export.
+
+Uso: python -m benchmarks.bench_export_startup [--runs 5] [--budget 1.5]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+from app.data.sources import DEFAULT_CANDIDATES
+
+# orçamento (s) do export de uma planilha já no cache colunar, processo novo, 1 CPU
+BUDGET_S = 1.5
+
+_PROBE = (
+    "import sys, runpy; sys.argv = ['app.export', *sys.argv[1:]];"
+    "import contextlib, io\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    try: runpy.run_module('app.export', run_name='__main__')\n"
+    "    except SystemExit: pass\n"
+    "bad = sorted(m for m in ('streamlit', 'plotly') if m in sys.modules)\n"
+    "assert not bad, f'importados no export: {bad}'"
+)
+
+
+def _run(args) -> float:
+    t = time.perf_counter()
+    subprocess.run([sys.executable, "-c", _PROBE, *args], check=True, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - t
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget", type=float, default=BUDGET_S)
+    args = ap.parse_args(argv)
+
+    path = str(next(p for p in DEFAULT_CANDIDATES if p.exists()))
+    _run([path])  # aquece o cache colunar e o cache de disco do SO
+
+    help_s = statistics.median(_run(["--help"]) for _ in range(args.runs))
+    export_s = statistics.median(_run([path]) for _ in range(args.runs))
+    print(f"python -m app.export --help     {help_s * 1000:8.0f} ms")
+    print(f"python -m app.export <planilha> {export_s * 1000:8.0f} ms  (orçamento {args.budget * 1000:.0f} ms)")
+    if export_s > args.budget:
+        sys.exit("acima do orçamento")
+
+
+if __name__ == "__main__":
+    main()
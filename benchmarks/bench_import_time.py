@@ -0,0 +1,100 @@
+"""Orçamento de tempo de importação dos módulos carregados por app/main.py (``-X importtime``).
+
+Roda um processo novo com ``python -X importtime``, soma o tempo cumulativo das importações de
+primeiro nível e lista os módulos mais caros. Falha (código de saída 1) se o total passar do
+orçamento ou se plotly.express for importado antes da primeira figura.
+
+Uso: python -m benchmarks.bench_import_time [--runs 5] [--budget 1.9]
+"""
+import argparse
+import ast
+import importlib.util
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+MAIN = Path(__file__).resolve().parent.parent / "app" / "main.py"
+
+
+def main_imports(path: Path = MAIN) -> list[str]:
+    """Módulos importados no nível de módulo de app/main.py (o que roda antes de desenhar qualquer
+    coisa), lidos do próprio arquivo: ``from app import debug_panel`` conta como ``app.debug_panel``."""
+    modules = []
+    for node in ast.parse(path.read_text(encoding="utf-8")).body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                sub = f"{node.module}.{alias.name}"
+                try:
+                    is_module = importlib.util.find_spec(sub) is not None
+                except ModuleNotFoundError:  # o pai não é pacote (ex.: datetime.datetime)
+                    is_module = False
+                modules.append(sub if is_module else node.module)
+    return list(dict.fromkeys(modules))
+
+
+# orçamento (s) da soma das importações de main.py, processo novo, 1 CPU
+BUDGET_S = 1.9
+
+# módulos que não podem aparecer na inicialização (carregados só sob demanda)
+LAZY = ("plotly.express", "openpyxl")
+
+
+def importtime(modules=None) -> list[tuple[int, int, str]]:
+    """(próprio µs, cumulativo µs, nome indentado) de cada importação, num processo novo."""
+    code = "import " + ", ".join(modules or main_imports())
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=MAIN.parent.parent,
+                          capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|")
+        if self_us.strip().isdigit():
+            rows.append((int(self_us), int(cum_us), name[1:]))  # mantém a indentação do nome
+    return rows
+
+
+def total_seconds(rows) -> float:
+    # linhas sem indentação = importações de primeiro nível (o cumulativo já inclui as filhas)
+    return sum(cum for _, cum, name in rows if not name.startswith(" ")) / 1e6
+
+
+def eager_modules(rows) -> list[str]:
+    """Módulos de LAZY carregados na inicialização."""
+    return [m for m in LAZY if any(name.strip() == m for _, _, name in rows)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget", type=float, default=BUDGET_S)
+    ap.add_argument("--top", type=int, default=12)
+    args = ap.parse_args(argv)
+
+    totals, last = [], []
+    for _ in range(args.runs):
+        last = importtime()
+        totals.append(total_seconds(last))
+
+    print(f"importações de main.py: {statistics.median(totals) * 1000:.0f} ms "
+          f"(mediana de {args.runs}; orçamento {args.budget * 1000:.0f} ms)")
+    print("mais caros (cumulativo):")
+    for _, cum, name in sorted(last, key=lambda r: r[1], reverse=True)[:args.top]:
+        print(f"  {cum / 1000:8.1f} ms  {name.strip()}")
+
+    failed = False
+    eager = eager_modules(last)
+    if eager:
+        print(f"importados na inicialização (deveriam ser sob demanda): {eager}")
+        failed = True
+    if statistics.median(totals) > args.budget:
+        print("acima do orçamento")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Mede a latência de cada interação do dashboard (rerun completo do script via AppTest).
+
+Cada interação é repetida ``--repeat`` vezes a partir do estado inicial e reporta-se a mediana.
+Quando existe o seletor de aba (``nav_tab``), a interação é feita com a aba correspondente ativa.
+
+Uso: python -m benchmarks.bench_interactions [--repeat 5]
+"""
+import argparse
+import logging
+import statistics
+import time
+import warnings
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+MAIN = Path(__file__).resolve().parents[1] / "app" / "main.py"
+
+# (nome, aba em que o widget aparece, ação sobre o AppTest)
+INTERACTIONS = [
+    ("rg_sec = Comparativo",      "📊 Visão Geral",  lambda at: at.radio(key="rg_sec").set_value("Comparativo")),
+    ("t2_cargo_series (2º cargo)", "👥 Cargos",      lambda at: at.selectbox(key="t2_cargo_series").select_index(1)),
+    ("tabela de secretarias",     "🏢 Secretarias",  lambda at: _toggle(at, "Mostrar tabela de secretarias").set_value(True)),
+    ("tabela de eventos",         "📚 Eventos",      lambda at: _toggle(at, "Mostrar tabela de eventos").set_value(True)),
+]
+
+
+def _toggle(at, label):
+    return next(t for t in at.toggle if t.label == label)
+
+
+def _nav(at):
+    for kind in ("button_group", "radio"):
+        try:
+            return getattr(at, kind)(key="nav_tab")
+        except (KeyError, AttributeError):
+            continue
+    return None
+
+
+def _timed_run(at) -> float:
+    t = time.perf_counter()
+    at.run()
+    assert not at.exception, at.exception
+    return time.perf_counter() - t
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    warm = AppTest.from_file(str(MAIN), default_timeout=120)
+    _timed_run(warm)  # aquece: registro, frames e cache de figuras compartilhados no processo
+
+    first = [_timed_run(AppTest.from_file(str(MAIN), default_timeout=120)) for _ in range(args.repeat)]
+    print(f"{'primeira execução (sessão nova)':34s} {statistics.median(first) * 1000:8.1f} ms")
+
+    for name, tab, action in INTERACTIONS:
+        times = []
+        for _ in range(args.repeat):
+            at = AppTest.from_file(str(MAIN), default_timeout=120)
+            at.run()
+            nav = _nav(at)
+            if nav is not None:
+                nav.set_value(tab)
+                at.run()
+            action(at)
+            times.append(_timed_run(at))
+        print(f"{name:34s} {statistics.median(times) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
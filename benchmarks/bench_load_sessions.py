@@ -0,0 +1,300 @@
+"""Teste de carga com N sessões simultâneas (AppTest) sobre app/main.py e app_ia.py.
+
+Cada sessão é um processo com o seu próprio AppTest: instâncias de AppTest em threads de um
+mesmo processo não são isoladas (compartilham o contexto de execução de script do Streamlit,
+e uma sessão chega a ver o widget ou a aba de outra). Cada processo aquece o app (leitura das
+planilhas/CSVs e caches) fora da medição; as sessões de um nível começam juntas, abrem o app
+e fazem ``--steps`` interações sorteadas:
+
+    main.py    troca do modo de rg_sec, escolha de cargo em t2_cargo_series, tabelas de
+               secretarias/eventos (sec_tbl/ev_tbl), troca de aba (nav_tab)
+    app_ia.py  filtro "Filtrar por Secretaria do Participante" e a secretaria em detalhe
+
+Cada interação é um rerun completo do script. Uma interação que falhe (ex.: widget ausente)
+é contada em ``erros`` e a sessão continua. O relatório traz p50/p95 da latência por
+interação e no total, reruns por segundo e o pico de RSS por sessão (o maior entre os
+processos) e somado.
+
+Roda offline, num diretório temporário com ``dados_main/`` (planilhas do main.py) e
+``dados/`` (CSVs do app_ia.py) apontando para as planilhas e CSVs do repositório.
+
+Uso:
+    python -m benchmarks.bench_load_sessions                        # 1, 5 e 10 sessões, os dois apps
+    python -m benchmarks.bench_load_sessions --sessions 20 --steps 20 --app main
+    python -m benchmarks.bench_load_sessions --think 0.5 --json carga.json
+"""
+import argparse
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import warnings
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parents[1]
+MAIN = ROOT / "app" / "main.py"
+DATA = ROOT / "dados_main"
+TIMEOUT = 120
+
+
+def _pagina_ia():
+    # roda como script do AppTest (só o corpo da função, sem os globais deste módulo)
+    import app_ia
+
+    app_ia.construir_pagina_ia()
+
+
+def _new_session(app: str) -> AppTest:
+    if app == "main":
+        return AppTest.from_file(str(MAIN), default_timeout=TIMEOUT)
+    return AppTest.from_function(_pagina_ia, default_timeout=TIMEOUT)
+
+
+def _nav(at):
+    for kind in ("button_group", "radio"):
+        try:
+            return getattr(at, kind)(key="nav_tab")
+        except (KeyError, AttributeError):
+            continue
+    return None
+
+
+def _on_tab(at, tab: str, rerun) -> None:
+    """Ativa ``tab`` antes de mexer num widget dela (a troca de aba conta como interação)."""
+    nav = _nav(at)
+    if nav is not None and nav.value != tab:
+        nav.set_value(tab)
+        rerun("nav_tab")
+
+
+# --- interações: (nome, função(at, rng, rerun)) ---------------------------------------------
+
+def _rg_sec(at, rng, rerun):
+    _on_tab(at, "📊 Visão Geral", rerun)
+    w = at.radio(key="rg_sec")
+    w.set_value(rng.choice([o for o in w.options if o != w.value]))
+    rerun("rg_sec")
+
+
+def _cargo_series(at, rng, rerun):
+    _on_tab(at, "👥 Cargos", rerun)
+    w = at.selectbox(key="t2_cargo_series")
+    w.select(rng.choice([o for o in w.options if o != w.value] or w.options))
+    rerun("t2_cargo_series")
+
+
+def _toggle(tab, key):
+    def action(at, rng, rerun):
+        _on_tab(at, tab, rerun)
+        w = at.toggle(key=key)
+        w.set_value(not w.value)
+        rerun(key)
+    action.__name__ = f"_{key}"
+    return action
+
+
+def _nav_tab(at, rng, rerun):
+    nav = _nav(at)
+    if nav is None:
+        return
+    nav.set_value(rng.choice([o for o in nav.options if o != nav.value]))
+    rerun("nav_tab")
+
+
+def _filtro_secretarias(at, rng, rerun):
+    w = next(m for m in at.multiselect if m.label == "Filtrar por Secretaria do Participante")
+    w.set_value(rng.sample(w.options, rng.randint(1, len(w.options))))
+    rerun("filtro_secretarias")
+
+
+def _secretaria_detalhe(at, rng, rerun):
+    w = next(s for s in at.selectbox if s.label.startswith("Selecione uma Secretaria"))
+    w.select(rng.choice(w.options))
+    rerun("secretaria_detalhe")
+
+
+INTERACTIONS = {
+    "main": [
+        _rg_sec,
+        _cargo_series,
+        _toggle("🏢 Secretarias", "sec_tbl"),
+        _toggle("📚 Eventos", "ev_tbl"),
+        _nav_tab,
+    ],
+    "ia": [_filtro_secretarias, _secretaria_detalhe],
+}
+
+
+# --- execução ---------------------------------------------------------------------------------
+
+def _session(app: str, steps: int, think: float, seed: int) -> tuple[list, int, list]:
+    """Uma sessão: abertura + ``steps`` interações. Retorna ([(interação, s)], erros, falhas)."""
+    rng = random.Random(seed)
+    samples, errors, failures = [], 0, []
+    at = _new_session(app)
+
+    def rerun(name):
+        nonlocal errors
+        t = time.perf_counter()
+        at.run()
+        samples.append((name, time.perf_counter() - t))
+        if at.exception:
+            errors += 1
+
+    rerun("abertura")
+    for _ in range(steps):
+        if think:
+            time.sleep(think)
+        action = rng.choice(INTERACTIONS[app])
+        try:
+            action(at, rng, rerun)
+        except Exception as exc:  # widget ausente, timeout do rerun...: conta e segue
+            errors += 1
+            failures.append(f"{action.__name__}: {type(exc).__name__}: {exc}")
+    return samples, errors, failures
+
+
+def _worker(app: str, steps: int, think: float, seed: int, start, results) -> None:
+    """Processo de uma sessão: aquece, espera as demais (``start``) e devolve a medição em ``results``."""
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    try:
+        _session(app, 0, 0, seed)  # aquecimento, fora da medição
+    except Exception as exc:
+        start.abort()  # não segura as outras sessões
+        results.put(([], 1, [f"aquecimento: {type(exc).__name__}: {exc}"], _peak_rss_mb()))
+        return
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        pass  # outra sessão falhou no aquecimento; esta roda mesmo assim
+    try:
+        samples, errors, failures = _session(app, steps, think, seed)
+    except Exception as exc:  # falha na abertura
+        samples, errors, failures = [], 1, [f"abertura: {type(exc).__name__}: {exc}"]
+    results.put((samples, errors, failures, _peak_rss_mb()))
+
+
+def _percentile(values: list, q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB no Linux
+
+
+def run_level(app: str, sessions: int, steps: int, think: float, seed: int) -> dict:
+    ctx = mp.get_context("spawn")  # processo limpo: nada herdado do Streamlit/threads deste
+    start, out = ctx.Barrier(sessions + 1), ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(app, steps, think, seed + i, start, out),
+                         name=f"sessao-{app}-{i}") for i in range(sessions)]
+    for p in procs:
+        p.start()
+    try:
+        start.wait()
+    except threading.BrokenBarrierError:
+        pass
+    t0 = time.perf_counter()
+    results = []
+    while len(results) < sessions:
+        try:
+            results.append(out.get(timeout=1))
+        except queue.Empty:
+            if not any(p.is_alive() for p in procs) and out.empty():
+                break  # processo morreu sem resposta
+    wall = time.perf_counter() - t0
+    for p in procs:
+        p.join()
+    lost = sessions - len(results)
+    results += [([], 1, ["processo da sessão terminou sem resultado"], 0.0)] * lost
+
+    by_name: dict[str, list] = {}
+    for samples, *_ in results:
+        for name, s in samples:
+            by_name.setdefault(name, []).append(s)
+    every = [s for values in by_name.values() for s in values]
+
+    def summary(values):
+        if not values:
+            return {"n": 0, "p50_ms": float("nan"), "p95_ms": float("nan")}
+        return {"n": len(values), "p50_ms": _percentile(values, 0.50) * 1000,
+                "p95_ms": _percentile(values, 0.95) * 1000}
+
+    return {
+        "app": app,
+        "sessoes": sessions,
+        "reruns_por_s": len(every) / wall,
+        "erros": sum(e for _, e, _, _ in results),
+        "falhas": sorted({f for _, _, failures, _ in results for f in failures}),
+        "total": summary(every),
+        "interacoes": {name: summary(values) for name, values in sorted(by_name.items())},
+        "pico_rss_mb": max(rss for *_, rss in results),
+        "rss_total_mb": sum(rss for *_, rss in results),
+    }
+
+
+def _report(r: dict) -> None:
+    print(f"\n{r['app']} — {r['sessoes']} sessão(ões): {r['reruns_por_s']:.1f} reruns/s, "
+          f"pico RSS {r['pico_rss_mb']:.0f} MB por sessão ({r['rss_total_mb']:.0f} MB no total)"
+          + (f", {r['erros']} erro(s)" if r["erros"] else ""))
+    for f in r["falhas"][:5]:
+        print(f"  falha: {f}")
+    print(f"  {'interação':22s} {'n':>5} {'p50':>10} {'p95':>10}")
+    for name, s in [*r["interacoes"].items(), ("TOTAL", r["total"])]:
+        print(f"  {name:22s} {s['n']:5d} {s['p50_ms']:8.1f} ms {s['p95_ms']:8.1f} ms")
+
+
+def _workdir() -> tempfile.TemporaryDirectory:
+    """Diretório de trabalho com os dados do repositório nos caminhos que cada app espera."""
+    tmp = tempfile.TemporaryDirectory(prefix="capacitia-carga-")
+    os.symlink(DATA, Path(tmp.name) / "dados_main")
+    os.symlink(DATA, Path(tmp.name) / "dados")
+    return tmp
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sessions", type=int, nargs="+", default=[1, 5, 10],
+                    help="níveis de concorrência (um teste por nível)")
+    ap.add_argument("--steps", type=int, default=10, help="interações por sessão")
+    ap.add_argument("--app", nargs="+", choices=list(INTERACTIONS), default=list(INTERACTIONS))
+    ap.add_argument("--think", type=float, default=0.0, help="pausa (s) entre interações")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", type=Path, help="grava os resultados em JSON")
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    sys.path.insert(0, str(ROOT))
+    json_out = args.json.resolve() if args.json else None
+
+    results = []
+    cwd = os.getcwd()
+    with _workdir() as workdir:
+        os.chdir(workdir)  # herdado pelos processos das sessões
+        try:
+            for app in args.app:
+                for n in args.sessions:
+                    r = run_level(app, n, args.steps, args.think, args.seed)
+                    _report(r)
+                    results.append(r)
+        finally:
+            os.chdir(cwd)
+
+    if json_out:
+        json_out.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nresultados gravados em {json_out}")
+
+
+if __name__ == "__main__":
+    main()
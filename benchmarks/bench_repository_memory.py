@@ -0,0 +1,85 @@
+"""Memória residente de um DataRepository inteiro, antes e depois dos tipos compactos.
+
+Para cada planilha, carrega os frames das páginas (``load()``) e os KPIs (``get_kpis()``),
+como fazem o main.py e o watcher, em quatro cenários:
+
+    antes           compact=False, CARGOS largo (df_cargos_ev) e sem descartar os intermediários
+    sem cache       CAPACITIA_CACHE=0: tudo lido e derivado da planilha
+    cache frio      primeira carga com o cache colunar ligado (lê a planilha e grava o Parquet)
+    cache quente    carga seguinte: os frames vêm do Parquet, sem abrir o Excel
+
+e soma ``memory_report()``: todos os frames mantidos pelo repositório (abas cruas e
+intermediárias incluídas, enquanto estiverem em memória) e os valores derivados memoizados.
+
+Uso:
+    python -m benchmarks.bench_repository_memory                       # planilha real + sintéticas 1x e 10x
+    python -m benchmarks.bench_repository_memory --scales 1 10 100
+"""
+import argparse
+import logging
+import tempfile
+import warnings
+from pathlib import Path
+
+from app.data import frame_cache
+from app.data.repository import DataRepository, PAGE_FRAMES
+from app.data.sources import default_workbook
+from benchmarks.bench_suite import workbook
+
+# conjunto de frames das páginas antes do formato longo de CARGOS
+PAGE_FRAMES_ANTES = tuple("df_cargos_ev" if n == "df_cargos_long" else n for n in PAGE_FRAMES)
+
+
+def _load(repo: DataRepository, names=PAGE_FRAMES) -> DataRepository:
+    repo.load(names)
+    repo.get_kpis()
+    return repo
+
+
+def measure(path: Path) -> dict:
+    """{cenário: memory_report()} de ``path``."""
+    antes = DataRepository(path, use_cache=False, compact=False, release_intermediate=False)
+    reports = {
+        "antes": _load(antes, PAGE_FRAMES_ANTES).memory_report(),
+        "sem cache": _load(DataRepository(path, use_cache=False)).memory_report(),
+    }
+    cache_dir = frame_cache.CACHE_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        frame_cache.CACHE_DIR = Path(tmp)
+        try:
+            reports["cache frio"] = _load(DataRepository(path)).memory_report()
+            reports["cache quente"] = _load(DataRepository(path)).memory_report()
+        finally:
+            frame_cache.CACHE_DIR = cache_dir
+    return reports
+
+
+def _report(label: str, reports: dict) -> None:
+    base = reports["antes"]["bytes"].sum()
+    print(f"\n{label}")
+    for cenario, rep in reports.items():
+        total = rep["bytes"].sum()
+        delta = "" if cenario == "antes" else f" ({(total / base - 1) * 100 if base else 0:+.0f}%)"
+        print(f"  {cenario:13s} {total / 1024:10,.1f} KiB{delta}")
+        for row in rep.itertuples():
+            print(f"    {row.frame:30s} {row.bytes / 1024:10,.1f} KiB")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="planilhas sintéticas (benchmarks.synthetic)")
+    ap.add_argument("--excel", type=Path, default=default_workbook())
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    if not frame_cache.CACHE_ENABLED:
+        print("aviso: cache colunar indisponível (pyarrow/CAPACITIA_CACHE=0); 'cache frio/quente' = 'sem cache'")
+    if args.excel is not None:
+        _report(str(args.excel), measure(args.excel))
+    for scale in args.scales:
+        _report(f"sintética {scale}x", measure(workbook(scale)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Mede a alocação de memória de um rerun das quatro abas (sem servidor Streamlit).
+
+As funções ``render`` rodam em modo "bare" do Streamlit (chamadas st.* viram no-op), então o
+que se mede é o caminho de dados + construção das figuras.
+
+Uso: python -m benchmarks.bench_rerun_alloc [--reruns 5]
+"""
+import argparse
+import logging
+import tracemalloc
+import warnings
+from unittest import mock
+
+import pandas as pd
+
+from app.data.registry import get_repository
+from app.data.sources import DEFAULT_CANDIDATES
+
+
+def _rerun(repo):
+    from app.pages import visao_geral, cargos, secretarias, eventos
+    repo.get_kpis()
+    visao_geral.render(repo)
+    cargos.render(repo)
+    secretarias.render(repo)
+    eventos.render(repo)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--reruns", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.WARNING)  # avisos do modo "bare" do Streamlit
+    warnings.simplefilter("ignore")
+    path = next(p for p in DEFAULT_CANDIDATES if p.exists())
+    repo = get_repository(path)
+    _rerun(repo)  # aquece: materializa frames e importa plotly
+
+    copies = 0
+    real_copy = pd.DataFrame.copy
+
+    def counting_copy(self, deep=True):
+        nonlocal copies
+        if deep:
+            copies += 1
+        return real_copy(self, deep=deep)
+
+    peaks, totals = [], []
+    with mock.patch.object(pd.DataFrame, "copy", counting_copy):
+        for _ in range(args.reruns):
+            tracemalloc.start()
+            _rerun(repo)
+            snap = tracemalloc.take_snapshot()
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            totals.append(sum(s.size for s in snap.statistics("filename")))
+            tracemalloc.stop()
+
+    print(f"cópias profundas de DataFrame por rerun: {copies / args.reruns:.0f}")
+    print(f"pico de memória por rerun:               {max(peaks) / 1e6:.2f} MB")
+    print(f"memória retida ao final do rerun:         {max(totals) / 1e6:.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Suíte de microbenchmarks da camada de dados/domínio em planilhas sintéticas escaladas.
+
+Gera (uma vez) planilhas com o layout real em 1x, 10x, 100x ... as linhas do relatório e mede,
+para cada escala, tempo (mediana) e pico de memória (tracemalloc) de:
+
+    load_sheets                 leitura de todas as abas (app.data.readers)
+    clean_secretarias           limpeza da SECRETARIA-ÓRGÃO crua
+    get_totais_visao            localização do TOTAL GERAL + totais da VISÃO ABERTA
+    count_secretarias_unicas    secretarias atendidas
+    load_cargos                 DataRepository.load dos frames de CARGOS (leitura + preparo + ranking)
+
+A partir de 1000x cada caso roda uma vez num processo filho e o pico é o aumento do RSS.
+
+Os resultados podem ser gravados como baseline e comparados em execuções futuras.
+
+Uso:
+    python -m benchmarks.bench_suite                                  # 1x 10x 100x
+    python -m benchmarks.bench_suite --scales 1 10 100 1000 --save benchmarks/baseline.json
+    python -m benchmarks.bench_suite --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import pandas as pd
+
+from app.data.frame_cache import CACHE_DIR
+from app.data.readers import SHEETS, load_sheets, read_sheets
+from app.data.repository import DataRepository
+from app.domain.filters import clean_secretarias
+from app.domain.kpis import count_secretarias_unicas, get_totais_visao
+from benchmarks.synthetic import write_workbook
+
+BENCH_DIR = CACHE_DIR / "bench"
+SEED = 0
+
+
+def workbook(scale: int) -> Path:
+    """Planilha sintética da escala pedida (gerada na primeira vez e reaproveitada)."""
+    path = BENCH_DIR / f"synthetic-{scale}x-seed{SEED}.xlsx"
+    if not path.exists():
+        BENCH_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp.xlsx")
+        write_workbook(tmp, scale, SEED)
+        os.replace(tmp, path)
+    return path
+
+
+def _cases(path: Path) -> dict:
+    """Nome -> função sem argumentos; entradas pré-lidas para isolar cada etapa."""
+    specs = [s for s in SHEETS if s[0] in ("VISÃO ABERTA", "SECRETARIA-ÓRGÃO")]
+    df_visao, raw_sec = read_sheets(path, specs)
+    df_sec = clean_secretarias(raw_sec)
+    return {
+        "load_sheets": lambda: load_sheets(path),
+        "clean_secretarias": lambda: clean_secretarias(raw_sec),
+        "get_totais_visao": lambda: get_totais_visao(df_visao),
+        "count_secretarias_unicas": lambda: count_secretarias_unicas(df_sec),
+        "load_cargos": lambda: DataRepository(path, use_cache=False).load(["df_cargos_ev", "df_cargos_rank"]),
+    }
+
+
+_CASE_NAMES = ("load_sheets", "clean_secretarias", "get_totais_visao", "count_secretarias_unicas", "load_cargos")
+
+
+def _measure(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"seconds": statistics.median(times), "peak_mb": peak / 1e6, "peak_method": "tracemalloc"}
+
+
+def _isolated_child(path: Path, name: str, conn) -> None:
+    import resource
+
+    fn = _cases(path)[name]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    conn.send({"seconds": seconds, "peak_mb": peak_kb / 1e3, "peak_method": "rss"})
+    conn.close()
+
+
+def _measure_isolated(path: Path, name: str) -> dict:
+    """Uma execução num processo filho; pico = aumento do RSS máximo (o tracemalloc dobraria a
+    memória nas escalas grandes)."""
+    import multiprocessing as mp
+
+    ctx = mp.get_context("fork")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_isolated_child, args=(path, name, child))
+    proc.start()
+    result = parent.recv()
+    proc.join()
+    return result
+
+
+# a partir desta escala cada caso roda uma vez, isolado num processo filho
+ISOLATE_FROM = 1000
+
+
+def _repeat_for(scale: int, repeat: int) -> int:
+    # escalas grandes: uma medição basta (cada rodada leva de segundos a minutos)
+    return repeat if scale <= 10 else 1
+
+
+def run(scales, repeat: int, only=None) -> dict:
+    results = {}
+    for scale in scales:
+        path = workbook(scale)
+        cases = _cases(path) if scale < ISOLATE_FROM else dict.fromkeys(_CASE_NAMES)
+        for name, fn in cases.items():
+            if only and name not in only:
+                continue
+            if scale < ISOLATE_FROM:
+                r = _measure(fn, _repeat_for(scale, repeat))
+            else:
+                r = _measure_isolated(path, name)
+            results[f"{name}@{scale}x"] = r
+            print(f"{name:26s} {scale:>5}x {r['seconds'] * 1000:11.1f} ms {r['peak_mb']:9.1f} MB"
+                  + (" (RSS)" if r.get("peak_method") == "rss" else ""), flush=True)
+    return results
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", nargs="+", help="restringe aos casos com estes nomes")
+    ap.add_argument("--save", type=Path, help="grava os resultados (JSON) como baseline")
+    ap.add_argument("--compare", type=Path, help="compara com um baseline gravado")
+    args = ap.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+    print(f"{'caso':26s} {'escala':>6} {'tempo':>14} {'pico':>12}")
+    results = run(args.scales, args.repeat, args.only)
+
+    if args.save:
+        args.save.write_text(json.dumps({"environment": _environment(), "results": results}, indent=2) + "\n",
+                             encoding="utf-8")
+        print(f"baseline gravado em {args.save}")
+
+    if args.compare:
+        base = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        print(f"\n{'comparação com ' + str(args.compare):42s} {'tempo':>8} {'pico':>8}")
+        for key, r in results.items():
+            if key in base:
+                b = base[key]
+                print(f"{key:42s} {r['seconds'] / b['seconds']:7.2f}x {r['peak_mb'] / max(b['peak_mb'], 1e-9):7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
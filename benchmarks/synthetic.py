@@ -0,0 +1,129 @@
+"""Geradores de dados sintéticos que reproduzem o layout das abas do relatório CapacitIA."""
+import numpy as np
+import pandas as pd
+
+SECRETARIAS = [
+    "SEAD", "SEFAZ", "SEPLAN", "SESAPI", "SEDUC", "SSP", "SEGOV", "CCOM", "CGE", "DER",
+    "FAPEPI", "GAMIL", "INVESTEPI", "JUCEPI", "PRF-PI", "SECID", "IDEPI", "SEINFRA", "SETRANS",
+    "Secretaria da Mulher", "Órgão Externo", "PACTO PELAS CRIANÇAS", "ADH", "CFLP", "BADESPI",
+]
+SECOES = ["MASTERCLASS", "WORKSHOP: CONSTRUÇÃO DE ASSISTENTES", "CURSO DE INTELIGÊNCIA ARTIFICIAL"]
+
+
+def secretarias_sheet(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Aba SECRETARIA-ÓRGÃO como lida com header=None: seções com cabeçalho próprio,
+    linhas TOTAL, linhas em branco e o quadro-resumo ATIVIDADE/EVENTO ... TOTAL GERAL."""
+    rng = np.random.default_rng(seed)
+    header = ["Nº", "SECRETARIA/ÓRGÃO", "Nº INSCRITOS", "Nº CERTIFICADOS", "Nº EVASÃO"]
+    blank = [np.nan] * 5
+    rows = [blank]
+    per_section = max(1, n_rows // len(SECOES))
+    for secao in SECOES:
+        rows.append([secao] + [np.nan] * 4)
+        rows.append(header)
+        insc = rng.integers(0, 60, per_section)
+        cert = (insc * rng.uniform(0.3, 1.0, per_section)).astype(int)
+        names = rng.choice(SECRETARIAS, per_section)
+        for i in range(per_section):
+            rows.append([i + 1, names[i], int(insc[i]), int(cert[i]), int(insc[i] - cert[i])])
+        rows += [["TOTAL", np.nan, np.nan, np.nan, np.nan], blank, blank]
+    rows.append(["ATIVIDADE/EVENTO", np.nan, "INSCRITOS", "CERTIFICADOS", "EVASÃO"])
+    for secao in ("MASTERCLASS", "WORKSHOP", "CURSO"):
+        rows.append([secao, np.nan, 1, 1, 0])
+    rows.append(["TOTAL GERAL", np.nan, 3, 3, 0])
+    return pd.DataFrame(rows, dtype=object)
+
+
+# ---- planilha completa -----------------------------------------------------------------
+
+# linhas de dados por aba no relatório real (escala 1x)
+BASE_ROWS = {"DADOS": 850, "VISÃO ABERTA": 31, "SECRETARIA-ÓRGÃO": 95, "CARGOS": 31}
+
+CARGOS = ["SECRETÁRIO", "PRESIDENTE", "VICE PRESIDENTE", "SUPERINTENDENTE", "DIRETOR",
+          "CHEFE DE GABINETE", "ASSESSOR", "GERENTE", "COORDENADOR", "PRÓ-REITOR", "OUTROS"]
+TIPOS = [("Masterclass", "ª Masterclass Programa CapacitIA: Fundamentos de Prompt de IA"),
+         ("Workshop", "º Workshop: Construção de Assistentes de IA"),
+         ("Curso de IA", "° Curso: Inteligência Artificial Aplicada para Secretarias de Governo")]
+BANNER = [["GOVERNO DO ESTADO DO PIAUÍ"], [], ["PROGRAMA CAPACITIA"], [], ["RELATÓRIO"], []]
+
+
+def _eventos(n: int) -> list[tuple[str, str]]:
+    """(tipo, nome) de n eventos, distribuídos entre os tipos como no relatório real."""
+    out = []
+    for i in range(n):
+        tipo, sufixo = TIPOS[0 if i % 10 < 3 else (1 if i % 10 == 3 else 2)]
+        out.append((tipo, f"{i + 1}{sufixo}"))
+    return out
+
+
+def _dados_rows(n: int, rng) -> list[list]:
+    header = ["EVENTO", "FORMATO", "EIXO", "LOCAL DE REALIZAÇÃO", "NOME", "CARGO", "CARGO OUTROS",
+              "ÓRGÃO", "ÓRGÃO OUTROS", "VÍNCULO", "VÍNCULO OUTROS", "CERTIFICADO", "OBS", "DATA"]
+    eventos = _eventos(max(1, n // 28))
+    ev_idx = rng.integers(0, len(eventos), n)
+    cargo = rng.choice(CARGOS, n)
+    org = rng.choice(SECRETARIAS, n)
+    cert = rng.choice(["Sim", "Não"], n)
+    rows = [header]
+    for i in range(n):
+        tipo, nome = eventos[ev_idx[i]]
+        rows.append([nome, tipo, "Gestão para Resultados", "HUB Investe Piauí", f"PARTICIPANTE {i:07d}",
+                     cargo[i], "NA", org[i], "NA", "Comissionado", "NA", cert[i], None, None])
+    return rows
+
+
+def _visao_rows(n: int, rng) -> list[list]:
+    insc = rng.integers(5, 70, n)
+    cert = (insc * rng.uniform(0.2, 1.0, n)).astype(int)
+    rows = [["Nº", "EVENTO", "Nº INSCRITOS", "Nº CERTIFICADOS"]]
+    rows += [[i + 1, nome, int(insc[i]), int(cert[i])] for i, (_, nome) in enumerate(_eventos(n))]
+    rows.append(["TOTAL GERAL", None, int(insc.sum()), int(cert.sum())])
+    return rows
+
+
+def _cargos_block(titulo: str, n: int, rng) -> list[list]:
+    rows = [[titulo], [], [None] + CARGOS]
+    tipo_atual = None
+    for tipo, nome in _eventos(n):
+        if tipo_atual is not None and tipo != tipo_atual:
+            rows.append(["TOTAL"] + [None] * len(CARGOS))
+        tipo_atual = tipo
+        rows.append([nome.split(" Programa")[0].split(":")[0]] + rng.integers(0, 15, len(CARGOS)).tolist())
+    rows.append(["TOTAL"])
+    rows.append(["TOTAL GERAL"] + CARGOS)
+    rows += [[], [], []]
+    return rows
+
+
+def _ministrantes_rows() -> list[list]:
+    turmas = [f"Turma {i}" for i in range(1, 12)]
+    rows = [["TURMAS 2024/2025"], ["Ministrantes"] + turmas]
+    for nome in ("Ministrante A", "Ministrante B", "Ministrante C", "Ministrante D"):
+        rows.append([nome] + [4] * len(turmas))
+    return rows
+
+
+def write_workbook(path, scale: int = 1, seed: int = 0):
+    """Grava um .xlsx com as abas e o layout do relatório real, com ``scale`` vezes as linhas:
+    DADOS e VISÃO ABERTA com cabeçalho na linha 6, SECRETARIA-ÓRGÃO com seções e cabeçalho
+    dinâmico, CARGOS com cabeçalho na linha 2 (blocos de inscritos e certificados)."""
+    from openpyxl import Workbook
+
+    rng = np.random.default_rng(seed)
+    n = {sheet: rows * scale for sheet, rows in BASE_ROWS.items()}
+    sec = secretarias_sheet(n["SECRETARIA-ÓRGÃO"], seed).astype(object)
+    sheets = {
+        "DADOS": BANNER + _dados_rows(n["DADOS"], rng),
+        "VISÃO ABERTA": BANNER + _visao_rows(n["VISÃO ABERTA"], rng),
+        "SECRETARIA-ÓRGÃO": [[None if pd.isna(v) else v for v in row] for row in sec.itertuples(index=False)],
+        "CARGOS": _cargos_block("CARGOS INSCRITOS", n["CARGOS"], rng)
+                  + _cargos_block("CARGOS CERTIFICADOS", n["CARGOS"], rng),
+        "MINISTRANTECARGA HORÁRIA": _ministrantes_rows(),
+    }
+    wb = Workbook(write_only=True)
+    for title, rows in sheets.items():
+        ws = wb.create_sheet(title)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
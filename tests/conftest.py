@@ -0,0 +1,42 @@
+import re
+import shutil
+import zipfile
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+DADOS = ROOT / "dados_main"
+AGOSTO = DADOS / "RelatorioCapacitia_AtualizadoAgosto.xlsx"
+RELATORIO = DADOS / "relatorio_capacitia.xlsx"
+ANTIGA = DADOS / "capacitia-dados.xlsx"  # layout antigo: sem SECRETARIA-ÓRGÃO e CARGOS
+
+
+def stale_copy(source: Path, dest: Path) -> Path:
+    """Cópia de ``source`` com ``<dimension ref="A1"/>`` em todas as abas: mesmos dados, outros bytes
+    (metadado desatualizado, comum em arquivos salvos por outras ferramentas)."""
+    with zipfile.ZipFile(source) as zin, zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED) as zout:
+        for item in zin.infolist():
+            data = zin.read(item.filename)
+            if item.filename.startswith("xl/worksheets/"):
+                data = re.sub(rb'<dimension ref="[^"]*"/>', b'<dimension ref="A1"/>', data)
+            zout.writestr(item, data)
+    return dest
+
+
+@pytest.fixture
+def workbook(tmp_path) -> Path:
+    """Cópia da planilha de agosto num diretório temporário (pode ser alterada pelo teste)."""
+    path = tmp_path / "planilha.xlsx"
+    shutil.copyfile(AGOSTO, path)
+    return path
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch) -> Path:
+    """Cache colunar isolado do .cache/ do projeto."""
+    from app.data import frame_cache
+
+    path = tmp_path / "cache"
+    monkeypatch.setattr(frame_cache, "CACHE_DIR", path)
+    return path
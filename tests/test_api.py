@@ -0,0 +1,120 @@
+import gzip
+import http.client
+import json
+import shutil
+import threading
+
+import pytest
+
+from app.api import ApiServer, ApiState, _accepts_gzip
+from app.data.registry import clear_registry, file_signature, get_repository, publish_repository, set_watched
+from app.data.repository import DataRepository
+from conftest import ANTIGA, RELATORIO
+
+
+@pytest.fixture
+def server(workbook, cache_dir):
+    clear_registry()
+    state = ApiState(lambda: get_repository(workbook))
+    srv = ApiServer(("127.0.0.1", 0), state)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+    thread.join()
+    set_watched(workbook, False)
+    clear_registry()
+
+
+@pytest.fixture
+def conn(server):
+    conn = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=30)
+    yield conn
+    conn.close()
+
+
+def _get(conn, path, method="GET", **headers):
+    conn.request(method, path, headers=headers)
+    resp = conn.getresponse()
+    return resp, resp.read()
+
+
+def test_ok_with_etag(conn, workbook):
+    resp, body = _get(conn, "/kpis")
+    assert resp.status == 200
+    assert resp.getheader("Content-Type") == "application/json; charset=utf-8"
+    assert resp.getheader("Content-Encoding") is None
+    assert int(resp.getheader("Content-Length")) == len(body)
+    versao = get_repository(workbook).version
+    assert resp.getheader("ETag") == f'"{versao}-kpis"' and resp.getheader("X-Data-Version") == versao
+    payload = json.loads(body)
+    assert payload["versao"] == versao and payload["dados"]["total_inscritos"] == 853
+
+    resp, body = _get(conn, "/kpis", method="HEAD")  # mesma conexão (keep-alive)
+    assert resp.status == 200 and body == b"" and int(resp.getheader("Content-Length")) > 0
+
+
+def test_not_modified(conn):
+    resp, _ = _get(conn, "/secretarias")
+    etag = resp.getheader("ETag")
+    for header in (etag, f"W/{etag}", f'"outra", {etag}', "*"):
+        resp, body = _get(conn, "/secretarias", **{"If-None-Match": header})
+        assert resp.status == 304 and body == b"" and resp.getheader("ETag") == etag
+    resp, body = _get(conn, "/secretarias", **{"If-None-Match": '"outra"'})
+    assert resp.status == 200 and body
+    resp, _ = _get(conn, "/cargos", **{"If-None-Match": etag})  # ETag é por endpoint
+    assert resp.status == 200
+
+
+def test_gzip_only_when_accepted(conn):
+    _, raw = _get(conn, "/eventos", **{"Accept-Encoding": "identity"})
+    resp, body = _get(conn, "/eventos", **{"Accept-Encoding": "br, gzip"})
+    assert resp.getheader("Content-Encoding") == "gzip" and resp.getheader("Vary") == "Accept-Encoding"
+    assert int(resp.getheader("Content-Length")) == len(body) < len(raw)
+    assert gzip.decompress(body) == raw
+    for header in ("gzip;q=0", "deflate", "br"):
+        resp, body = _get(conn, "/eventos", **{"Accept-Encoding": header})
+        assert resp.getheader("Content-Encoding") is None and body == raw
+
+
+@pytest.mark.parametrize("header,expected", [
+    (None, False), ("", False), ("gzip", True), ("GZIP", True), ("deflate, gzip;q=0.5", True),
+    ("gzip;q=0", False), ("gzip; q=0.0", False), ("*", True), ("br, *;q=0", False), ("identity", False),
+])
+def test_accepts_gzip(header, expected):
+    assert _accepts_gzip(header) is expected
+
+
+def test_new_etag_after_republish(conn, server, workbook):
+    resp, _ = _get(conn, "/kpis")
+    etag = resp.getheader("ETag")
+    antes = server.state.response("kpis")
+    assert server.state.response("kpis") is antes  # serializado uma vez por versão
+
+    # como o watcher: a nova versão é carregada fora e publicada no registro
+    shutil.copyfile(RELATORIO, workbook)
+    set_watched(workbook)
+    sig = file_signature(workbook)
+    novo = DataRepository(workbook, version=f"{sig[0]:x}-{sig[1]:x}-nova")
+    novo.load()
+    publish_repository(workbook, sig, novo)
+
+    resp, body = _get(conn, "/kpis", **{"If-None-Match": etag})
+    assert resp.status == 200 and resp.getheader("ETag") not in (None, etag)
+    assert json.loads(body)["dados"]["total_inscritos"] == 790
+    assert resp.getheader("X-Data-Version") == novo.version
+    assert server.state.response("kpis") is not antes
+    resp, _ = _get(conn, "/kpis", **{"If-None-Match": resp.getheader("ETag")})
+    assert resp.status == 304
+
+
+def test_errors(conn, workbook):
+    resp, body = _get(conn, "/inexistente")
+    assert resp.status == 404 and "/kpis" in json.loads(body)["endpoints"]
+
+    shutil.copyfile(ANTIGA, workbook)  # layout antigo: sem SECRETARIA-ÓRGÃO
+    resp, body = _get(conn, "/secretarias")
+    assert resp.status == 404 and "indisponível" in json.loads(body)["erro"]
+    resp, _ = _get(conn, "/eventos")
+    assert resp.status == 200
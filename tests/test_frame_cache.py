@@ -0,0 +1,103 @@
+import datetime as dt
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data import frame_cache
+from app.data.frame_cache import decode_frame, encode_frame, load_frame, prune_cache, save_frame, workbook_hash
+from app.data.repository import DataRepository
+from conftest import RELATORIO
+
+pytestmark = pytest.mark.skipif(not frame_cache.CACHE_ENABLED, reason="cache colunar desligado (pyarrow/CAPACITIA_CACHE=0)")
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame({
+        "Nº": [1, 2.5, "TOTAL GERAL", None, True, dt.date(2024, 8, 1), np.nan],
+        "EVENTO": ["a", None, "c", "d", "e", "f", "g"],
+        "valor": [1.0, np.nan, 3.0, -0.0, 5.0, 6.0, 7.0],
+        "contagem": pd.array([1, None, 3, 4, 5, 6, 7], dtype="Int32"),
+        "tipo": pd.Categorical(["x", "y", None, "x", "y", "x", "y"]),
+    }, index=pd.RangeIndex(10, 17))
+
+
+def _assert_same(out: pd.DataFrame, df: pd.DataFrame) -> None:
+    pd.testing.assert_frame_equal(out, df)
+    for a, b in zip(out["Nº"], df["Nº"]):  # mesmos valores e mesmos tipos (1 não vira 1.0 nem True)
+        assert type(a) is type(b) and (a == b or (pd.isna(a) and pd.isna(b)))
+
+
+def test_encode_decode_round_trip():
+    df = _frame()
+    enc = encode_frame(df)
+    assert enc.attrs == {"mixed_columns": ["Nº"]}
+    assert {type(v) for v in enc["Nº"]} == {str}
+    _assert_same(decode_frame(enc.copy()), df)
+
+
+def test_save_load_round_trip(cache_dir):
+    df = _frame()
+    assert save_frame("abc", "frame", df)
+    out = load_frame("abc", "frame")
+    _assert_same(out, df)
+    assert out["contagem"].dtype == "Int32" and isinstance(out["tipo"].dtype, pd.CategoricalDtype)
+    assert load_frame("abc", "outro") is None
+
+
+def test_unsupported_value_is_not_cached(cache_dir):
+    df = pd.DataFrame({"c": [1, "a", object()]})
+    with pytest.raises(TypeError):
+        encode_frame(df)
+    assert not save_frame("abc", "frame", df)
+    assert load_frame("abc", "frame") is None
+
+
+def test_pickled_format_is_rejected(cache_dir):
+    df = pd.DataFrame({"c": ["x"]})
+    df.attrs = {"pickled_columns": ["c"]}
+    with pytest.raises(ValueError):
+        decode_frame(df)
+    path = frame_cache._frame_path("abc", "frame")
+    path.parent.mkdir(parents=True)
+    df.to_parquet(path)
+    assert load_frame("abc", "frame") is None
+
+
+def test_cache_version_invalidates(cache_dir, monkeypatch):
+    save_frame("abc", "frame", _frame())
+    monkeypatch.setattr(frame_cache, "CACHE_VERSION", frame_cache.CACHE_VERSION + 1)
+    assert load_frame("abc", "frame") is None
+
+
+def test_workbook_change_invalidates(cache_dir, workbook):
+    kpis = DataRepository(workbook).load().get_kpis()
+    antigo = workbook_hash(workbook)
+    assert (cache_dir / f"{antigo}-v{frame_cache.CACHE_VERSION}" / "df_visao.parquet").exists()
+    # relida do cache: mesmos KPIs
+    assert DataRepository(workbook).load().get_kpis() == kpis
+
+    shutil.copyfile(RELATORIO, workbook)  # mesmo caminho, outro conteúdo
+    assert workbook_hash(workbook) != antigo
+    assert DataRepository(workbook).load().get_kpis() == DataRepository(RELATORIO, use_cache=False).load().get_kpis()
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_prune_cache_keeps_newest(cache_dir, monkeypatch):
+    monkeypatch.setattr(frame_cache, "CACHE_KEEP", 3)
+    for i in range(5):
+        save_frame(f"d{i}", "frame", pd.DataFrame({"c": [i]}))
+        os.utime(cache_dir / f"d{i}-v{frame_cache.CACHE_VERSION}", (i, i))
+    antiga = cache_dir / "d0-v1"
+    antiga.mkdir()
+
+    prune_cache()
+    assert sorted(p.name for p in cache_dir.iterdir()) == [f"d{i}-v{frame_cache.CACHE_VERSION}" for i in (2, 3, 4)]
+
+    # gravar uma planilha nova mantém ela e as CACHE_KEEP - 1 mais recentes
+    save_frame("nova", "frame", pd.DataFrame({"c": [9]}))
+    assert sorted(p.name for p in cache_dir.iterdir()) == sorted(
+        f"{d}-v{frame_cache.CACHE_VERSION}" for d in ("d3", "d4", "nova"))
+    assert load_frame("nova", "frame") is not None
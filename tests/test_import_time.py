@@ -0,0 +1,16 @@
+from benchmarks.bench_import_time import BUDGET_S, eager_modules, importtime, main_imports, total_seconds
+
+
+def test_main_imports_follow_main_py():
+    modules = main_imports()
+    for name in ("streamlit", "app.tracing", "app.debug_panel", "app.data.registry", "app.pages.eventos"):
+        assert name in modules
+    assert "app" not in modules and "datetime.datetime" not in modules
+
+
+def test_import_time_budget():
+    # melhor de três processos novos: o mínimo é a medida menos sensível a ruído da máquina
+    runs = [importtime() for _ in range(3)]
+    assert not eager_modules(runs[0]), "plotly.express/openpyxl devem ser importados sob demanda"
+    best = min(total_seconds(rows) for rows in runs)
+    assert best <= BUDGET_S, f"importações de app/main.py: {best:.2f} s (orçamento {BUDGET_S} s)"
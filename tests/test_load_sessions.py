@@ -0,0 +1,18 @@
+import json
+import subprocess
+import sys
+
+from conftest import ROOT
+
+
+def test_two_concurrent_sessions(tmp_path):
+    out = tmp_path / "carga.json"
+    subprocess.run([sys.executable, "-m", "benchmarks.bench_load_sessions", "--app", "main",
+                    "--sessions", "2", "--steps", "3", "--json", str(out)],
+                   cwd=ROOT, check=True, capture_output=True, timeout=600)
+    (r,) = json.loads(out.read_text(encoding="utf-8"))
+    assert r["sessoes"] == 2
+    assert r["erros"] == 0, r["falhas"]
+    assert r["interacoes"]["abertura"]["n"] == 2
+    assert r["total"]["n"] >= 2 * (1 + 3)  # abertura + interações (+ trocas de aba)
+    assert r["pico_rss_mb"] > 0
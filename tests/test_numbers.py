@@ -0,0 +1,76 @@
+import datetime as dt
+import random
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils.numbers import parse_ptbr_number, parse_ptbr_numbers
+
+
+def _parse_ptbr_number_ref(x):
+    """Implementação escalar original (antes da versão vetorizada), usada como referência."""
+    if x is None or (isinstance(x, float) and pd.isna(x)):
+        return np.nan
+    s = str(x).strip()
+    s = s.replace("\xa0", " ").replace(" ", "")
+    s = re.sub(r"[^\d,.\-]", "", s)
+    if re.match(r"^-?\d{1,3}(\.\d{3})*(,\d+)?$", s):
+        s = s.replace(".", "").replace(",", ".")
+    try:
+        return float(s)
+    except Exception:
+        return np.nan
+
+
+def _same(a, b) -> bool:
+    """Igualdade de floats que distingue -0.0 de 0.0 e trata NaN == NaN."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    return a.shape == b.shape and bool(np.all((np.isnan(a) & np.isnan(b)) | ((a == b) & (np.signbit(a) == np.signbit(b)))))
+
+
+MIXED = [
+    1, True, 1.0, "1", 0, False, 0.0, -0.0, "-0", "0,0", None, np.nan, pd.NA, pd.NaT,
+    "1.234,56", "R$ 1.234,56", "1,234.56", "12\xa0345", " 7 ", "abc", "", "-3,5", 2.5,
+    np.int64(1), np.float64(-0.0), np.bool_(True), dt.date(2024, 1, 2), 10**20, 1e16,
+]
+
+
+@pytest.mark.parametrize("wrap", [list, lambda v: np.asarray(v, dtype=object), lambda v: pd.Series(v, dtype=object)])
+def test_vector_matches_scalar_on_mixed_types(wrap):
+    values = MIXED + MIXED[::-1]
+    out = parse_ptbr_numbers(wrap(values))
+    assert _same(out, [parse_ptbr_number(v) for v in values])
+    assert _same(out, [_parse_ptbr_number_ref(v) for v in values])
+
+
+def test_bool_and_signed_zero_are_not_merged_with_numbers():
+    assert _same(parse_ptbr_numbers([1, True]), [1.0, np.nan])
+    assert _same(parse_ptbr_numbers([0.0, -0.0, False]), [0.0, -0.0, np.nan])
+    assert _same(parse_ptbr_numbers(pd.Series([0.0, -0.0, 1.0])), [0.0, -0.0, 1.0])
+
+
+def test_series_keeps_index():
+    s = pd.Series(["1.000", "2,5", None], index=[10, 20, 30])
+    out = parse_ptbr_numbers(s)
+    assert list(out.index) == [10, 20, 30]
+    assert _same(out, [1000.0, 2.5, np.nan])
+
+
+def test_vector_matches_reference_on_random_input():
+    rng = random.Random(0)
+    pool = ["0123456789", ".,", " \xa0R$%-"]
+
+    def value():
+        kind = rng.randrange(5)
+        if kind == 0:
+            return rng.choice([True, False, None, np.nan, 0, 1, -0.0, 0.0])
+        if kind == 1:
+            return rng.randint(-10**6, 10**6)
+        if kind == 2:
+            return rng.uniform(-1e6, 1e6)
+        return "".join(rng.choice(rng.choice(pool)) for _ in range(rng.randint(0, 12)))
+
+    values = [value() for _ in range(5000)]
+    assert _same(parse_ptbr_numbers(values), [_parse_ptbr_number_ref(v) for v in values])
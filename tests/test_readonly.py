@@ -0,0 +1,76 @@
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from app.data.readonly import ReadOnlyFrame, ReadOnlyFrameError
+from app.data.repository import DataRepository
+from conftest import AGOSTO, ROOT
+
+# (acessor, coluna de contagem)
+ACCESSORS = [("visao", "Nº INSCRITOS"), ("cargos_long", "Inscritos"), ("cargos_rank", "Inscritos")]
+
+MUTATIONS = {
+    "setitem": lambda df, n: df.__setitem__(n, 0),
+    "setitem_nova": lambda df, n: df.__setitem__("nova", 0),
+    "delitem": lambda df, n: df.__delitem__(n),
+    "insert": lambda df, n: df.insert(0, "nova", 0),
+    "pop": lambda df, n: df.pop(n),
+    "loc": lambda df, n: df.loc.__setitem__((df.index[0], n), 0),
+    "iloc": lambda df, n: df.iloc.__setitem__((0, 0), 0),
+    "at": lambda df, n: df.at.__setitem__((df.index[0], n), 0),
+    "iat": lambda df, n: df.iat.__setitem__((0, 0), 0),
+    "columns": lambda df, n: setattr(df, "columns", [f"c{i}" for i in range(df.shape[1])]),
+    "index": lambda df, n: setattr(df, "index", range(len(df))),
+    "fillna": lambda df, n: df.fillna({n: 0}, inplace=True),
+    "drop": lambda df, n: df.drop(columns=[n], inplace=True),
+    "rename": lambda df, n: df.rename(columns={n: "x"}, inplace=True),
+    "sort_values": lambda df, n: df.sort_values(n, ascending=False, inplace=True),
+    "reset_index": lambda df, n: df.reset_index(inplace=True),
+    "set_index": lambda df, n: df.set_index(n, inplace=True),
+    "replace": lambda df, n: df.replace(df[n].iloc[0], -1, inplace=True),
+    "replace_coluna": lambda df, n: df.replace({n: {df[n].iloc[0]: -1}}, inplace=True),
+    "isetitem": lambda df, n: df.isetitem(0, df.iloc[:, 0]),
+    "update": lambda df, n: df.update(df[[n]] + 1),
+}
+
+
+@pytest.fixture(scope="module")
+def repo():
+    return DataRepository(AGOSTO, use_cache=False).load()
+
+
+@pytest.mark.parametrize("mutation", list(MUTATIONS))
+@pytest.mark.parametrize("accessor,numeric", ACCESSORS)
+def test_shared_frames_reject_mutation(repo, accessor, numeric, mutation):
+    df = getattr(repo, accessor)()
+    before = df.copy()
+    with pytest.raises(ReadOnlyFrameError):
+        MUTATIONS[mutation](df, numeric)
+    pd.testing.assert_frame_equal(pd.DataFrame(df), before)
+    pd.testing.assert_frame_equal(pd.DataFrame(getattr(repo, accessor)()), before)
+
+
+@pytest.mark.parametrize("accessor,numeric", ACCESSORS)
+def test_reads_and_derived_frames(repo, accessor, numeric):
+    df = getattr(repo, accessor)()
+    assert isinstance(df, ReadOnlyFrame)
+    assert df.loc[df.index[0], numeric] == df.iloc[0][numeric] == df.at[df.index[0], numeric]
+
+    derived = df[df[numeric] > 0].assign(dobro=df[numeric] * 2)
+    assert type(derived) is pd.DataFrame
+
+    copia = df.copy()
+    assert type(copia) is pd.DataFrame
+    copia[numeric] = 0
+    copia.iloc[0, 0] = copia.iloc[-1, 0]
+    copia.insert(0, "nova", 1)
+    copia.sort_values(numeric, inplace=True)
+    assert (getattr(repo, accessor)()[numeric] > 0).any()
+
+
+def test_import_does_not_change_pandas_options():
+    code = ("import pandas as pd; before = pd.get_option('mode.copy_on_write'); "
+            "import app.data.repository; assert pd.get_option('mode.copy_on_write') == before")
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=ROOT)
@@ -0,0 +1,48 @@
+import threading
+
+import pandas as pd
+
+from app.data.repository import FRAME_MANIFEST, INTERMEDIATE_FRAMES, PAGE_FRAMES, DataRepository
+from conftest import AGOSTO
+
+
+def test_intermediate_frames_released_after_load():
+    repo = DataRepository(AGOSTO, use_cache=False).load()
+    assert set(PAGE_FRAMES) <= set(repo._frames)
+    assert not INTERMEDIATE_FRAMES & set(repo._frames)
+    assert not INTERMEDIATE_FRAMES & set(repo.memory_report()["frame"])
+
+    # pedidos de novo, são refeitos a partir da planilha, iguais aos de quem não descarta
+    inteiro = DataRepository(AGOSTO, use_cache=False, release_intermediate=False).load()
+    assert INTERMEDIATE_FRAMES <= set(inteiro._frames)
+    for name in FRAME_MANIFEST:
+        pd.testing.assert_frame_equal(repo.frame(name), inteiro.frame(name))
+
+
+def test_from_frames_keeps_everything():
+    inteiro = DataRepository(AGOSTO, use_cache=False, release_intermediate=False)
+    frames = {n: inteiro.frame(n) for n in ("df_visao", "df_secretarias_raw", "df_cargos_raw")}
+    repo = DataRepository.from_frames(frames, source=AGOSTO)
+    repo.load()
+    assert set(frames) <= set(repo._frames)
+
+
+def test_concurrent_sessions_see_consistent_frames():
+    repo = DataRepository(AGOSTO, use_cache=False)
+    names = [*PAGE_FRAMES, "df_cargos_ev", "df_secretarias_raw", "key_cargos"]
+    errors, barrier = [], threading.Barrier(6)
+
+    def session(i):
+        barrier.wait()
+        try:
+            for name in names[i:] + names[:i]:
+                assert repo.frame(name) is not None
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data.registry import clear_registry
+from app.data.snapshots import load_snapshots, main, snapshot_delta
+from app.domain.deltas import compute_delta, secretarias_por_chave
+from conftest import AGOSTO, ANTIGA, RELATORIO
+
+
+@pytest.fixture(autouse=True)
+def registry(cache_dir):
+    clear_registry()
+    yield
+    clear_registry()
+
+
+def _sec(rows):
+    return secretarias_por_chave(pd.DataFrame(rows, columns=["SECRETARIA/ÓRGÃO", "Nº INSCRITOS", "Nº CERTIFICADOS"]))
+
+
+def test_compute_delta_aligns_on_canonical_keys():
+    antes = _sec([("Secretaria Á", 10, 5), ("SEDUC", 20, 10), ("SESAPI", 5, 0)])
+    depois = _sec([("SECRETARIA  A", 10, 5), ("Seduc", 25, 15), ("PRF-PI", 7, 7)])
+    out = compute_delta(antes, depois)
+
+    assert list(out.index) == ["PRF-PI", "SEDUC", "SECRETARIA A", "SESAPI"]  # Δ inscritos decrescente
+    assert dict(out["Situação"]) == {"PRF-PI": "novo", "SEDUC": "alterado", "SECRETARIA A": "igual", "SESAPI": "removido"}
+    assert dict(out["Δ Nº INSCRITOS"]) == {"PRF-PI": 7, "SEDUC": 5, "SECRETARIA A": 0, "SESAPI": -5}
+    assert dict(out["Δ Nº CERTIFICADOS"]) == {"PRF-PI": 7, "SEDUC": 5, "SECRETARIA A": 0, "SESAPI": 0}
+    assert out.loc["SEDUC", "Rótulo"] == "Seduc" and out.loc["SESAPI", "Rótulo"] == "SESAPI"
+    np.testing.assert_allclose(out.loc["SEDUC", ["Taxa (%) (antes)", "Taxa (%) (depois)", "Δ Taxa (p.p.)"]].astype(float),
+                               [50.0, 60.0, 10.0])
+    assert out.loc["PRF-PI", "Taxa (%) (antes)"] == 0.0 and out.loc["PRF-PI", "Δ Taxa (p.p.)"] == 100.0
+
+
+def test_snapshot_delta_matches_kpis():
+    antes, depois = load_snapshots([RELATORIO, AGOSTO])
+    insc_a, cert_a, *_ = antes.repo.get_kpis()
+    insc_d, cert_d, *_ = depois.repo.get_kpis()
+    for dim in ("eventos", "secretarias"):
+        delta = snapshot_delta(antes, depois, dim)
+        assert delta["Δ Nº INSCRITOS"].sum() == insc_d - insc_a
+        assert delta["Δ Nº CERTIFICADOS"].sum() == cert_d - cert_a
+        assert list(delta["Situação"].unique()) == ["novo", "igual"]
+    cargos = snapshot_delta(antes, depois, "cargos")
+    assert cargos["Δ Nº CERTIFICADOS"].isna().all()  # a aba CARGOS não traz certificados
+
+
+def test_old_layout_misses_only_its_dimensions():
+    antiga, atual = load_snapshots([ANTIGA, AGOSTO])
+    assert antiga.available() == ["eventos"]
+    assert snapshot_delta(antiga, atual, "secretarias") is None
+    assert snapshot_delta(antiga, atual, "eventos") is not None
+
+
+def test_cli(tmp_path, capsys):
+    assert main([str(RELATORIO), str(AGOSTO), "--out", str(tmp_path)]) == 0
+    out = capsys.readouterr().out
+    assert "secretarias: 48 igual, 1 novo" in out and "PRF-PI" in out
+    delta = pd.read_csv(tmp_path / "delta_eventos.csv")
+    assert len(delta) == 31 and delta["Δ Nº INSCRITOS"].sum() == 63
+
+    assert main([str(ANTIGA), str(AGOSTO), "--dimensoes", "secretarias"]) == 0
+    assert "secretarias: indisponível em capacitia-dados.xlsx" in capsys.readouterr().out
@@ -0,0 +1,97 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from app.data.registry import clear_registry, get_repository, set_watched
+from app.data.repository import DataRepository
+from app.data.watcher import WorkbookWatcher, stop_watchers, watch_workbook
+from conftest import RELATORIO
+
+
+@pytest.fixture(autouse=True)
+def registry(cache_dir):
+    clear_registry()
+    yield
+    stop_watchers()
+    clear_registry()
+
+
+def _replace(path, source, step: int = 1):
+    """Substitui a planilha no lugar, avançando o mtime (a resolução do sistema de arquivos pode ser grossa)."""
+    mtime = path.stat().st_mtime_ns
+    shutil.copyfile(source, path)
+    os.utime(path, ns=(mtime + step * 10**9, mtime + step * 10**9))
+
+
+def test_publishes_after_two_stable_polls(workbook):
+    antigo = get_repository(workbook)
+    kpis = antigo.get_kpis()
+    set_watched(workbook)
+    watcher = WorkbookWatcher(workbook, interval=60)
+    try:
+        assert not watcher.check()  # nada mudou
+
+        _replace(workbook, RELATORIO)
+        assert not watcher.check()  # 1ª verificação com a nova assinatura: espera estabilizar
+        assert get_repository(workbook) is antigo
+
+        _replace(workbook, RELATORIO, step=2)  # ainda sendo gravada
+        assert not watcher.check()
+        assert get_repository(workbook) is antigo
+
+        assert watcher.check()      # assinatura repetida: carrega e publica
+        novo = get_repository(workbook)
+        assert novo is not antigo and novo.version != antigo.version
+        assert "df_visao" in novo._frames  # publicado já carregado
+        assert novo.get_kpis() == DataRepository(RELATORIO, use_cache=False).get_kpis() != kpis
+        assert antigo.get_kpis() == kpis  # quem ainda usa a versão anterior não é afetado
+        assert watcher.reloads == 1
+        assert not watcher.check()
+    finally:
+        set_watched(workbook, False)
+
+
+def test_failed_reload_keeps_previous_version(workbook):
+    antigo = get_repository(workbook)
+    set_watched(workbook)
+    watcher = WorkbookWatcher(workbook, interval=60)
+    try:
+        mtime = workbook.stat().st_mtime_ns
+        workbook.write_bytes(b"planilha corrompida")
+        os.utime(workbook, ns=(mtime + 10**9, mtime + 10**9))
+        assert not watcher.check() and not watcher.check()
+        assert watcher.last_error is not None
+        assert get_repository(workbook) is antigo
+        assert not watcher.check()  # a mesma versão com falha não é relida
+    finally:
+        set_watched(workbook, False)
+
+
+def test_thread_swaps_and_stops(workbook):
+    antigo = get_repository(workbook)
+    watcher = watch_workbook(workbook, interval=0.05)
+    assert watcher is not None and watcher.is_alive()
+    assert watch_workbook(workbook, interval=0.05) is watcher
+
+    _replace(workbook, RELATORIO)
+    deadline = time.monotonic() + 30
+    while get_repository(workbook) is antigo and time.monotonic() < deadline:
+        time.sleep(0.05)
+    novo = get_repository(workbook)
+    assert novo is not antigo
+    assert novo.get_kpis() == DataRepository(RELATORIO, use_cache=False).get_kpis()
+
+    # parar durante uma verificação lenta (ex.: recarga em andamento) espera ela terminar
+    entrou = threading.Event()
+
+    def lenta():
+        entrou.set()
+        time.sleep(0.5)
+
+    watcher.check = lenta
+    assert entrou.wait(10)
+    stop_watchers()
+    assert not watcher.is_alive()